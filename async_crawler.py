@@ -0,0 +1,136 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Токен-бакет: не більше rate запитів за секунду з піками до capacity"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Чекає, поки з'явиться вільний токен, і забирає його"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """Окремий токен-бакет для кожного хоста"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets = {}
+
+    async def acquire(self, url):
+        """Чекає дозволу на запит до хоста з url"""
+        host = urlparse(url).netloc
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            bucket = self.buckets[host] = TokenBucket(self.rate, self.capacity)
+        await bucket.acquire()
+
+
+class AsyncCrawler:
+    """Асинхронний обхід сайту пулом воркерів поверх QuotesScraper"""
+
+    def __init__(self, scraper, workers=8, rate=5.0, burst=None):
+        self.scraper = scraper
+        self.workers = workers
+        self.limiter = HostRateLimiter(rate, burst)
+        self.queue = None
+        # Один потік для запису контрольної точки: записи йдуть по черзі, цикл подій не блокується
+        self.checkpoint_executor = None
+
+    async def fetch(self, url, func, *args):
+        """Виконує блокуючий запит у потоці після дозволу rate limiter"""
+        await self.limiter.acquire(url)
+        return await asyncio.to_thread(func, *args)
+
+    async def save_checkpoint(self):
+        """Збирає зміни стану в циклі подій і записує контрольну точку в окремому потоці"""
+        if not self.scraper.checkpoint:
+            return
+        state, full = self.scraper.checkpoint_changes()
+        await asyncio.get_running_loop().run_in_executor(
+            self.checkpoint_executor, self.scraper.write_checkpoint, state, full)
+
+    async def handle_page(self, page):
+        """Обробляє сторінку з цитатами і ставить у чергу наступну та нових авторів"""
+        page_num, url = page
+        print(f"Скрапінг сторінки {page_num}...")
+        html_content = await self.fetch(url, self.scraper.get_page_content, url)
+        if not html_content:
+            return
+
+        # Сторінка парситься один раз, дерево йде в обидва екстрактори
+        soup = self.scraper.parser.parse(html_content)
+        new_authors = self.scraper.parse_quotes_page(soup)
+        if new_authors is None:
+            print(f"На сторінці {page_num} немає цитат. Зупиняємо скрапінг.")
+            self.scraper.next_page = None
+            await self.save_checkpoint()
+            return
+
+        for author_name in new_authors:
+            self.queue.put_nowait(("author", author_name))
+
+        next_url = self.scraper.get_next_page_url(soup, url)
+        self.scraper.next_page = (page_num + 1, next_url) if next_url else None
+        if self.scraper.next_page:
+            self.queue.put_nowait(("page", self.scraper.next_page))
+        await self.save_checkpoint()
+
+    async def handle_author(self, author_name):
+        """Отримує інформацію про автора"""
+        print(f"Отримання інформації про автора: {author_name}")
+        author_url = self.scraper.get_author_url(author_name)
+        author_info = await self.fetch(author_url, self.scraper.get_author_info, author_name)
+        if author_info:
+            self.scraper.record_author(author_name, author_info)
+            await self.save_checkpoint()
+
+    async def worker(self):
+        """Воркер: бере завдання з черги, поки його не скасують"""
+        while True:
+            kind, target = await self.queue.get()
+            try:
+                if kind == "page":
+                    await self.handle_page(target)
+                else:
+                    await self.handle_author(target)
+            except Exception as e:
+                print(f"Помилка обробки {target}: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def crawl(self):
+        """Обходить усі сторінки та сторінки авторів, продовжуючи з контрольної точки"""
+        self.queue = asyncio.Queue()
+        self.checkpoint_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        if self.scraper.next_page:
+            self.queue.put_nowait(("page", self.scraper.next_page))
+        for author_name in self.scraper.pending_authors():
+            self.queue.put_nowait(("author", author_name))
+
+        tasks = [asyncio.create_task(self.worker()) for _ in range(self.workers)]
+        try:
+            await self.queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.get_running_loop().run_in_executor(None, self.checkpoint_executor.shutdown, True)
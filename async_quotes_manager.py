@@ -0,0 +1,146 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from quotes_manager import QuotesManager
+
+
+class _Call:
+    """Виклик у потоці виконавця: запам'ятовує потік, щоб таймаут міг перервати саме цей запит"""
+
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+        self.lock = threading.Lock()
+        self.thread_id = None
+        self.done = False
+
+    def __call__(self):
+        with self.lock:
+            if self.done:
+                # Скасовано ще в черзі виконавця
+                return None
+            self.thread_id = threading.get_ident()
+        try:
+            return self.func(*self.args)
+        finally:
+            with self.lock:
+                self.done = True
+
+    def interrupt(self, pool):
+        """Перериває запит, якщо він ще виконується; якщо ще не почався - не дає йому початися"""
+        with self.lock:
+            if self.done:
+                return
+            if self.thread_id is None:
+                self.done = True
+                return
+            pool.interrupt(self.thread_id)
+
+
+class AsyncQuotesManager:
+    """Асинхронний фасад над QuotesManager: запити виконуються в обмеженому пулі потоків
+    з власними з'єднаннями, тож цикл подій не блокується.
+    
+    Таймаут або скасування корутини перериває запит SQLite через conn.interrupt().
+    """
+
+    def __init__(self, db_name="quotes.db", max_workers=4, timeout=30.0, cache=None, use_index=False,
+                 records=False):
+        self.manager = QuotesManager(db_name, cache=cache, pool_size=max_workers, use_index=use_index,
+                                     records=records)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.executor = None
+        self.slots = None
+
+    async def connect(self):
+        """Підключається до бази даних і запускає пул потоків"""
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="quotes-db")
+        # Не більше запитів у роботі, ніж потоків: решта чекає тут, а не в черзі виконавця,
+        # тож скасування очікуючої корутини не лишає після себе запиту
+        self.slots = asyncio.Semaphore(self.max_workers)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self.manager.connect)
+
+    async def close(self):
+        """Дочікується запущених запитів і закриває з'єднання"""
+        if self.executor:
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown, True)
+            self.executor = None
+        self.manager.close()
+
+    async def _run(self, func, *args, timeout=None):
+        """Виконує синхронний метод у пулі; timeout=None - таймаут менеджера, 0 - без таймауту"""
+        timeout = self.timeout if timeout is None else timeout
+        async with self.slots:
+            call = _Call(func, args)
+            future = asyncio.get_running_loop().run_in_executor(self.executor, call)
+            try:
+                return await asyncio.wait_for(future, timeout or None)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                call.interrupt(self.manager.pool)
+                raise
+
+    async def get_all_quotes(self, after_id=None, limit=None, timeout=None):
+        """Отримує цитати з авторами та тегами"""
+        return await self._run(self.manager.get_all_quotes, after_id, limit, timeout=timeout)
+
+    async def get_all_authors(self, timeout=None):
+        """Отримує всіх авторів"""
+        return await self._run(self.manager.get_all_authors, timeout=timeout)
+
+    async def search_quotes_by_author(self, author_name, after_id=None, limit=None, timeout=None):
+        """Пошук цитат за автором"""
+        return await self._run(self.manager.search_quotes_by_author, author_name, after_id, limit,
+                               timeout=timeout)
+
+    async def search_quotes_by_tag(self, tag_name, after_id=None, limit=None, timeout=None):
+        """Пошук цитат за тегом"""
+        return await self._run(self.manager.search_quotes_by_tag, tag_name, after_id, limit, timeout=timeout)
+
+    async def search_quotes_by_tags(self, tags, match_all=True, after_id=None, limit=None, timeout=None):
+        """Пошук цитат з усіма або хоча б одним із тегів"""
+        return await self._run(self.manager.search_quotes_by_tags, tags, match_all, after_id, limit,
+                               timeout=timeout)
+
+    async def search(self, query, limit=20, phrase=False, prefix=False, timeout=None):
+        """Повнотекстовий пошук з ранжуванням bm25"""
+        return await self._run(self.manager.search, query, limit, phrase, prefix, timeout=timeout)
+
+    async def get_quotes_count_by_author(self, timeout=None):
+        """Кількість цитат для кожного автора"""
+        return await self._run(self.manager.get_quotes_count_by_author, timeout=timeout)
+
+    async def get_top_tags(self, limit=10, timeout=None):
+        """Топ тегів за кількістю цитат"""
+        return await self._run(self.manager.get_top_tags, limit, timeout=timeout)
+
+    async def export_to_json(self, filename="exported_data.json", compact=False, compression=None,
+                             ndjson=False, timeout=0):
+        """Потоковий експорт у файл; за замовчуванням без таймауту"""
+        return await self._run(self.manager.export_to_json, filename, compact, compression, ndjson,
+                               timeout=timeout)
+
+    async def iter_quotes(self, chunk_size=500, after_id=None, timeout=None):
+        """Асинхронний ітератор цитат: сторінки за ключем id, з'єднання між сторінками не утримується.
+        
+        На відміну від get_all_quotes, помилка бази не ховається за порожнім результатом,
+        а передається викликачу - інакше обхід мовчки обірвався б, наче даних більше немає.
+        """
+        while True:
+            quotes = await self._run(self.manager.get_quotes_page, after_id, chunk_size, timeout=timeout)
+            for quote in quotes:
+                yield quote
+            if len(quotes) < chunk_size:
+                break
+            last = quotes[-1]
+            after_id = last.id if self.manager.records else last["id"]
+
+    async def iter_authors(self, timeout=None):
+        """Асинхронний ітератор авторів (авторів небагато, тож вони читаються одним запитом)"""
+        for author in await self.get_all_authors(timeout=timeout):
+            yield author
+
+    def cache_stats(self):
+        """Статистика кешу запитів або None"""
+        return self.manager.cache_stats()
@@ -0,0 +1,137 @@
+"""
+Навантажувальний тест AsyncQuotesManager: багато конкурентних корутин роблять запити,
+а окрема корутина вимірює затримку циклу подій (наскільки пізніше запланованого вона прокидається).
+Порівнюється з прямими викликами синхронного QuotesManager усередині корутин.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_async_manager --quotes 50000 --coroutines 200
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from async_quotes_manager import AsyncQuotesManager
+from benchmarks.synthetic import write_dataset
+from database_loader import DatabaseLoader
+from quotes_manager import QuotesManager
+
+TICK = 0.005
+
+
+async def monitor_lag(samples, stop):
+    """Кожні TICK секунд записує, на скільки мілісекунд цикл подій запізнився з пробудженням"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK
+        await asyncio.sleep(TICK)
+        samples.append((loop.time() - expected) * 1000)
+
+
+def make_queries(rng, count, author_names, tag_names):
+    queries = []
+    for _ in range(count):
+        choice = rng.random()
+        if choice < 0.4:
+            queries.append(("search_quotes_by_author", (rng.choice(author_names), None, 20)))
+        elif choice < 0.8:
+            queries.append(("search_quotes_by_tag", (rng.choice(tag_names), None, 20)))
+        else:
+            queries.append(("get_top_tags", (10,)))
+    return queries
+
+
+async def run_load(call, queries, coroutines):
+    """Запускає coroutines корутин, що по черзі забирають запити; повертає (запитів/с, затримки циклу)"""
+    samples = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_lag(samples, stop))
+    pending = iter(queries)
+
+    async def client():
+        for method, args in pending:
+            await call(method, args)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(coroutines)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+    return len(queries) / elapsed, samples
+
+
+def summarize(samples):
+    samples = sorted(samples) or [0.0]
+    return (statistics.median(samples), samples[max(int(len(samples) * 0.99) - 1, 0)], samples[-1])
+
+
+async def benchmark(db_path, queries, coroutines, workers):
+    sync_manager = QuotesManager(db_path)
+    sync_manager.connect()
+
+    async def blocking_call(method, args):
+        return getattr(sync_manager, method)(*args)
+
+    async_manager = AsyncQuotesManager(db_path, max_workers=workers)
+    await async_manager.connect()
+
+    async def async_call(method, args):
+        return await getattr(async_manager, method)(*args)
+
+    results = {}
+    for name, call in (("синхронний у корутині", blocking_call), (f"async, {workers} потоків", async_call)):
+        results[name] = await run_load(call, queries, coroutines)
+
+    # Таймаут важкого запиту: запит переривається, потік звільняється
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            await async_manager.get_all_quotes(timeout=0.05)
+        timeout_note = "запит встиг завершитися"
+    except asyncio.TimeoutError:
+        timeout_note = f"перервано через {(time.perf_counter() - start) * 1000:.0f} мс"
+    await async_manager.close()
+    sync_manager.close()
+    return results, timeout_note
+
+
+def main():
+    """Пропускна здатність і затримка циклу подій під навантаженням"""
+    parser = argparse.ArgumentParser(description="Навантажувальний тест AsyncQuotesManager")
+    parser.add_argument("--quotes", type=int, default=50000)
+    parser.add_argument("--authors", type=int, default=2000)
+    parser.add_argument("--coroutines", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=600)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        quotes_path, authors_path = write_dataset(tmp, args.quotes, args.authors, ndjson=True)
+        db_path = os.path.join(tmp, "async.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            DatabaseLoader(db_path).run(authors_path, quotes_path)
+            probe = QuotesManager(db_path)
+            probe.connect()
+        author_names = [author["name"].split()[-1] for author in probe.get_all_authors()]
+        tag_names = [tag["name"] for tag in probe.get_top_tags(200)]
+        probe.close()
+        queries = make_queries(random.Random(5), args.queries, author_names, tag_names)
+
+        results, timeout_note = asyncio.run(benchmark(db_path, queries, args.coroutines, args.workers))
+
+    print(f"{args.coroutines} корутин, {args.queries} запитів")
+    print(f"{'режим':<24} {'зап/с':>8} {'затримка циклу p50, мс':>23} {'p99, мс':>9} {'макс, мс':>9}")
+    for name, (rate, samples) in results.items():
+        p50, p99, worst = summarize(samples)
+        print(f"{name:<24} {rate:>8.1f} {p50:>23.1f} {p99:>9.1f} {worst:>9.1f}")
+    print(f"get_all_quotes з таймаутом 50 мс: {timeout_note}")
+
+
+if __name__ == "__main__":
+    main()
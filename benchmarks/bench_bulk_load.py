@@ -0,0 +1,81 @@
+"""
+Бенчмарк завантаження цитат: по одній цитаті (load_quotes), масовий режим (load_quotes_bulk)
+та ідемпотентний upsert (load_quotes_upsert), включно з повторним завантаженням тих самих даних.
+
+За замовчуванням синтетичний набір у 1000 разів більший за quotes.json (100 000 цитат).
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_bulk_load --scale 1000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import write_dataset
+from database_loader import DatabaseLoader
+
+BASE_QUOTES = 100
+BASE_AUTHORS = 50
+
+
+LOADERS = {
+    "row-by-row": lambda loader, path, batch_size: loader.load_quotes(path),
+    "bulk": lambda loader, path, batch_size: loader.load_quotes_bulk(path, batch_size),
+    "upsert": lambda loader, path, batch_size: loader.load_quotes_upsert(path, batch_size),
+}
+
+
+def load(db_path, quotes_path, authors_path, mode, batch_size):
+    """Завантажує набір у базу; повертає (секунд на цитати, вміст бази для порівняння)"""
+    loader = DatabaseLoader(db_path)
+    loader.connect()
+    loader.create_tables()
+    loader.load_authors(authors_path)
+
+    start = time.perf_counter()
+    LOADERS[mode](loader, quotes_path, batch_size)
+    elapsed = time.perf_counter() - start
+
+    loader.cursor.execute('''
+        SELECT q.id, q.text, a.name, t.name
+        FROM quotes q
+        LEFT JOIN authors a ON q.author_id = a.id
+        LEFT JOIN quote_tags qt ON q.id = qt.quote_id
+        LEFT JOIN tags t ON qt.tag_id = t.id
+        ORDER BY q.id, t.name
+    ''')
+    content = loader.cursor.fetchall()
+    loader.close()
+    return elapsed, content
+
+
+def main():
+    """Порівнює швидкість обох режимів завантаження"""
+    parser = argparse.ArgumentParser(description="Бенчмарк масового завантаження цитат")
+    parser.add_argument("--scale", type=int, default=1000, help="у скільки разів набір більший за quotes.json")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    quotes_count = BASE_QUOTES * args.scale
+    with tempfile.TemporaryDirectory() as tmp:
+        quotes_path, authors_path = write_dataset(tmp, quotes_count, BASE_AUTHORS * args.scale // 10 or 1, ndjson=True)
+
+        results = {}
+        for mode in LOADERS:
+            results[mode] = load(os.path.join(tmp, f"{mode}.db"), quotes_path, authors_path, mode, args.batch_size)
+        # Повторне завантаження незмінних даних у вже заповнену базу
+        results["upsert (reload)"] = load(os.path.join(tmp, "upsert.db"), quotes_path, authors_path, "upsert", args.batch_size)
+
+    print(f"\n=== {quotes_count} цитат ===")
+    print(f"{'режим':<18}{'секунд':>10}{'цитат/сек':>14}")
+    for mode, (elapsed, _) in results.items():
+        print(f"{mode:<18}{elapsed:>10.2f}{quotes_count / elapsed:>14.0f}")
+
+    reference = results["row-by-row"][1]
+    same = all(content == reference for _, content in results.values())
+    print("Вміст баз збігається" if same else "(!) Вміст баз відрізняється")
+
+
+if __name__ == "__main__":
+    main()
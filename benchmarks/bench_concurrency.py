@@ -0,0 +1,106 @@
+"""
+Бенчмарк конкурентного читання: новий QuotesManager на кожен запит (як зараз у веб-сервері)
+проти одного менеджера з пулом з'єднань лише на читання, при різній кількості потоків.
+База в режимі WAL, тож читачі не блокують один одного.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_concurrency --quotes 50000 --threads 1 2 4 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.synthetic import write_dataset
+from database_loader import DatabaseLoader
+from quotes_manager import QuotesManager
+
+
+def make_requests(rng, count, author_names, tag_names):
+    """Суміш запитів API: пошук за автором і тегом, сторінка цитат, топ тегів"""
+    requests = []
+    for _ in range(count):
+        choice = rng.random()
+        if choice < 0.4:
+            requests.append(("search_quotes_by_author", (rng.choice(author_names), None, 20)))
+        elif choice < 0.7:
+            requests.append(("search_quotes_by_tag", (rng.choice(tag_names), None, 20)))
+        elif choice < 0.9:
+            requests.append(("get_all_quotes", (rng.randrange(1000), 50)))
+        else:
+            requests.append(("get_top_tags", (10,)))
+    return requests
+
+
+def per_request_manager(db_path):
+    """Початковий підхід: підключення на кожен запит"""
+    def handle(method, args):
+        manager = QuotesManager(db_path)
+        manager.connect()
+        try:
+            return getattr(manager, method)(*args)
+        finally:
+            manager.close()
+    return handle, None
+
+
+def pooled_manager(db_path, pool_size):
+    """Один менеджер на всі потоки з пулом з'єднань"""
+    manager = QuotesManager(db_path, pool_size=pool_size)
+    manager.connect()
+
+    def handle(method, args):
+        return getattr(manager, method)(*args)
+    return handle, manager
+
+
+def throughput(handle, requests, threads):
+    """Запитів за секунду при заданій кількості потоків"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in executor.map(lambda request: handle(*request), requests):
+            pass
+    return len(requests) / (time.perf_counter() - start)
+
+
+def main():
+    """Масштабування пропускної здатності читання за кількістю потоків"""
+    parser = argparse.ArgumentParser(description="Бенчмарк конкурентного читання")
+    parser.add_argument("--quotes", type=int, default=50000)
+    parser.add_argument("--authors", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        quotes_path, authors_path = write_dataset(tmp, args.quotes, args.authors, ndjson=True)
+        db_path = os.path.join(tmp, "concurrency.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            DatabaseLoader(db_path).run(authors_path, quotes_path)
+            probe = QuotesManager(db_path)
+            probe.connect()
+        author_names = [author["name"].split()[-1] for author in probe.get_all_authors()]
+        tag_names = [tag["name"] for tag in probe.get_top_tags(200)]
+        probe.close()
+        requests = make_requests(random.Random(11), args.requests, author_names, tag_names)
+
+        # SQLite відпускає GIL під час виконання запиту, тож масштабування обмежене кількістю ядер
+        print(f"ядер CPU: {os.cpu_count()}")
+        print(f"{'потоків':>8} {'новий менеджер, зап/с':>22} {'пул, зап/с':>12} {'прискорення пулу':>17}")
+        for threads in args.threads:
+            with contextlib.redirect_stdout(io.StringIO()):
+                handle, _ = per_request_manager(db_path)
+                baseline = throughput(handle, requests, threads)
+                handle, manager = pooled_manager(db_path, threads)
+                pooled = throughput(handle, requests, threads)
+                manager.close()
+            print(f"{threads:>8} {baseline:>22.1f} {pooled:>12.1f} {pooled / baseline:>16.2f}x")
+
+
+if __name__ == "__main__":
+    main()
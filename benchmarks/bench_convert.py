@@ -0,0 +1,131 @@
+"""
+Бенчмарк конвертації структури: початковий підхід (json.load усього файлу, перебудова списку,
+json.dump) проти потокового convert_structure - послідовно і з цитатами та авторами в окремих
+процесах. Кожен вимір - окремий процес; пік RSS враховує і процеси-обробники.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_convert --quotes 1000000 --authors 100000
+    # набір у кілька ГБ; згенеровані файли лишаються в --workdir для повторних запусків
+    python -m benchmarks.bench_convert --quotes 8000000 --authors 1000000 --workdir /tmp/convert-bench
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_dataset
+from convert_structure import AUTHOR_FIELDS, QUOTE_FIELDS, convert_files
+
+# Варіант -> (формат входу, кількість процесів); 0 процесів - початкова реалізація
+VARIANTS = {
+    "whole-file": ("json", 0),
+    "stream": ("json", 1),
+    "stream-parallel": ("json", 2),
+    "ndjson-parallel": ("ndjson", 2),
+}
+
+
+def convert_whole_file(input_file, output_file, mapping):
+    """Початкова реалізація: весь масив у пам'яті, перебудова і json.dump з indent=2"""
+    with open(input_file, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    converted = [{field: record[source] for field, source in mapping.items()} for record in records]
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(converted, f, ensure_ascii=False, indent=2)
+    return len(converted)
+
+
+def run_variant(variant, workdir):
+    """Виконує один варіант у поточному процесі і друкує результат як JSON"""
+    input_format, workers = VARIANTS[variant]
+    jobs = [(os.path.join(workdir, f"quotes.{input_format}"), os.path.join(workdir, "quotes_converted.json"),
+             QUOTE_FIELDS),
+            (os.path.join(workdir, f"authors.{input_format}"), os.path.join(workdir, "authors_converted.json"),
+             AUTHOR_FIELDS)]
+    input_mb = sum(os.path.getsize(job[0]) for job in jobs) / (1024 * 1024)
+
+    start = time.perf_counter()
+    if workers:
+        counts = convert_files(jobs, workers)
+    else:
+        counts = [convert_whole_file(*job) for job in jobs]
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss у Linux - у КіБ; для дочірніх процесів - пік найбільшого з них
+    peak_kb = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    print(json.dumps({
+        "seconds": elapsed,
+        "records": sum(counts),
+        "input_mb": input_mb,
+        "mb_per_sec": input_mb / elapsed,
+        "peak_rss_mb": peak_kb / 1024
+    }))
+
+
+def measure(variant, workdir):
+    """Запускає варіант в окремому процесі"""
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_convert", "--child", variant, workdir],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def prepare(workdir, quotes, authors):
+    """Генерує вхідні JSON і NDJSON файли, якщо їх ще немає в workdir.
+
+    Виконується в окремому процесі: пік RSS батьківського процесу (автори генеруються в пам'яті)
+    успадковується дочірніми процесами вимірів через fork і спотворив би їх ru_maxrss.
+    """
+    for ndjson in (False, True):
+        extension = "ndjson" if ndjson else "json"
+        paths = [os.path.join(workdir, f"{name}.{extension}") for name in ("quotes", "authors")]
+        if not all(os.path.exists(path) for path in paths):
+            write_dataset(workdir, quotes, authors, ndjson=ndjson)
+
+
+def main():
+    """Порівнює пропускну здатність і пік пам'яті конвертації"""
+    parser = argparse.ArgumentParser(description="Бенчмарк конвертації структури JSON")
+    parser.add_argument("--quotes", type=int, default=1000000)
+    parser.add_argument("--authors", type=int, default=100000)
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument("--workdir", help="каталог для вхідних файлів (зберігається між запусками)")
+    parser.add_argument("--child", nargs=2, metavar=("VARIANT", "DIR"), help=argparse.SUPPRESS)
+    parser.add_argument("--prepare", metavar="DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_variant(*args.child)
+        return
+    if args.prepare:
+        prepare(args.prepare, args.quotes, args.authors)
+        return
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="convert-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    try:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_convert", "--prepare", workdir,
+                        "--quotes", str(args.quotes), "--authors", str(args.authors)], check=True)
+        print(f"Вхідні дані: {args.quotes} цитат, {args.authors} авторів "
+              f"(підготовка {time.perf_counter() - start:.1f} с, CPU: {os.cpu_count()})")
+        print(f"{'варіант':<17} {'вхід, МБ':>9} {'час, с':>8} {'МБ/с':>7} {'пік RSS, МБ':>12}")
+        for variant in args.variants:
+            result = measure(variant, workdir)
+            print(f"{variant:<17} {result['input_mb']:>9.1f} {result['seconds']:>8.2f} "
+                  f"{result['mb_per_sec']:>7.1f} {result['peak_rss_mb']:>12.1f}")
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Бенчмарк експорту: буферизований json.dump (усі дані в пам'яті) проти потокового
+QuotesManager.export_to_json. Кожен вимір - окремий процес, щоб пік RSS не змішувався.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_export --sizes 10000 50000 100000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.synthetic import write_dataset
+from database_loader import DatabaseLoader
+from quotes_manager import QuotesManager
+
+VARIANTS = ("buffered", "stream", "stream-compact", "stream-gzip", "ndjson")
+
+
+def export_buffered(manager, filename):
+    """Початкова реалізація: збирає весь документ у пам'яті і пише одним json.dump"""
+    data = {
+        "quotes": manager.get_all_quotes(),
+        "authors": manager.get_all_authors(),
+        "statistics": {
+            "quotes_by_author": manager.get_quotes_count_by_author(),
+            "top_tags": manager.get_top_tags()
+        },
+        "export_date": datetime.now().isoformat()
+    }
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def run_variant(db_path, variant, output_dir):
+    """Виконує один варіант експорту в поточному процесі і друкує результат як JSON"""
+    manager = QuotesManager(db_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.connect()
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    filename = os.path.join(output_dir, {"stream-gzip": "export.json.gz", "ndjson": "export.ndjson"}
+                            .get(variant, "export.json"))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if variant == "buffered":
+            export_buffered(manager, filename)
+        else:
+            manager.export_to_json(filename, compact=variant == "stream-compact",
+                                   ndjson=variant == "ndjson")
+    elapsed = time.perf_counter() - start
+    manager.close()
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        "seconds": elapsed,
+        "peak_growth_mb": (peak_kb - baseline_kb) / 1024,
+        "size_mb": os.path.getsize(filename) / (1024 * 1024)
+    }))
+
+
+def measure(db_path, variant, output_dir):
+    """Запускає варіант в окремому процесі"""
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_export", "--child", db_path, variant, output_dir],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Порівнює час і приріст пікової пам'яті експорту на синтетичних наборах різного розміру"""
+    parser = argparse.ArgumentParser(description="Бенчмарк експорту у JSON")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument("--authors", type=int, default=5000)
+    parser.add_argument("--child", nargs=3, metavar=("DB", "VARIANT", "DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_variant(*args.child)
+        return
+
+    print(f"{'цитат':>8}  {'варіант':<15} {'час, с':>8} {'приріст RSS, МБ':>16} {'файл, МБ':>9}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            quotes_path, authors_path = write_dataset(tmp, size, min(args.authors, size), ndjson=True)
+            db_path = os.path.join(tmp, "export.db")
+            with contextlib.redirect_stdout(io.StringIO()):
+                DatabaseLoader(db_path).run(authors_path, quotes_path)
+
+            for variant in VARIANTS:
+                result = measure(db_path, variant, tmp)
+                print(f"{size:>8}  {variant:<15} {result['seconds']:>8.2f} "
+                      f"{result['peak_growth_mb']:>16.1f} {result['size_mb']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
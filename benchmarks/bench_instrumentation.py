@@ -0,0 +1,128 @@
+"""
+Бенчмарк накладних витрат інструментації: вартість span() / increment() при вимкнених і увімкнених
+метриках, а також парсинг сторінок, запити QuotesManager і експорт без метрик, з метриками
+без SQL-таймінгу і з таймінгом кожного SQL-запиту.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_instrumentation --quotes 50000 --rounds 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import instrumentation
+from benchmarks.mirror_server import MirrorSite
+from benchmarks.synthetic import write_dataset
+from database_loader import DatabaseLoader
+from page_parser import PageParser, extract_quotes
+from quotes_manager import QuotesManager
+
+MODES = {
+    "вимкнено": None,
+    "увімкнено без SQL": False,
+    "увімкнено з SQL": True,
+}
+
+
+def set_mode(sql):
+    instrumentation.disable()
+    instrumentation.METRICS.reset()
+    if sql is not None:
+        instrumentation.enable(sql=sql)
+
+
+def micro(calls):
+    """Наносекунд на один with span(...) і один increment(...)"""
+    span = instrumentation.span
+    increment = instrumentation.increment
+    start = time.perf_counter()
+    for _ in range(calls):
+        with span("bench", phase="loop"):
+            pass
+    span_ns = (time.perf_counter() - start) / calls * 1e9
+    start = time.perf_counter()
+    for _ in range(calls):
+        increment("bench", 1, phase="loop")
+    return span_ns, (time.perf_counter() - start) / calls * 1e9
+
+
+def workload(db_path, pages, repeat):
+    """Час парсингу сторінок, набору запитів і експорту"""
+    timings = {}
+    parser = PageParser()
+    start = time.perf_counter()
+    for page in pages:
+        extract_quotes(parser.parse(page))
+    timings["parse"] = time.perf_counter() - start
+
+    manager = QuotesManager(db_path)
+    manager.connect()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        manager.get_top_tags(10)
+        manager.get_quotes_count_by_author()
+        manager.search_quotes_by_tag("love", None, 20)
+        manager.search("love life", 20)
+    timings["queries"] = time.perf_counter() - start
+
+    export_path = os.path.join(os.path.dirname(db_path), "export.json")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.export_to_json(export_path)
+    timings["export"] = time.perf_counter() - start
+    manager.close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Накладні витрати інструментації")
+    parser.add_argument("--quotes", type=int, default=50000)
+    parser.add_argument("--authors", type=int, default=2000)
+    parser.add_argument("--pages", type=int, default=100, help="скільки сторінок парсити")
+    parser.add_argument("--repeat", type=int, default=50, help="повторів набору запитів")
+    parser.add_argument("--rounds", type=int, default=3, help="раундів по всіх режимах (береться мінімум)")
+    parser.add_argument("--calls", type=int, default=1000000, help="викликів у мікробенчмарку")
+    args = parser.parse_args()
+
+    print(f"{'режим':<20} {'span, нс':>9} {'increment, нс':>14}")
+    for mode, sql in MODES.items():
+        set_mode(sql)
+        span_ns, increment_ns = micro(args.calls)
+        print(f"{mode:<20} {span_ns:>9.0f} {increment_ns:>14.0f}")
+
+    site = MirrorSite.synthetic(args.pages)
+    pages = [site.render(f"/page/{page}/")[1] for page in range(1, args.pages + 1)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        quotes_path, authors_path = write_dataset(tmp, args.quotes, args.authors)
+        db_path = os.path.join(tmp, "quotes.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            DatabaseLoader(db_path).run(authors_path, quotes_path)
+
+        # Режими чергуються в кожному раунді, щоб фоновий шум однаково впливав на всі
+        results = {}
+        for _ in range(args.rounds):
+            for mode, sql in MODES.items():
+                set_mode(sql)
+                timings = workload(db_path, pages, args.repeat)
+                best = results.setdefault(mode, timings)
+                for stage, seconds in timings.items():
+                    best[stage] = min(best[stage], seconds)
+        set_mode(None)
+
+        print(f"\n{'режим':<20} {'парсинг, с':>11} {'запити, с':>10} {'експорт, с':>11}")
+        for mode, timings in results.items():
+            print(f"{mode:<20} {timings['parse']:>11.3f} {timings['queries']:>10.3f} {timings['export']:>11.3f}")
+
+    base = results["вимкнено"]
+    for mode in list(MODES)[1:]:
+        overhead = ", ".join(f"{stage} {(results[mode][stage] / base[stage] - 1) * 100:+.1f}%" for stage in base)
+        print(f"{mode}: {overhead}")
+
+
+if __name__ == "__main__":
+    main()
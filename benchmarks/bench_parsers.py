@@ -0,0 +1,74 @@
+"""
+Мікро-бенчмарк backend-ів HTML-парсера: час парсингу і вибірки на одну сторінку.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_parsers --rounds 50
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.mirror_server import PAGE_SIZE, render_author_page, render_quotes_page
+from page_parser import PARSER_BACKENDS, PageParser, extract_author, extract_next_url, extract_quotes
+
+
+def build_pages(quotes_file, authors_file):
+    """Будує набір сторінок з цитатами і сторінок авторів"""
+    with open(quotes_file, 'r', encoding='utf-8') as f:
+        quotes = json.load(f)
+    with open(authors_file, 'r', encoding='utf-8') as f:
+        authors = json.load(f)
+
+    pages = []
+    for start in range(0, len(quotes), PAGE_SIZE):
+        page_num = start // PAGE_SIZE + 1
+        pages.append(render_quotes_page(quotes[start:start + PAGE_SIZE], page_num, start + PAGE_SIZE < len(quotes)))
+    author_pages = [(author["name"], render_author_page(author)) for author in authors]
+    return pages, author_pages
+
+
+def bench_backend(backend, pages, author_pages, rounds):
+    """Повертає (мс на сторінку цитат, мс на сторінку автора, результат вибірки)"""
+    parser = PageParser(backend)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        quotes = []
+        for page in pages:
+            soup = parser.parse(page)
+            quotes.extend(extract_quotes(soup))
+            extract_next_url(soup, "http://quotes.toscrape.com/")
+    quotes_ms = (time.perf_counter() - start) * 1000 / (rounds * len(pages))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        authors = [extract_author(parser.parse(page), name) for name, page in author_pages]
+    authors_ms = (time.perf_counter() - start) * 1000 / (rounds * len(author_pages))
+
+    return quotes_ms, authors_ms, (quotes, authors)
+
+
+def main():
+    """Порівнює всі backend-и парсера"""
+    parser = argparse.ArgumentParser(description="Бенчмарк backend-ів HTML-парсера")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--quotes", default="quotes.json")
+    parser.add_argument("--authors", default="authors.json")
+    args = parser.parse_args()
+
+    pages, author_pages = build_pages(args.quotes, args.authors)
+    print(f"Сторінок з цитатами: {len(pages)}, сторінок авторів: {len(author_pages)}, раундів: {args.rounds}\n")
+    print(f"{'backend':<24}{'цитати, мс/стор':>18}{'автор, мс/стор':>18}")
+
+    reference = None
+    for backend in PARSER_BACKENDS:
+        quotes_ms, authors_ms, result = bench_backend(backend, pages, author_pages, args.rounds)
+        if reference is None:
+            reference = result
+        status = "" if result == reference else "  (!) результат відрізняється"
+        print(f"{backend:<24}{quotes_ms:>18.3f}{authors_ms:>18.3f}{status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Наскрізний бенчмарк конвеєра: парсинг сторінок, запис JSON, конвертація, завантаження в базу,
+кожен запит QuotesManager і експорт. Для кожного етапу фіксуються час, пікова пам'ять (RSS)
+і рядків за секунду; результати пишуться в JSON і порівнюються з базовими.
+
+Кожен етап виконується в окремому процесі, тож пікова пам'ять одного етапу не впливає на інші.
+Якщо етап повільніший або займає більше пам'яті, ніж базовий результат з урахуванням допуску,
+скрипт завершується з кодом 1.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_pipeline                       # порівняння з benchmarks/baseline.json
+    python -m benchmarks.bench_pipeline --update-baseline     # записати нові базові результати
+    python -m benchmarks.bench_pipeline --quotes 100000 --authors 5000 --baseline ""
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.mirror_server import PAGE_SIZE, render_quotes_page
+from benchmarks.synthetic import generate_authors, generate_quotes
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def stage_generate(workdir, params):
+    """Синтетичний набір: HTML-сторінки для парсингу і записи для наступних етапів"""
+    rng = random.Random(params["seed"])
+    authors = generate_authors(params["authors"], rng)
+    quotes = list(generate_quotes(params["quotes"], authors, params["tags"], rng=rng))
+    with open(os.path.join(workdir, "dataset.json"), 'w', encoding='utf-8') as f:
+        json.dump({"quotes": quotes, "authors": authors}, f, ensure_ascii=False)
+    pages = [render_quotes_page(quotes[start:start + PAGE_SIZE], start // PAGE_SIZE + 1, True)
+             for start in range(0, min(len(quotes), params["parse_pages"] * PAGE_SIZE), PAGE_SIZE)]
+    with open(os.path.join(workdir, "pages.json"), 'w', encoding='utf-8') as f:
+        json.dump(pages, f, ensure_ascii=False)
+    return len(quotes)
+
+
+def stage_parse(workdir, params):
+    """Парсинг сторінок цитат backend-ом за замовчуванням"""
+    from page_parser import PageParser, extract_quotes
+    with open(os.path.join(workdir, "pages.json"), 'r', encoding='utf-8') as f:
+        pages = json.load(f)
+    parser = PageParser()
+    return sum(len(extract_quotes(parser.parse(page))) for page in pages)
+
+
+def stage_json_write(workdir, params):
+    """Запис quotes.json / authors.json так, як це робить скрапер"""
+    from scraper import QuotesScraper
+    with open(os.path.join(workdir, "dataset.json"), 'r', encoding='utf-8') as f:
+        dataset = json.load(f)
+    scraper = QuotesScraper()
+    scraper.quotes = dataset["quotes"]
+    scraper.authors = {author["name"]: author for author in dataset["authors"]}
+    scraper.save_to_json()
+    return len(scraper.quotes) + len(scraper.authors)
+
+
+def stage_convert(workdir, params):
+    """Конвертація у структуру старого формату"""
+    from convert_structure import convert_authors_structure, convert_quotes_structure
+    convert_quotes_structure()
+    convert_authors_structure()
+    return params["quotes"] + params["authors"]
+
+
+def stage_load(workdir, params):
+    """Завантаження в SQLite (upsert)"""
+    from database_loader import DatabaseLoader
+    DatabaseLoader("quotes.db").run("authors.json", "quotes.json")
+    return params["quotes"]
+
+
+def query_stage(method, *args, consume=False):
+    """Етап, що викликає метод QuotesManager і повертає кількість рядків результату"""
+    def run(workdir, params):
+        from quotes_manager import QuotesManager
+        manager = QuotesManager("quotes.db")
+        manager.connect()
+        result = getattr(manager, method)(*args)
+        rows = sum(1 for _ in result) if consume else len(result)
+        manager.close()
+        return rows
+    return run
+
+
+def stage_export(workdir, params):
+    """Потоковий експорт у JSON"""
+    from quotes_manager import QuotesManager
+    manager = QuotesManager("quotes.db")
+    manager.connect()
+    manager.export_to_json("exported_data.json")
+    manager.close()
+    return params["quotes"] + params["authors"]
+
+
+def stage_export_legacy(workdir, params):
+    """Файли старого формату прямо з бази (замість convert)"""
+    from quotes_manager import QuotesManager
+    manager = QuotesManager("quotes.db")
+    manager.connect()
+    manager.export_legacy()
+    manager.close()
+    return params["quotes"] + params["authors"]
+
+
+STAGES = {
+    "generate": stage_generate,
+    "parse": stage_parse,
+    "json_write": stage_json_write,
+    "convert": stage_convert,
+    "load": stage_load,
+    "get_all_quotes": query_stage("get_all_quotes"),
+    "iter_quotes": query_stage("iter_quotes", consume=True),
+    "get_all_authors": query_stage("get_all_authors"),
+    "search_quotes_by_author": query_stage("search_quotes_by_author", "Author 00000"),
+    "search_quotes_by_tag": query_stage("search_quotes_by_tag", "love"),
+    "search": query_stage("search", "love life", 100),
+    "get_quotes_count_by_author": query_stage("get_quotes_count_by_author"),
+    "get_top_tags": query_stage("get_top_tags", 50),
+    "export": stage_export,
+    "export_legacy": stage_export_legacy,
+}
+
+
+def run_child(stage, workdir):
+    """Виконує етап у поточному процесі і друкує результат як JSON"""
+    with open(os.path.join(workdir, "params.json"), 'r', encoding='utf-8') as f:
+        params = json.load(f)
+    os.chdir(workdir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        rows = STAGES[stage](workdir, params)
+        elapsed = time.perf_counter() - start
+    # ru_maxrss у Linux - у КіБ
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"seconds": elapsed, "peak_rss_mb": peak_mb, "rows": rows,
+                      "rows_per_sec": rows / elapsed if elapsed else 0.0}))
+
+
+def run_stage(stage, workdir):
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [project_root, os.environ.get("PYTHONPATH")])))
+    result = subprocess.run([sys.executable, "-m", "benchmarks.bench_pipeline", "--child", stage, workdir],
+                            capture_output=True, text=True, env=env, cwd=project_root)
+    if result.returncode != 0:
+        raise RuntimeError(f"Етап {stage} завершився з помилкою:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance, rss_tolerance, min_seconds):
+    """Повертає список регресій відносно базових результатів"""
+    regressions = []
+    if baseline.get("params") != results["params"]:
+        print("(!) Параметри базових результатів інші - порівняння може бути некоректним")
+    for stage, current in results["stages"].items():
+        reference = baseline.get("stages", {}).get(stage)
+        if not reference:
+            continue
+        time_limit = max(reference["seconds"] * (1 + tolerance), reference["seconds"] + min_seconds)
+        if current["seconds"] > time_limit:
+            regressions.append(f"{stage}: {current['seconds']:.3f} с проти {reference['seconds']:.3f} с")
+        if current["peak_rss_mb"] > reference["peak_rss_mb"] * (1 + rss_tolerance):
+            regressions.append(f"{stage}: пам'ять {current['peak_rss_mb']:.1f} МБ "
+                               f"проти {reference['peak_rss_mb']:.1f} МБ")
+    return regressions
+
+
+def main():
+    """Запускає всі етапи, зберігає результати і перевіряє регресії"""
+    parser = argparse.ArgumentParser(description="Наскрізний бенчмарк конвеєра")
+    parser.add_argument("--quotes", type=int, default=20000)
+    parser.add_argument("--authors", type=int, default=1000)
+    parser.add_argument("--tags", type=int, default=500, help="кількість різних тегів (розподіл Ципфа)")
+    parser.add_argument("--parse-pages", type=int, default=200, help="скільки сторінок парсити на етапі parse")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results.json", help="файл результатів")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="базові результати (порожній рядок - не порівнювати)")
+    parser.add_argument("--update-baseline", action="store_true", help="записати результати як базові")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="допустиме уповільнення, частка")
+    parser.add_argument("--rss-tolerance", type=float, default=0.25, help="допустимий ріст пам'яті, частка")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="абсолютний допуск часу для коротких етапів, секунд")
+    parser.add_argument("--child", nargs=2, metavar=("STAGE", "DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    params = {"quotes": args.quotes, "authors": args.authors, "tags": args.tags,
+              "parse_pages": args.parse_pages, "seed": args.seed}
+    results = {
+        "params": params,
+        "environment": {"python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+                        "platform": platform.platform(), "cpu_count": os.cpu_count()},
+        "stages": {},
+    }
+
+    print(f"{'етап':<28} {'с':>8} {'пік RSS, МБ':>12} {'рядків':>8} {'рядків/с':>11}")
+    with tempfile.TemporaryDirectory() as workdir:
+        with open(os.path.join(workdir, "params.json"), 'w', encoding='utf-8') as f:
+            json.dump(params, f)
+        for stage in STAGES:
+            result = run_stage(stage, workdir)
+            results["stages"][stage] = result
+            print(f"{stage:<28} {result['seconds']:>8.3f} {result['peak_rss_mb']:>12.1f} "
+                  f"{result['rows']:>8} {result['rows_per_sec']:>11.0f}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\nРезультати збережено у {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline or BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Базові результати оновлено: {args.baseline or BASELINE_PATH}")
+        return
+
+    if not args.baseline or not os.path.exists(args.baseline):
+        print("Базових результатів немає - порівняння пропущено")
+        return
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance, args.rss_tolerance, args.min_seconds)
+    if regressions:
+        print("\n(!) Регресії відносно базових результатів:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("Регресій відносно базових результатів немає")
+
+
+if __name__ == "__main__":
+    main()
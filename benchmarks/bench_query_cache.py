@@ -0,0 +1,76 @@
+"""
+Бенчмарк кешу запитів QuotesManager: повторні виклики get_top_tags, get_quotes_count_by_author
+і search_quotes_by_tag без кешу і через QueryCache; наприкінці - статистика кешу для підбору розміру.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_query_cache --quotes 100000 --calls 2000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.synthetic import write_dataset
+from database_loader import DatabaseLoader
+from query_cache import QueryCache
+from quotes_manager import QuotesManager
+
+
+def workload(rng, calls, tag_names):
+    """Послідовність викликів API: популярні теги трапляються частіше (розподіл Ципфа)"""
+    weights = [1 / (rank + 1) for rank in range(len(tag_names))]
+    for _ in range(calls):
+        choice = rng.random()
+        if choice < 0.2:
+            yield "get_top_tags", (10,)
+        elif choice < 0.3:
+            yield "get_quotes_count_by_author", ()
+        else:
+            yield "search_quotes_by_tag", (rng.choices(tag_names, weights)[0], None, 20)
+
+
+def run(manager, calls):
+    start = time.perf_counter()
+    for method, args in calls:
+        getattr(manager, method)(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    """Порівнює час серії викликів без кешу і з кешем різного розміру"""
+    parser = argparse.ArgumentParser(description="Бенчмарк кешу запитів")
+    parser.add_argument("--quotes", type=int, default=100000)
+    parser.add_argument("--authors", type=int, default=5000)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 64, 256])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        quotes_path, authors_path = write_dataset(tmp, args.quotes, args.authors, ndjson=True)
+        db_path = os.path.join(tmp, "cache.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            DatabaseLoader(db_path).run(authors_path, quotes_path)
+
+        manager = QuotesManager(db_path)
+        manager.connect()
+        tag_names = [row[0] for row in manager.conn.execute("SELECT name FROM tags ORDER BY id")]
+        calls = list(workload(random.Random(3), args.calls, tag_names))
+
+        elapsed = run(manager, calls)
+        print(f"без кешу:          {elapsed:8.2f} с ({elapsed / len(calls) * 1000:.2f} мс на виклик)")
+
+        for size in args.sizes:
+            manager.cache = QueryCache(max_entries=size)
+            elapsed = run(manager, calls)
+            stats = manager.cache_stats()
+            print(f"кеш {size:>5} записів: {elapsed:8.2f} с ({elapsed / len(calls) * 1000:.2f} мс на виклик), "
+                  f"влучань {stats['hit_rate']:.0%}, витіснено {stats['evictions']}")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
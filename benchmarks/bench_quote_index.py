@@ -0,0 +1,115 @@
+"""
+Бенчмарк знімка QuoteIndex проти SQL-шляху QuotesManager: час побудови, пам'ять на цитату
+і затримки (p50 / p99) вибірок за автором, тегом і AND / OR перетином тегів.
+
+Пам'ять знімка міряється через tracemalloc; для порівняння - розмір бази і пам'ять результату
+get_all_quotes (список словників) на одну цитату.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_quote_index --quotes 100000 --calls 1000
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import write_dataset
+from database_loader import DatabaseLoader
+from quotes_manager import QuotesManager
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def traced(func):
+    """Результат func і кількість байтів, що лишилися виділеними після виклику"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def workloads(rng, calls, author_names, tag_names, limit):
+    """Набори викликів; теги і автори обираються за розподілом Ципфа, як у даних"""
+    tag_weights = list(itertools.accumulate(1 / (i + 1) for i in range(len(tag_names))))
+    author_weights = list(itertools.accumulate(1 / (i + 1) for i in range(len(author_names))))
+
+    def tags(k):
+        return rng.choices(tag_names, cum_weights=tag_weights, k=k)
+
+    return {
+        "за автором": [("search_quotes_by_author", (rng.choices(author_names, cum_weights=author_weights)[0],
+                                                    None, limit)) for _ in range(calls)],
+        "за тегом": [("search_quotes_by_tag", (tags(1)[0], None, limit)) for _ in range(calls)],
+        "теги AND": [("search_quotes_by_tags", (tags(2), True, None, limit)) for _ in range(calls)],
+        "теги OR": [("search_quotes_by_tags", (tags(3), False, None, limit)) for _ in range(calls)],
+    }
+
+
+def latencies(manager, calls):
+    result = []
+    for method, args in calls:
+        start = time.perf_counter()
+        getattr(manager, method)(*args)
+        result.append(time.perf_counter() - start)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Знімок QuoteIndex проти SQL")
+    parser.add_argument("--quotes", type=int, default=100000)
+    parser.add_argument("--authors", type=int, default=5000)
+    parser.add_argument("--calls", type=int, default=1000, help="викликів кожного типу")
+    parser.add_argument("--limit", type=int, nargs="+", default=[20, 0],
+                        help="розміри сторінки результату (0 - без обмеження)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        quotes_path, authors_path = write_dataset(tmp, args.quotes, args.authors, ndjson=True)
+        db_path = os.path.join(tmp, "index.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            DatabaseLoader(db_path).run(authors_path, quotes_path)
+
+        sql = QuotesManager(db_path)
+        sql.connect()
+        indexed = QuotesManager(db_path, use_index=True)
+        indexed.connect()
+
+        start = time.perf_counter()
+        index, index_bytes = traced(indexed._index)
+        build = time.perf_counter() - start
+        _, rows_bytes = traced(sql.get_all_quotes)
+        count = len(index)
+        print(f"цитат: {count}, побудова знімка: {build:.2f} с (з tracemalloc)")
+        print(f"пам'ять на цитату: знімок {index_bytes / count:.0f} Б, "
+              f"результат get_all_quotes {rows_bytes / count:.0f} Б, "
+              f"файл бази {os.path.getsize(db_path) / count:.0f} Б")
+
+        author_names = index.author_names
+        tag_names = index.tag_names
+        for limit in args.limit:
+            calls = workloads(random.Random(7), args.calls, author_names, tag_names, limit or None)
+            print(f"\nліміт {limit or 'немає'}, мс")
+            print(f"{'запит':<12} {'SQL p50':>9} {'SQL p99':>9} {'знімок p50':>11} {'знімок p99':>11}")
+            for name, workload in calls.items():
+                sql_times = latencies(sql, workload)
+                index_times = latencies(indexed, workload)
+                print(f"{name:<12} {percentile(sql_times, 0.5) * 1000:>9.3f} "
+                      f"{percentile(sql_times, 0.99) * 1000:>9.3f} {percentile(index_times, 0.5) * 1000:>11.3f} "
+                      f"{percentile(index_times, 0.99) * 1000:>11.3f}")
+        sql.close()
+        indexed.close()
+
+
+if __name__ == "__main__":
+    main()
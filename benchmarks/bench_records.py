@@ -0,0 +1,80 @@
+"""
+Бенчмарк пам'яті результатів QuotesManager: вкладені словники проти записів Quote / Author
+зі __slots__ і спільним автором. Для кожного запиту - пам'ять результату на цитату (tracemalloc),
+час побудови і час серіалізації в JSON (записи перетворюються на словники лише під час запису).
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_records --quotes 100000 --authors 5000
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import write_dataset
+from database_loader import DatabaseLoader
+from json_stream import write_json_array
+from quotes_manager import QuotesManager
+
+
+def measure(func):
+    """(результат, байтів на результат, секунд)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пам'ять результатів: словники проти записів")
+    parser.add_argument("--quotes", type=int, default=100000)
+    parser.add_argument("--authors", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        quotes_path, authors_path = write_dataset(tmp, args.quotes, args.authors, ndjson=True)
+        db_path = os.path.join(tmp, "records.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            DatabaseLoader(db_path).run(authors_path, quotes_path)
+
+        managers = {}
+        for name, options in (("словники", {}), ("записи", {"records": True}),
+                              ("записи + знімок", {"records": True, "use_index": True})):
+            manager = managers[name] = QuotesManager(db_path, **options)
+            manager.connect()
+        # Знімок будується заздалегідь, щоб його пам'ять не потрапила в результат
+        managers["записи + знімок"].refresh_index()
+
+        queries = {
+            "get_all_quotes": lambda manager: manager.get_all_quotes(),
+            "за автором (Author 0000)": lambda manager: manager.search_quotes_by_author("Author 0000"),
+            "за тегом (-1)": lambda manager: manager.search_quotes_by_tag("-1"),
+        }
+        print(f"{'запит':<26} {'режим':<16} {'цитат':>7} {'Б/цитату':>9} {'побудова, с':>12} {'JSON, с':>8}")
+        for query_name, query in queries.items():
+            baseline = None
+            for mode, manager in managers.items():
+                result, size, elapsed = measure(lambda: query(manager))
+                start = time.perf_counter()
+                write_json_array(io.StringIO(), result, indent=None)
+                serialize = time.perf_counter() - start
+                per_quote = size / max(1, len(result))
+                baseline = baseline or per_quote
+                print(f"{query_name:<26} {mode:<16} {len(result):>7} {per_quote:>9.0f} {elapsed:>12.3f} "
+                      f"{serialize:>8.3f}  ({per_quote / baseline:.0%})")
+                del result
+        for manager in managers.values():
+            manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Бенчмарк скрапера на локальному дзеркалі (benchmarks.mirror_server): сторінок і авторів за секунду
+в конкурентному (--workers) і багатопроцесному (--processes) режимах, а також повтори при помилках.
+Дзеркало працює в окремому процесі, щоб не ділити GIL зі скрапером.
+
+Послідовний режим тут не міряється: він навмисно чекає секунду між запитами.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_scraper --pages 200 --latency 0.02 --processes 1 2 4
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from http_transport import HttpTransport
+from json_stream import iter_records
+from scraper import QuotesScraper
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def mirror(pages, authors, latency, jitter, error_rate):
+    """Запускає дзеркало в підпроцесі і повертає його адресу"""
+    port = free_port()
+    process = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.mirror_server", "--port", str(port),
+        "--synthetic-pages", str(pages), "--synthetic-authors", str(authors),
+        "--latency", str(latency), "--jitter", str(jitter),
+        "--error-rate", str(error_rate), "--retry-after", "0",
+    ], stdout=subprocess.PIPE, text=True)
+    try:
+        process.stdout.readline()
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def mirror_stats(base_url):
+    with urllib.request.urlopen(base_url + "/__stats__") as response:
+        return json.load(response)
+
+
+def crawl(base_url, workers, processes, workdir):
+    """Один обхід у чистому каталозі; повертає (секунд, статистика транспорту, цитат, авторів)"""
+    os.makedirs(workdir)
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        transport = HttpTransport(pool_size=max(workers, 10), backoff_factor=0.01, max_retries=5)
+        scraper = QuotesScraper(transport=transport, base_url=base_url, stream=True)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            scraper.run(workers=workers, rate=10000, processes=processes)
+        elapsed = time.perf_counter() - start
+        quotes = sum(1 for _ in iter_records("quotes.ndjson"))
+        authors = sum(1 for _ in iter_records("authors.ndjson"))
+        return elapsed, transport.stats(), quotes, authors
+    finally:
+        os.chdir(previous)
+
+
+def main():
+    """Пропускна здатність скрапера по режимах і стійкість до помилок сервера"""
+    parser = argparse.ArgumentParser(description="Бенчмарк скрапера на локальному дзеркалі")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--authors", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    scenarios = [("async", args.workers, None, 0.0)]
+    scenarios += [(f"{count} процес(и)", args.workers, count, 0.0) for count in args.processes]
+    scenarios.append((f"async, помилки {args.error_rate:.0%}", args.workers, None, args.error_rate))
+
+    print(f"Дзеркало: {args.pages} сторінок, {args.authors} авторів, затримка {args.latency * 1000:.0f}"
+          f"±{args.jitter * 1000:.0f} мс; ядер CPU: {os.cpu_count()}")
+    print(f"{'режим':<22} {'с':>6} {'стор/с':>8} {'авт/с':>7} {'цитат':>7} {'авторів':>8} "
+          f"{'запитів':>8} {'повторів':>9} {'помилок сервера':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for index, (name, workers, processes, error_rate) in enumerate(scenarios):
+            with mirror(args.pages, args.authors, args.latency, args.jitter, error_rate) as base_url:
+                elapsed, stats, quotes, authors = crawl(base_url, workers, processes,
+                                                        os.path.join(tmp, str(index)))
+                served = mirror_stats(base_url)
+            print(f"{name:<22} {elapsed:>6.2f} {served['pages'] / elapsed:>8.1f} "
+                  f"{served['authors'] / elapsed:>7.1f} {quotes:>7} {authors:>8} "
+                  f"{stats['requests']:>8} {stats['retries']:>9} {served['errors']:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Бенчмарк пошуку: LIKE '%...%' (search_quotes_by_author / search_quotes_by_tag і пошук у тексті)
+проти повнотекстового індексу FTS5 (QuotesManager.search).
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_search --quotes 100000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.synthetic import VOCABULARY, WORDS, write_dataset
+from database_loader import DatabaseLoader
+from quotes_manager import QuotesManager
+
+LIKE_TEXT_SQL = '''
+    SELECT q.id, q.text
+    FROM quotes q
+    WHERE q.text LIKE ?
+    ORDER BY q.id
+'''
+
+
+def measure(func, args_list):
+    """Повертає (середня мс, p95 мс, середня кількість результатів)"""
+    timings = []
+    sizes = []
+    for args in args_list:
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(result))
+    timings.sort()
+    return statistics.mean(timings), timings[int(len(timings) * 0.95) - 1], statistics.mean(sizes)
+
+
+def main():
+    """Порівнює латентність LIKE і FTS5 на синтетичному наборі"""
+    parser = argparse.ArgumentParser(description="Бенчмарк LIKE проти FTS5")
+    parser.add_argument("--quotes", type=int, default=100000)
+    parser.add_argument("--authors", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=30)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        quotes_path, authors_path = write_dataset(tmp, args.quotes, args.authors, ndjson=True)
+        db_path = os.path.join(tmp, "search.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            DatabaseLoader(db_path).run(authors_path, quotes_path)
+
+        manager = QuotesManager(db_path)
+        manager.connect()
+        cursor = manager.conn.cursor()
+
+        words = rng.sample(VOCABULARY, args.queries)
+        authors = [f"{rng.randrange(args.authors):06d}" for _ in range(args.queries)]
+        tags = [f"{rng.choice(WORDS)}-{rng.randrange(50)}" for _ in range(args.queries)]
+
+        like_text = lambda word: cursor.execute(LIKE_TEXT_SQL, (f"%{word}%",)).fetchall()
+        cases = [
+            ("автор: LIKE", manager.search_quotes_by_author, [(a,) for a in authors]),
+            ("автор: FTS5", lambda a: manager.search(f"author: {a}", limit=-1, raw=True), [(a,) for a in authors]),
+            ("тег: LIKE", manager.search_quotes_by_tag, [(t,) for t in tags]),
+            ("тег: FTS5", lambda t: manager.search(t, limit=-1, phrase=True), [(t,) for t in tags]),
+            ("текст: LIKE", like_text, [(w,) for w in words]),
+            ("текст: FTS5 усі", lambda w: manager.search(f"text: {w}", limit=-1, raw=True), [(w,) for w in words]),
+            ("текст: FTS5 топ-20", lambda w: manager.search(f"text: {w}", limit=20, raw=True), [(w,) for w in words]),
+        ]
+
+        print(f"\n=== {args.quotes} цитат, {args.queries} запитів на випадок ===")
+        print(f"{'випадок':<22}{'сер., мс':>10}{'p95, мс':>10}{'результатів':>14}")
+        for name, func, args_list in cases:
+            mean_ms, p95_ms, size = measure(func, args_list)
+            print(f"{name:<22}{mean_ms:>10.2f}{p95_ms:>10.2f}{size:>14.0f}")
+
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
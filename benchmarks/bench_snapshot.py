@@ -0,0 +1,78 @@
+"""
+Бенчмарк холодного старту: скільки часу минає до першої відповіді при читанні quotes.json /
+authors.json через json.load, при побудові QuoteIndex з бази і при відкритті бінарного знімка
+(SnapshotReader, mmap). Для знімка окремо - час першого запиту і розміри файлів.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_snapshot --sizes 10000 100000 300000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import write_dataset
+from database_loader import DatabaseLoader
+from instrumentation import sqlite_connect
+from quote_index import QuoteIndex
+from snapshot import SnapshotReader, create_snapshot
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def load_json(quotes_path, authors_path):
+    with open(quotes_path, 'r', encoding='utf-8') as f:
+        quotes = json.load(f)
+    with open(authors_path, 'r', encoding='utf-8') as f:
+        authors = json.load(f)
+    return quotes, authors
+
+
+def build_index(db_path):
+    conn = sqlite_connect(db_path)
+    try:
+        return QuoteIndex.from_database(conn)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Холодний старт: JSON, QuoteIndex і бінарний знімок")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--authors-ratio", type=int, default=20, help="цитат на одного автора")
+    args = parser.parse_args()
+
+    print(f"{'цитат':>8} {'json.load, с':>13} {'QuoteIndex, с':>14} {'знімок, мс':>11} "
+          f"{'1-й запит, мс':>14} {'JSON, МБ':>9} {'знімок, МБ':>11}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            quotes_path, authors_path = write_dataset(tmp, size, max(1, size // args.authors_ratio))
+            db_path = os.path.join(tmp, "quotes.db")
+            snapshot_path = os.path.join(tmp, "quotes.snap")
+            with contextlib.redirect_stdout(io.StringIO()):
+                DatabaseLoader(db_path).run(authors_path, quotes_path)
+            create_snapshot(db_path, snapshot_path)
+
+            _, json_seconds = timed(lambda: load_json(quotes_path, authors_path))
+            _, index_seconds = timed(lambda: build_index(db_path))
+            reader = SnapshotReader(snapshot_path)
+            _, open_seconds = timed(reader.connect)
+            # Перший пошук за підрядком ще й декодує всі імена авторів
+            _, query_seconds = timed(lambda: reader.search_quotes_by_author("Author 000001", None, 20))
+            reader.close()
+
+            json_mb = (os.path.getsize(quotes_path) + os.path.getsize(authors_path)) / 1024 / 1024
+            print(f"{size:>8} {json_seconds:>13.3f} {index_seconds:>14.3f} {open_seconds * 1000:>11.3f} "
+                  f"{query_seconds * 1000:>14.3f} {json_mb:>9.1f} {os.path.getsize(snapshot_path) / 1024 / 1024:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
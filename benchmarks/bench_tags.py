@@ -0,0 +1,137 @@
+"""
+Бенчмарк гідратації тегів: GROUP_CONCAT по всьому з'єднанню з розбиттям рядка (початковий запит)
+і корельований json_group_array проти поточного QuotesManager (цитати, потім теги пачкою через IN).
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_tags --quotes 100000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import write_dataset
+from database_loader import DatabaseLoader
+from quotes_manager import QuotesManager
+
+GROUP_CONCAT_SQL = '''
+    SELECT q.id, q.text, a.name, a.born_date, a.born_location, a.description, GROUP_CONCAT(t.name)
+    FROM quotes q
+    LEFT JOIN authors a ON q.author_id = a.id
+    LEFT JOIN quote_tags qt ON q.id = qt.quote_id
+    LEFT JOIN tags t ON qt.tag_id = t.id
+    {where}
+    GROUP BY q.id
+    ORDER BY q.id
+    {limit}
+'''
+
+JSON_ARRAY_SQL = '''
+    SELECT q.id, q.text, a.name, a.born_date, a.born_location, a.description, (
+        SELECT json_group_array(t.name)
+        FROM quote_tags qt
+        JOIN tags t ON qt.tag_id = t.id
+        WHERE qt.quote_id = q.id
+    )
+    FROM quotes q
+    LEFT JOIN authors a ON q.author_id = a.id
+    {where}
+    ORDER BY q.id
+    {limit}
+'''
+
+TAG_SUBQUERY = '''WHERE q.id IN (
+    SELECT qt.quote_id FROM quote_tags qt JOIN tags t ON qt.tag_id = t.id WHERE t.name LIKE ?)'''
+
+
+def to_quote(row, tags):
+    return {
+        "id": row[0],
+        "text": row[1],
+        "author": {"name": row[2], "born_date": row[3], "born_location": row[4], "description": row[5]},
+        "tags": tags
+    }
+
+
+def group_concat(conn, where, params, limit):
+    """Початковий підхід: рядок тегів на кожну цитату і split(',') у Python"""
+    sql = GROUP_CONCAT_SQL.format(where=where, limit="LIMIT ?" if limit else "")
+    rows = conn.execute(sql, params + ((limit,) if limit else ())).fetchall()
+    return [to_quote(row, row[6].split(',') if row[6] else []) for row in rows]
+
+
+def json_array(conn, where, params, limit):
+    """Масив тегів з корельованого підзапиту json_group_array"""
+    sql = JSON_ARRAY_SQL.format(where=where, limit="LIMIT ?" if limit else "")
+    rows = conn.execute(sql, params + ((limit,) if limit else ())).fetchall()
+    return [to_quote(row, json.loads(row[6])) for row in rows]
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(result)
+
+
+def main():
+    """Порівнює три стратегії на повному скануванні, сторінках і пошуку за тегом та автором"""
+    parser = argparse.ArgumentParser(description="Бенчмарк гідратації тегів")
+    parser.add_argument("--quotes", type=int, default=100000)
+    parser.add_argument("--authors", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        quotes_path, authors_path = write_dataset(tmp, args.quotes, args.authors, ndjson=True)
+        db_path = os.path.join(tmp, "tags.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            DatabaseLoader(db_path).run(authors_path, quotes_path)
+
+        manager = QuotesManager(db_path)
+        manager.connect()
+        conn = manager.conn
+        popular_tag = conn.execute("SELECT t.name FROM tag_stats s JOIN tags t ON t.id = s.tag_id "
+                                   "ORDER BY s.usage_count DESC LIMIT 1").fetchone()[0]
+        author = conn.execute("SELECT name FROM authors ORDER BY id LIMIT 1").fetchone()[0]
+        middle_id = args.quotes // 2
+
+        scenarios = [
+            ("усі цитати",
+             lambda: group_concat(conn, "", (), None),
+             lambda: json_array(conn, "", (), None),
+             lambda: manager.get_all_quotes()),
+            ("сторінка 100 після id",
+             lambda: group_concat(conn, "WHERE q.id > ?", (middle_id,), 100),
+             lambda: json_array(conn, "WHERE q.id > ?", (middle_id,), 100),
+             lambda: manager.get_all_quotes(after_id=middle_id, limit=100)),
+            (f"тег '{popular_tag}'",
+             lambda: group_concat(conn, TAG_SUBQUERY, (f"%{popular_tag}%",), None),
+             lambda: json_array(conn, TAG_SUBQUERY, (f"%{popular_tag}%",), None),
+             lambda: manager.search_quotes_by_tag(popular_tag)),
+            (f"автор '{author}'",
+             lambda: group_concat(conn, "WHERE a.name LIKE ?", (f"%{author}%",), None),
+             lambda: json_array(conn, "WHERE a.name LIKE ?", (f"%{author}%",), None),
+             lambda: manager.search_quotes_by_author(author)),
+        ]
+
+        print(f"{'сценарій':<28} {'рядків':>8} {'GROUP_CONCAT, мс':>17} {'json_group_array, мс':>21} "
+              f"{'пачка IN, мс':>13}")
+        for name, legacy, json_variant, batched in scenarios:
+            legacy_time, rows = timed(legacy, args.repeat)
+            json_time, _ = timed(json_variant, args.repeat)
+            batched_time, _ = timed(batched, args.repeat)
+            print(f"{name:<28} {rows:>8} {legacy_time * 1000:>17.1f} {json_time * 1000:>21.1f} "
+                  f"{batched_time * 1000:>13.1f}")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Локальне дзеркало quotes.toscrape.com для бенчмарків і перевірок скрапера без доступу до мережі.
+
+Віддає сторінки цитат /page/N/ і авторів /author/Ім'я-Прізвище/ з записаних файлів
+(quotes.json / authors.json або NDJSON) чи синтетичного набору. Затримка, jitter і частка
+помилок налаштовуються; /__stats__ повертає лічильники запитів у JSON.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.mirror_server --port 8000 --latency 0.05 --jitter 0.02 --error-rate 0.05
+    python -m benchmarks.mirror_server --synthetic-pages 500 --port 8000
+    python scraper.py --base-url http://127.0.0.1:8000 --workers 8 --rate 100
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+from benchmarks.synthetic import generate_authors, generate_quotes
+from json_stream import iter_records
+
+PAGE_SIZE = 10
+
+
+def render_quotes_page(quotes, page_num, has_next):
+    """Будує сторінку з цитатами з розміткою quotes.toscrape.com"""
+    items = []
+    for quote in quotes:
+        tags = "".join(
+            f'<a class="tag" href="/tag/{html.escape(tag)}/page/1/">{html.escape(tag)}</a>'
+            for tag in quote["tags"]
+        )
+        items.append(
+            '<div class="quote" itemscope itemtype="http://schema.org/CreativeWork">'
+            f'<span class="text" itemprop="text">{html.escape(quote["text"])}</span>'
+            f'<span>by <small class="author" itemprop="author">{html.escape(quote["author"])}</small>'
+            f'<a href="/author/{html.escape(quote["author"].replace(" ", "-"))}">(about)</a></span>'
+            f'<div class="tags">Tags: <meta class="keywords" itemprop="keywords" content="{html.escape(",".join(quote["tags"]))}">{tags}</div>'
+            '</div>'
+        )
+    if not items:
+        items.append("No quotes found!")
+    sidebar = "".join(
+        f'<span class="tag-item"><a class="tag" style="font-size: {28 - i}px" href="/tag/tag-{i}/">tag-{i}</a></span>'
+        for i in range(10)
+    )
+    pager = f'<li class="next"><a href="/page/{page_num + 1}/">Next <span aria-hidden="true">&rarr;</span></a></li>' if has_next else ""
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8"><title>Quotes to Scrape</title>'
+        '<link rel="stylesheet" href="/static/bootstrap.min.css"><link rel="stylesheet" href="/static/main.css"></head>'
+        '<body><div class="container"><div class="row header-box"><div class="col-md-8"><h1>'
+        '<a href="/" style="text-decoration: none">Quotes to Scrape</a></h1></div>'
+        '<div class="col-md-4"><p><a href="/login">Login</a></p></div></div>'
+        f'<div class="row"><div class="col-md-8">{"".join(items)}'
+        f'<nav><ul class="pager">{pager}</ul></nav></div>'
+        f'<div class="col-md-4 tags-box"><h2>Top Ten tags</h2>{sidebar}</div></div></div>'
+        '<footer class="footer"><div class="container"><p class="text-muted">Quotes by: '
+        '<a href="https://www.goodreads.com/quotes">GoodReads.com</a></p></div></footer></body></html>'
+    )
+
+
+def render_author_page(author):
+    """Будує сторінку автора з розміткою quotes.toscrape.com"""
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8"><title>Quotes to Scrape</title></head>'
+        '<body><div class="container"><div class="row header-box"><h1><a href="/">Quotes to Scrape</a></h1></div>'
+        f'<div class="author-details"><h3 class="author-title">{html.escape(author["name"])}</h3>'
+        f'<p><strong>Born:</strong> <span class="author-born-date">{html.escape(author["born_date"])}</span> '
+        f'<span class="author-born-location">{html.escape(author["born_location"])}</span></p>'
+        f'<p><strong>Description:</strong></p><div class="author-description">{html.escape(author["description"])}</div>'
+        '</div></div><footer class="footer"></footer></body></html>'
+    )
+
+
+class MirrorSite:
+    """Вміст дзеркала: сторінки цитат по page_size і сторінки авторів, відрендерені при першому запиті"""
+
+    def __init__(self, quotes, authors, page_size=PAGE_SIZE):
+        self.pages = [quotes[start:start + page_size] for start in range(0, len(quotes), page_size)]
+        self.authors = {author["name"].replace(" ", "-"): author for author in authors}
+        self.rendered = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_files(cls, quotes_file="quotes.json", authors_file="authors.json", page_size=PAGE_SIZE):
+        """Дзеркало записаних даних скрапера (JSON або NDJSON)"""
+        return cls(list(iter_records(quotes_file)), list(iter_records(authors_file)), page_size)
+
+    @classmethod
+    def synthetic(cls, pages, authors_count=50, page_size=PAGE_SIZE, seed=42):
+        """Дзеркало синтетичного набору з заданою кількістю сторінок"""
+        rng = random.Random(seed)
+        authors = generate_authors(authors_count, rng)
+        quotes = list(generate_quotes(pages * page_size, authors, tag_count=100, rng=rng))
+        return cls(quotes, authors, page_size)
+
+    def render(self, path):
+        """Повертає (статус, тіло, тип сторінки) для шляху запиту"""
+        with self.lock:
+            cached = self.rendered.get(path)
+        if cached:
+            return cached
+
+        parts = [unquote(part) for part in path.split("?")[0].strip("/").split("/")]
+        if len(parts) == 2 and parts[0] == "page" and parts[1].isdigit():
+            page_num = int(parts[1])
+            quotes = self.pages[page_num - 1] if 1 <= page_num <= len(self.pages) else []
+            result = (200, render_quotes_page(quotes, page_num, page_num < len(self.pages)), "pages")
+        elif len(parts) == 2 and parts[0] == "author" and parts[1] in self.authors:
+            result = (200, render_author_page(self.authors[parts[1]]), "authors")
+        else:
+            return 404, "<html><body>Not found</body></html>", "not_found"
+
+        with self.lock:
+            self.rendered[path] = result
+        return result
+
+
+class MirrorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        mirror = self.server.mirror
+        if self.path == "/__stats__":
+            self.respond(200, json.dumps(mirror.snapshot()), content_type="application/json")
+            return
+
+        mirror.count("requests")
+        delay = mirror.delay()
+        if delay:
+            time.sleep(delay)
+        if mirror.inject_error():
+            mirror.count("errors")
+            headers = {"Retry-After": str(mirror.retry_after)} if mirror.retry_after is not None else {}
+            self.respond(mirror.error_status, "<html><body>Service Unavailable</body></html>", headers)
+            return
+
+        status, body, kind = mirror.site.render(self.path)
+        mirror.count(kind)
+        etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest()[:16] + '"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            mirror.count("not_modified")
+            self.respond(304, "", {"ETag": etag})
+            return
+        self.respond(status, body, {"ETag": etag} if status == 200 else {})
+
+    def respond(self, status, body, headers=None, content_type="text/html; charset=utf-8"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+
+class MirrorServer:
+    """HTTP-сервер дзеркала у фоновому потоці з налаштовуваною затримкою і помилками"""
+
+    def __init__(self, site, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 error_status=503, retry_after=None, seed=0):
+        self.site = site
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "pages": 0, "authors": 0, "not_found": 0, "errors": 0, "not_modified": 0}
+        self.httpd = None
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.httpd.server_address[1]}"
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def delay(self):
+        """Затримка відповіді: latency ± jitter"""
+        if not self.latency and not self.jitter:
+            return 0.0
+        with self.lock:
+            return max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+
+    def inject_error(self):
+        """Чи відповісти на цей запит помилкою"""
+        if not self.error_rate:
+            return False
+        with self.lock:
+            return self.rng.random() < self.error_rate
+
+    def start(self):
+        self.httpd = ThreadingHTTPServer((self.host, self.port), MirrorHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mirror = self
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    """Запускає дзеркало до Ctrl+C"""
+    parser = argparse.ArgumentParser(description="Локальне дзеркало quotes.toscrape.com")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--quotes", default="quotes.json", help="записані цитати (JSON або NDJSON)")
+    parser.add_argument("--authors", default="authors.json", help="записані автори (JSON або NDJSON)")
+    parser.add_argument("--synthetic-pages", type=int, default=None,
+                        help="замість записаних файлів віддавати синтетичний набір з такою кількістю сторінок")
+    parser.add_argument("--synthetic-authors", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    parser.add_argument("--latency", type=float, default=0.0, help="затримка відповіді, секунд")
+    parser.add_argument("--jitter", type=float, default=0.0, help="випадкове відхилення затримки, ± секунд")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="частка запитів, що отримують помилку")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=int, default=None, help="значення Retry-After у відповідях з помилкою")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.synthetic_pages:
+        site = MirrorSite.synthetic(args.synthetic_pages, args.synthetic_authors, args.page_size)
+    else:
+        site = MirrorSite.from_files(args.quotes, args.authors, args.page_size)
+    server = MirrorServer(site, args.host, args.port, args.latency, args.jitter, args.error_rate,
+                          args.error_status, args.retry_after, args.seed).start()
+    print(f"Дзеркало на {server.url}: {len(site.pages)} сторінок, {len(site.authors)} авторів", flush=True)
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Генератор синтетичних даних у форматі quotes.json / authors.json для бенчмарків.
+"""
+
+import itertools
+import json
+import os
+import random
+
+WORDS = (
+    "life love truth world mind heart time dream hope fear light dark friend book "
+    "change thinking courage wisdom happiness freedom soul nothing everything always "
+    "never people simple beautiful strange reason silence story journey believe"
+).split()
+
+# Словник тексту цитат: ~1200 слів, частоти за Ципфом, як у природній мові
+VOCABULARY = WORDS + [first + second for first in WORDS for second in WORDS if first != second]
+VOCABULARY_WEIGHTS = list(itertools.accumulate(1 / (i + 1) for i in range(len(VOCABULARY))))
+
+
+def generate_authors(count, rng):
+    """Генерує count авторів з унікальними іменами"""
+    authors = []
+    for i in range(count):
+        authors.append({
+            "name": f"Author {i:06d} {rng.choice(WORDS).title()}",
+            "born_date": f"{rng.choice(['January', 'March', 'July', 'October'])} {rng.randint(1, 28)}, {rng.randint(1700, 1990)}",
+            "born_location": f"in {rng.choice(WORDS).title()}ville",
+            "description": " ".join(rng.choices(WORDS, k=rng.randint(40, 120))).capitalize() + ".",
+        })
+    return authors
+
+
+def generate_quotes(count, authors, tag_count=500, max_tags=5, skew=1.1, rng=None):
+    """Генерує count цитат; автори і теги обираються за розподілом Ципфа з параметром skew"""
+    rng = rng or random.Random(0)
+    tags = [f"{rng.choice(WORDS)}-{i}" for i in range(tag_count)]
+    tag_weights = list(itertools.accumulate(1 / (i + 1) ** skew for i in range(tag_count)))
+    author_weights = list(itertools.accumulate(1 / (i + 1) ** skew for i in range(len(authors))))
+
+    for i in range(count):
+        author = rng.choices(authors, cum_weights=author_weights)[0]
+        quote_tags = sorted(set(rng.choices(tags, cum_weights=tag_weights, k=rng.randint(0, max_tags))))
+        yield {
+            "text": f"“{' '.join(rng.choices(VOCABULARY, cum_weights=VOCABULARY_WEIGHTS, k=rng.randint(8, 40))).capitalize()} #{i}.”",
+            "author": author["name"],
+            "tags": quote_tags,
+        }
+
+
+def write_dataset(directory, quotes_count, authors_count, tag_count=500, max_tags=5, ndjson=False, seed=42):
+    """Записує синтетичні файли авторів і цитат; повертає (шлях цитат, шлях авторів)"""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    extension = ".ndjson" if ndjson else ".json"
+    quotes_path = os.path.join(directory, "quotes" + extension)
+    authors_path = os.path.join(directory, "authors" + extension)
+
+    authors = generate_authors(authors_count, rng)
+    quotes = generate_quotes(quotes_count, authors, tag_count, max_tags, rng=rng)
+    for path, records in ((authors_path, authors), (quotes_path, quotes)):
+        with open(path, 'w', encoding='utf-8') as f:
+            if ndjson:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                # Те саме, що json.dump(list(records)), але без списку в пам'яті - для наборів у кілька ГБ
+                separator = "["
+                for record in records:
+                    f.write(separator + json.dumps(record, ensure_ascii=False))
+                    separator = ", "
+                f.write("[]" if separator == "[" else "]")
+    return quotes_path, authors_path
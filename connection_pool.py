@@ -0,0 +1,115 @@
+import contextlib
+import os
+import queue
+import threading
+from urllib.request import pathname2url
+
+from db_tuning import PERFORMANCE_PROFILE, apply_performance_profile
+from instrumentation import sqlite_connect
+
+# PRAGMA з'єднань лише на читання: режим журналу і synchronous стосуються запису, їх не змінюємо
+READ_PROFILE = {name: value for name, value in PERFORMANCE_PROFILE.items()
+                if name not in ("journal_mode", "synchronous")}
+
+
+def read_only_uri(db_name):
+    """URI бази даних у режимі лише на читання"""
+    return "file:" + pathname2url(os.path.abspath(db_name)) + "?mode=ro"
+
+
+class ConnectionPool:
+    """Пул з'єднань SQLite: потік бере з'єднання на час запиту і повертає його після"""
+
+    def __init__(self, db_name, size=4, read_only=True, profile=READ_PROFILE, timeout=30.0):
+        self.db_name = db_name
+        self.size = size
+        self.read_only = read_only
+        self.profile = profile
+        self.timeout = timeout
+        # LIFO: найчастіше використовується те саме "тепле" з'єднання з наповненим кешем сторінок
+        self.idle = queue.LifoQueue()
+        self.lock = threading.Lock()
+        self.created = 0
+        self.closed = False
+        # id потоку -> з'єднання, яке він зараз використовує (для interrupt)
+        self.checked_out = {}
+        self.stats = {"created": 0, "checkouts": 0, "waits": 0}
+
+    def _connect(self):
+        if self.read_only:
+            conn = sqlite_connect(read_only_uri(self.db_name), uri=True, check_same_thread=False)
+        else:
+            conn = sqlite_connect(self.db_name, check_same_thread=False)
+        apply_performance_profile(conn, self.profile)
+        return conn
+
+    def acquire(self):
+        """Бере вільне з'єднання, відкриває нове, поки пул не заповнений, або чекає до timeout"""
+        if self.closed:
+            raise RuntimeError("Пул з'єднань закрито")
+        try:
+            conn = self.idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                create = self.created < self.size
+                if create:
+                    self.created += 1
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self.lock:
+                        self.created -= 1
+                    raise
+                with self.lock:
+                    self.stats["created"] += 1
+            else:
+                with self.lock:
+                    self.stats["waits"] += 1
+                try:
+                    conn = self.idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"Немає вільного з'єднання з {self.db_name} за {self.timeout} с")
+        with self.lock:
+            self.stats["checkouts"] += 1
+            self.checked_out[threading.get_ident()] = conn
+        return conn
+
+    def release(self, conn):
+        """Повертає з'єднання в пул (після закриття пулу - закриває його)"""
+        with self.lock:
+            if self.checked_out.get(threading.get_ident()) is conn:
+                del self.checked_out[threading.get_ident()]
+        if conn.in_transaction:
+            conn.rollback()
+        if self.closed:
+            conn.close()
+        else:
+            self.idle.put(conn)
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Контекст, що видає з'єднання з пулу і гарантовано повертає його"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def interrupt(self, thread_id):
+        """Перериває запит, що виконується на з'єднанні потоку thread_id; повертає, чи було що переривати"""
+        with self.lock:
+            conn = self.checked_out.get(thread_id)
+        if conn is None:
+            return False
+        conn.interrupt()
+        return True
+
+    def close(self):
+        """Закриває вільні з'єднання; зайняті закриються під час повернення"""
+        self.closed = True
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
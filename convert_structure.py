@@ -1,73 +1,123 @@
-import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 
-def convert_quotes_structure():
-    """Конвертує структуру quotes.json під попереднє завдання"""
+from json_stream import iter_records, write_records
+
+# Відображення полів: поле результату -> поле вхідного запису або функція від запису.
+# Функції мають бути визначені на рівні модуля, щоб їх можна було передати в інший процес
+QUOTE_FIELDS = {
+    "quote": "text",  # text -> quote
+    "author": "author",
+    "tags": "tags"
+}
+AUTHOR_FIELDS = {
+    "fullname": "name",  # name -> fullname
+    "born_date": "born_date",
+    "born_location": "born_location",
+    "description": "description"
+}
+
+
+def map_records(records, mapping):
+    """Перебудовує записи за відображенням полів, по одному запису"""
+    getters = [(field, source if callable(source) else itemgetter(source))
+               for field, source in mapping.items()]
+    for record in records:
+        yield {field: get(record) for field, get in getters}
+
+
+def convert_records(input_file, output_file, mapping):
+    """Потоково конвертує JSON-масив або NDJSON у файл нової структури; повертає кількість записів"""
+    return write_records(output_file, map_records(iter_records(input_file), mapping))
+
+
+def convert_files(jobs, workers=2):
+    """Виконує конвертації (вхід, вихід, відображення) паралельно в окремих процесах; повертає кількості"""
+    if workers <= 1 or len(jobs) <= 1:
+        return [convert_records(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = [pool.submit(convert_records, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def parse_mapping(specs, base):
+    """Доповнює відображення правилами "нове=старе"; "нове=" прибирає поле з результату"""
+    mapping = dict(base)
+    for spec in specs or []:
+        field, separator, source = spec.partition("=")
+        if not separator or not field:
+            raise ValueError(f"Некоректне правило поля: {spec}. Формат: нове=старе")
+        if source:
+            mapping[field] = source
+        else:
+            mapping.pop(field, None)
+    return mapping
+
+
+def convert_quotes_structure(input_file='quotes.json', output_file='quotes_converted.json', mapping=QUOTE_FIELDS):
+    """Конвертує структуру quotes.json (або quotes.ndjson) під попереднє завдання"""
     try:
-        with open('quotes.json', 'r', encoding='utf-8') as f:
-            quotes = json.load(f)
-        
-        # Конвертуємо структуру
-        converted_quotes = []
-        for quote in quotes:
-            converted_quote = {
-                "quote": quote["text"],  # text -> quote
-                "author": quote["author"],
-                "tags": quote["tags"]
-            }
-            converted_quotes.append(converted_quote)
-        
-        # Зберігаємо з новою структурою
-        with open('quotes_converted.json', 'w', encoding='utf-8') as f:
-            json.dump(converted_quotes, f, ensure_ascii=False, indent=2)
-        
-        print(f"✅ Конвертовано {len(converted_quotes)} цитат")
-        print("📁 Збережено як quotes_converted.json")
-        
+        count = convert_records(input_file, output_file, mapping)
+
+        print(f"✅ Конвертовано {count} цитат")
+        print(f"📁 Збережено як {output_file}")
+        return count
+
     except Exception as e:
         print(f"❌ Помилка конвертації quotes: {e}")
 
-def convert_authors_structure():
-    """Конвертує структуру authors.json під попереднє завдання"""
+def convert_authors_structure(input_file='authors.json', output_file='authors_converted.json', mapping=AUTHOR_FIELDS):
+    """Конвертує структуру authors.json (або authors.ndjson) під попереднє завдання"""
     try:
-        with open('authors.json', 'r', encoding='utf-8') as f:
-            authors = json.load(f)
-        
-        # Конвертуємо структуру
-        converted_authors = []
-        for author in authors:
-            converted_author = {
-                "fullname": author["name"],  # name -> fullname
-                "born_date": author["born_date"],
-                "born_location": author["born_location"],
-                "description": author["description"]
-            }
-            converted_authors.append(converted_author)
-        
-        # Зберігаємо з новою структурою
-        with open('authors_converted.json', 'w', encoding='utf-8') as f:
-            json.dump(converted_authors, f, ensure_ascii=False, indent=2)
-        
-        print(f"✅ Конвертовано {len(converted_authors)} авторів")
-        print("📁 Збережено як authors_converted.json")
-        
+        count = convert_records(input_file, output_file, mapping)
+
+        print(f"✅ Конвертовано {count} авторів")
+        print(f"📁 Збережено як {output_file}")
+        return count
+
     except Exception as e:
         print(f"❌ Помилка конвертації authors: {e}")
 
 def main():
     """Головна функція конвертації"""
+    parser = argparse.ArgumentParser(description="Конвертація структури JSON файлів")
+    parser.add_argument("--quotes", default="quotes.json", help="вхідний JSON або NDJSON файл цитат")
+    parser.add_argument("--authors", default="authors.json", help="вхідний JSON або NDJSON файл авторів")
+    parser.add_argument("--quotes-output", default="quotes_converted.json",
+                        help="файл результату для цитат (.ndjson / .jsonl - NDJSON)")
+    parser.add_argument("--authors-output", default="authors_converted.json",
+                        help="файл результату для авторів (.ndjson / .jsonl - NDJSON)")
+    parser.add_argument("--quote-field", action="append", metavar="НОВЕ=СТАРЕ",
+                        help="додаткове правило поля цитат; 'нове=' прибирає поле (можна повторювати)")
+    parser.add_argument("--author-field", action="append", metavar="НОВЕ=СТАРЕ",
+                        help="додаткове правило поля авторів; 'нове=' прибирає поле (можна повторювати)")
+    parser.add_argument("--workers", type=int, default=2,
+                        help="кількість процесів; 1 - конвертувати файли послідовно")
+    args = parser.parse_args()
+
     print("🔄 Конвертація структури JSON файлів...")
     print("=" * 50)
-    
-    convert_quotes_structure()
-    print()
-    convert_authors_structure()
-    print()
-    
+
+    try:
+        quote_fields = parse_mapping(args.quote_field, QUOTE_FIELDS)
+        author_fields = parse_mapping(args.author_field, AUTHOR_FIELDS)
+        # Цитати й автори конвертуються одночасно, кожен файл - потоком у своєму процесі
+        quotes_count, authors_count = convert_files([
+            (args.quotes, args.quotes_output, quote_fields),
+            (args.authors, args.authors_output, author_fields)
+        ], args.workers)
+    except Exception as e:
+        print(f"❌ Помилка конвертації: {e}")
+        return
+
+    print(f"✅ Конвертовано {quotes_count} цитат")
+    print(f"✅ Конвертовано {authors_count} авторів")
     print("✅ Конвертація завершена!")
     print("\n📋 Створені файли:")
-    print("  - quotes_converted.json (з полем 'quote' замість 'text')")
-    print("  - authors_converted.json (з полем 'fullname' замість 'name')")
+    print(f"  - {args.quotes_output} (з полем 'quote' замість 'text')")
+    print(f"  - {args.authors_output} (з полем 'fullname' замість 'name')")
     print("\n💡 Тепер ви можете використовувати ці файли з попереднім домашнім завданням!")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -1,18 +1,93 @@
-import json
-import sqlite3
+import argparse
+import hashlib
 import os
 from datetime import datetime
 
+from db_tuning import (PERFORMANCE_PROFILE, analyze, apply_performance_profile, bump_data_generation,
+                       check_statistics, migrate_schema, rebuild_search_index, rebuild_statistics,
+                       refresh_statistics)
+from instrumentation import enable as enable_metrics, increment, span, sqlite_connect, write_metrics
+from json_stream import iter_records
+from quotes_manager import LEGACY_FORMATS, QuotesManager
+from snapshot import create_snapshot
+
+AUTHOR_FIELDS = ('born_date', 'born_location', 'description')
+
+def quote_hashes(author_name, text, tags):
+    """Повертає (ключ цитати, хеш вмісту).
+
+    Ключ залежить лише від автора і тексту - це та сама цитата;
+    хеш вмісту враховує ще й теги, щоб помітити зміни.
+    """
+    digest = hashlib.sha1(f"{author_name}\x00{text}".encode('utf-8'))
+    key = digest.hexdigest()
+    digest.update(("\x00" + "\x1f".join(sorted(set(tags)))).encode('utf-8'))
+    return key, digest.hexdigest()
+
+class QuoteBatch:
+    """Рядки пачки цитат для executemany: нові та змінені цитати, нові теги, зв'язки і пошуковий індекс"""
+    
+    def __init__(self, next_quote_id, next_tag_id, tag_ids):
+        self.next_quote_id = next_quote_id
+        self.next_tag_id = next_tag_id
+        self.tag_ids = tag_ids
+        self.quote_rows = []
+        self.changed_rows = []
+        self.new_tag_rows = []
+        self.quote_tag_rows = []
+        self.search_rows = []
+    
+    def __len__(self):
+        return len(self.quote_rows) + len(self.changed_rows)
+    
+    def add_new(self, text, author_name, author_id, tags, hashes):
+        """Додає нову цитату з заздалегідь виділеним id"""
+        quote_id = self.next_quote_id
+        self.next_quote_id += 1
+        self.quote_rows.append((quote_id, text, author_id) + hashes)
+        self._add_tags(quote_id, text, author_name, tags)
+    
+    def add_changed(self, quote_id, text, author_name, tags, content_hash):
+        """Додає існуючу цитату, теги якої змінилися"""
+        self.changed_rows.append((content_hash, quote_id))
+        self._add_tags(quote_id, text, author_name, tags)
+    
+    def _add_tags(self, quote_id, text, author_name, tags):
+        for tag_name in tags:
+            tag_id = self.tag_ids.get(tag_name)
+            if tag_id is None:
+                tag_id = self.tag_ids[tag_name] = self.next_tag_id
+                self.next_tag_id += 1
+                self.new_tag_rows.append((tag_id, tag_name))
+            self.quote_tag_rows.append((quote_id, tag_id))
+        self.search_rows.append((quote_id, text, author_name, " ".join(tags)))
+    
+    def clear(self):
+        self.quote_rows.clear()
+        self.changed_rows.clear()
+        self.new_tag_rows.clear()
+        self.quote_tag_rows.clear()
+        self.search_rows.clear()
+
 class DatabaseLoader:
-    def __init__(self, db_name="quotes.db"):
+    def __init__(self, db_name="quotes.db", profile=PERFORMANCE_PROFILE):
         self.db_name = db_name
+        self.profile = profile
         self.conn = None
         self.cursor = None
+        # Кількість вставлених / оновлених / незмінних рядків останнього завантаження
+        self.load_stats = {}
+        # Автори і теги, чия зведена статистика зміниться після поточної транзакції
+        self.touched_authors = set()
+        self.touched_tags = set()
+        # Зміна кількості рядків за таблицями в поточній транзакції: вставлено мінус видалено
+        self.row_deltas = {}
     
     def connect(self):
         """Підключається до бази даних"""
         try:
-            self.conn = sqlite3.connect(self.db_name)
+            self.conn = sqlite_connect(self.db_name)
+            apply_performance_profile(self.conn, self.profile)
             self.cursor = self.conn.cursor()
             print(f"Підключено до бази даних: {self.db_name}")
         except Exception as e:
@@ -67,6 +142,9 @@ class DatabaseLoader:
             ''')
             
             self.conn.commit()
+            
+            # Індекси та інші зміни схеми за версіями
+            migrate_schema(self.conn)
             print("Таблиці створено успішно")
             
         except Exception as e:
@@ -75,29 +153,50 @@ class DatabaseLoader:
         return True
     
     def load_authors(self, authors_file):
-        """Завантажує авторів з JSON файлу"""
+        """Завантажує авторів з JSON або NDJSON файлу; змінює лише нові та змінені рядки, id не змінюються"""
         try:
-            with open(authors_file, 'r', encoding='utf-8') as f:
-                authors = json.load(f)
+            print(f"Завантаження авторів з {authors_file}...")
             
-            print(f"Завантаження {len(authors)} авторів...")
+            self.cursor.execute('SELECT name, born_date, born_location, description FROM authors')
+            existing = {row[0]: row[1:] for row in self.cursor.fetchall()}
             
-            for author in authors:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR REPLACE INTO authors (name, born_date, born_location, description)
-                        VALUES (?, ?, ?, ?)
-                    ''', (
-                        author.get('name', ''),
-                        author.get('born_date', ''),
-                        author.get('born_location', ''),
-                        author.get('description', '')
-                    ))
-                except Exception as e:
-                    print(f"Помилка додавання автора {author.get('name', 'Unknown')}: {e}")
+            stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+            new_rows = []
+            changed_rows = []
+            for author in iter_records(authors_file):
+                name = author.get('name', '')
+                values = tuple(author.get(field, '') for field in AUTHOR_FIELDS)
+                current = existing.get(name)
+                if current is None:
+                    new_rows.append((name,) + values)
+                    stats["inserted"] += 1
+                elif current != values:
+                    changed_rows.append(values + (name,))
+                    stats["updated"] += 1
+                else:
+                    stats["unchanged"] += 1
+                existing[name] = values
             
-            self.conn.commit()
-            print("Автори завантажено успішно")
+            # UPDATE замість INSERT OR REPLACE: рядок не видаляється, тож id автора лишається тим самим
+            self.cursor.executemany('''
+                INSERT INTO authors (name, born_date, born_location, description)
+                VALUES (?, ?, ?, ?)
+            ''', new_rows)
+            self._count_rows('authors', self.cursor.rowcount)
+            self.cursor.executemany('''
+                UPDATE authors SET born_date = ?, born_location = ?, description = ?
+                WHERE name = ?
+            ''', changed_rows)
+            
+            if new_rows or changed_rows:
+                self._commit_changes()
+            else:
+                self.conn.commit()
+            self.load_stats["authors"] = stats
+            for action, value in stats.items():
+                increment("db_rows", value, table="authors", action=action)
+            print(f"Автори завантажено успішно: додано {stats['inserted']}, "
+                  f"оновлено {stats['updated']}, без змін {stats['unchanged']}")
             
         except Exception as e:
             print(f"Помилка завантаження авторів: {e}")
@@ -105,26 +204,28 @@ class DatabaseLoader:
         return True
     
     def load_quotes(self, quotes_file):
-        """Завантажує цитати з JSON файлу"""
+        """Завантажує цитати з JSON або NDJSON файлу"""
         try:
-            with open(quotes_file, 'r', encoding='utf-8') as f:
-                quotes = json.load(f)
-            
-            print(f"Завантаження {len(quotes)} цитат...")
+            print(f"Завантаження цитат з {quotes_file}...")
             
-            for quote in quotes:
+            count = 0
+            for quote in iter_records(quotes_file):
+                count += 1
                 try:
                     # Отримуємо ID автора
                     author_name = quote.get('author', '')
                     self.cursor.execute('SELECT id FROM authors WHERE name = ?', (author_name,))
                     author_result = self.cursor.fetchone()
                     author_id = author_result[0] if author_result else None
+                    self.touched_authors.add(author_id)
                     
                     # Додаємо цитату
+                    text = quote.get('text', '')
                     self.cursor.execute('''
-                        INSERT INTO quotes (text, author_id)
-                        VALUES (?, ?)
-                    ''', (quote.get('text', ''), author_id))
+                        INSERT INTO quotes (text, author_id, quote_key, content_hash)
+                        VALUES (?, ?, ?, ?)
+                    ''', (text, author_id) + quote_hashes(author_name, text, quote.get('tags', [])))
+                    self._count_rows('quotes', self.cursor.rowcount)
                     
                     quote_id = self.cursor.lastrowid
                     
@@ -136,6 +237,7 @@ class DatabaseLoader:
                             INSERT OR IGNORE INTO tags (name)
                             VALUES (?)
                         ''', (tag_name,))
+                        self._count_rows('tags', self.cursor.rowcount)
                         
                         # Отримуємо ID тегу
                         self.cursor.execute('SELECT id FROM tags WHERE name = ?', (tag_name,))
@@ -144,36 +246,271 @@ class DatabaseLoader:
                         
                         # Додаємо зв'язок цитата-тег
                         if tag_id:
+                            self.touched_tags.add(tag_id)
                             self.cursor.execute('''
                                 INSERT OR IGNORE INTO quote_tags (quote_id, tag_id)
                                 VALUES (?, ?)
                             ''', (quote_id, tag_id))
+                    
+                    # Додаємо цитату в пошуковий індекс
+                    self.cursor.execute('''
+                        INSERT INTO quotes_fts (rowid, text, author, tags)
+                        VALUES (?, ?, ?, ?)
+                    ''', (quote_id, text, author_name, " ".join(tags)))
                 
                 except Exception as e:
                     print(f"Помилка додавання цитати: {e}")
             
-            self.conn.commit()
-            print("Цитати завантажено успішно")
+            self._commit_changes()
+            increment("db_rows", count, table="quotes", action="inserted")
+            print(f"Цитати завантажено успішно: {count}")
             
         except Exception as e:
             print(f"Помилка завантаження цитат: {e}")
             return False
         return True
     
-    def get_statistics(self):
-        """Показує статистику бази даних"""
+    def load_quotes_bulk(self, quotes_file, batch_size=1000):
+        """Масово завантажує цитати: id авторів і тегів зі словників, вставка пачками через executemany"""
         try:
-            # Кількість авторів
-            self.cursor.execute('SELECT COUNT(*) FROM authors')
-            authors_count = self.cursor.fetchone()[0]
+            print(f"Масове завантаження цитат з {quotes_file} (пачки по {batch_size})...")
+            
+            # Один раз зчитуємо id авторів і тегів у словники
+            self.cursor.execute('SELECT name, id FROM authors')
+            author_ids = dict(self.cursor.fetchall())
+            self.cursor.execute('SELECT name, id FROM tags')
+            tag_ids = dict(self.cursor.fetchall())
+            
+            # Id нових рядків виділяємо самі, тоді lastrowid для кожної цитати не потрібен
+            batch = QuoteBatch(self._next_id('quotes'), self._next_id('tags'), tag_ids)
+            
+            count = 0
+            for quote in iter_records(quotes_file):
+                author_name = quote.get('author', '')
+                text = quote.get('text', '')
+                tags = quote.get('tags', [])
+                batch.add_new(text, author_name, author_ids.get(author_name), tags,
+                              quote_hashes(author_name, text, tags))
+                
+                count += 1
+                if len(batch) >= batch_size:
+                    self._write_batch(batch)
+            
+            self._write_batch(batch)
+            self._commit_changes()
+            increment("db_rows", count, table="quotes", action="inserted")
+            print(f"Цитати завантажено успішно: {count}")
+            
+        except Exception as e:
+            self._rollback()
+            print(f"Помилка масового завантаження цитат: {e}")
+            return False
+        return True
+    
+    def load_quotes_upsert(self, quotes_file, batch_size=1000):
+        """Ідемпотентно завантажує цитати за хешем вмісту: нові вставляє, змінені оновлює, решту не чіпає"""
+        try:
+            print(f"Завантаження цитат з {quotes_file} (upsert)...")
+            
+            orphans_removed = self._remove_orphaned_duplicates()
+            self._backfill_quote_hashes()
+            
+            self.cursor.execute('SELECT name, id FROM authors')
+            author_ids = dict(self.cursor.fetchall())
+            self.cursor.execute('SELECT name, id FROM tags')
+            tag_ids = dict(self.cursor.fetchall())
+            
+            # ключ цитати -> (id, хеш вмісту); дублікати від старих повторних завантажень видаляємо
+            existing = {}
+            duplicate_ids = []
+            self.cursor.execute('SELECT id, quote_key, content_hash FROM quotes ORDER BY id')
+            for quote_id, key, content_hash in self.cursor.fetchall():
+                if key in existing:
+                    duplicate_ids.append((quote_id,))
+                else:
+                    existing[key] = (quote_id, content_hash)
+            
+            batch = QuoteBatch(self._next_id('quotes'), self._next_id('tags'), tag_ids)
+            stats = {"inserted": 0, "updated": 0, "unchanged": 0,
+                     "duplicates_removed": len(duplicate_ids) + orphans_removed}
+            seen_keys = set()
+            
+            for quote in iter_records(quotes_file):
+                author_name = quote.get('author', '')
+                text = quote.get('text', '')
+                tags = quote.get('tags', [])
+                hashes = quote_hashes(author_name, text, tags)
+                if hashes[0] in seen_keys:
+                    continue
+                seen_keys.add(hashes[0])
+                
+                current = existing.get(hashes[0])
+                if current is None:
+                    batch.add_new(text, author_name, author_ids.get(author_name), tags, hashes)
+                    stats["inserted"] += 1
+                elif current[1] != hashes[1]:
+                    batch.add_changed(current[0], text, author_name, tags, hashes[1])
+                    stats["updated"] += 1
+                else:
+                    stats["unchanged"] += 1
+                
+                if len(batch) >= batch_size:
+                    self._write_batch(batch)
+            
+            self._write_batch(batch)
+            self._delete_quotes(duplicate_ids)
             
-            # Кількість цитат
-            self.cursor.execute('SELECT COUNT(*) FROM quotes')
-            quotes_count = self.cursor.fetchone()[0]
+            if stats["inserted"] or stats["updated"] or stats["duplicates_removed"]:
+                self._commit_changes()
+            else:
+                self.conn.commit()
+            self.load_stats["quotes"] = stats
+            for action, value in stats.items():
+                increment("db_rows", value, table="quotes", action=action)
+            print(f"Цитати завантажено успішно: додано {stats['inserted']}, оновлено {stats['updated']}, "
+                  f"без змін {stats['unchanged']}, видалено дублікатів {stats['duplicates_removed']}")
             
-            # Кількість тегів
-            self.cursor.execute('SELECT COUNT(*) FROM tags')
-            tags_count = self.cursor.fetchone()[0]
+        except Exception as e:
+            self._rollback()
+            print(f"Помилка завантаження цитат: {e}")
+            return False
+        return True
+    
+    def _remove_orphaned_duplicates(self):
+        """Видаляє копії цитат, чий author_id загубився через старий INSERT OR REPLACE авторів"""
+        orphan_filter = 'author_id IS NOT NULL AND author_id NOT IN (SELECT id FROM authors)'
+        self.cursor.execute(f'SELECT id, text FROM quotes WHERE {orphan_filter}')
+        orphans = self.cursor.fetchall()
+        if not orphans:
+            return 0
+        
+        # Осиротілу цитату видаляємо, лише якщо той самий текст є з дійсним автором
+        self.cursor.execute(f'SELECT text FROM quotes WHERE NOT ({orphan_filter})')
+        valid_texts = {hashlib.sha1(row[0].encode('utf-8')).digest() for row in self.cursor.fetchall()}
+        duplicate_ids = [(quote_id,) for quote_id, text in orphans
+                         if hashlib.sha1(text.encode('utf-8')).digest() in valid_texts]
+        self._delete_quotes(duplicate_ids)
+        return len(duplicate_ids)
+    
+    def _delete_quotes(self, id_rows):
+        """Видаляє цитати разом з їх тегами і записами пошукового індексу"""
+        self._touch_quotes(id_rows)
+        self.cursor.executemany('DELETE FROM quote_tags WHERE quote_id = ?', id_rows)
+        self.cursor.executemany('DELETE FROM quotes_fts WHERE rowid = ?', id_rows)
+        self.cursor.executemany('DELETE FROM quotes WHERE id = ?', id_rows)
+        self._count_rows('quotes', -self.cursor.rowcount)
+    
+    def _backfill_quote_hashes(self):
+        """Обчислює ключі та хеші для цитат, завантажених до появи цих колонок"""
+        self.cursor.execute('''
+            SELECT q.id, q.text, COALESCE(a.name, '')
+            FROM quotes q
+            LEFT JOIN authors a ON q.author_id = a.id
+            WHERE q.quote_key IS NULL
+        ''')
+        rows = self.cursor.fetchall()
+        if not rows:
+            return
+        
+        tags_by_quote = {}
+        self.cursor.execute('''
+            SELECT qt.quote_id, t.name
+            FROM quote_tags qt
+            JOIN tags t ON qt.tag_id = t.id
+            JOIN quotes q ON q.id = qt.quote_id
+            WHERE q.quote_key IS NULL
+        ''')
+        for quote_id, tag_name in self.cursor.fetchall():
+            tags_by_quote.setdefault(quote_id, []).append(tag_name)
+        
+        self.cursor.executemany('UPDATE quotes SET quote_key = ?, content_hash = ? WHERE id = ?', [
+            quote_hashes(author_name, text, tags_by_quote.get(quote_id, [])) + (quote_id,)
+            for quote_id, text, author_name in rows
+        ])
+        print(f"Обчислено ключі для {len(rows)} раніше завантажених цитат")
+    
+    def _touch_quotes(self, id_rows):
+        """Запам'ятовує авторів і теги цитат, які буде змінено або видалено"""
+        ids = [row[0] for row in id_rows]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            self.cursor.execute(f'SELECT author_id FROM quotes WHERE id IN ({placeholders})', chunk)
+            self.touched_authors.update(row[0] for row in self.cursor.fetchall())
+            self.cursor.execute(f'SELECT tag_id FROM quote_tags WHERE quote_id IN ({placeholders})', chunk)
+            self.touched_tags.update(row[0] for row in self.cursor.fetchall())
+    
+    def _count_rows(self, table, count):
+        """Запам'ятовує зміну кількості рядків таблиці в поточній транзакції"""
+        self.row_deltas[table] = self.row_deltas.get(table, 0) + count
+    
+    def _commit_changes(self):
+        """Оновлює зведену статистику зачеплених авторів і тегів, покоління даних і фіксує транзакцію"""
+        with span("db_refresh_statistics"):
+            refresh_statistics(self.conn, self.touched_authors, self.touched_tags, self.row_deltas)
+        self.touched_authors.clear()
+        self.touched_tags.clear()
+        self.row_deltas.clear()
+        bump_data_generation(self.conn)
+        self.conn.commit()
+    
+    def _rollback(self):
+        """Відкочує транзакцію разом з накопиченим обліком змін статистики"""
+        self.conn.rollback()
+        self.touched_authors.clear()
+        self.touched_tags.clear()
+        self.row_deltas.clear()
+    
+    def _next_id(self, table):
+        """Наступний вільний id з урахуванням лічильника AUTOINCREMENT"""
+        self.cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}')
+        max_id = self.cursor.fetchone()[0]
+        self.cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,))
+        row = self.cursor.fetchone()
+        return max(max_id, row[0] if row else 0) + 1
+    
+    def _write_batch(self, batch):
+        """Записує накопичену пачку через executemany і очищує її"""
+        changed_ids = [(row[1],) for row in batch.changed_rows]
+        self._touch_quotes(changed_ids)
+        self.touched_authors.update(row[2] for row in batch.quote_rows)
+        self.touched_tags.update(row[1] for row in batch.quote_tag_rows)
+        self.cursor.executemany('INSERT INTO tags (id, name) VALUES (?, ?)', batch.new_tag_rows)
+        self._count_rows('tags', self.cursor.rowcount)
+        self.cursor.executemany('''
+            INSERT INTO quotes (id, text, author_id, quote_key, content_hash) VALUES (?, ?, ?, ?, ?)
+        ''', batch.quote_rows)
+        self._count_rows('quotes', self.cursor.rowcount)
+        # Теги змінених цитат і їх записи у пошуковому індексі замінюються повністю
+        self.cursor.executemany('UPDATE quotes SET content_hash = ? WHERE id = ?', batch.changed_rows)
+        self.cursor.executemany('DELETE FROM quote_tags WHERE quote_id = ?', changed_ids)
+        self.cursor.executemany('DELETE FROM quotes_fts WHERE rowid = ?', changed_ids)
+        self.cursor.executemany('INSERT OR IGNORE INTO quote_tags (quote_id, tag_id) VALUES (?, ?)', batch.quote_tag_rows)
+        self.cursor.executemany('''
+            INSERT INTO quotes_fts (rowid, text, author, tags) VALUES (?, ?, ?, ?)
+        ''', batch.search_rows)
+        batch.clear()
+    
+    def rebuild_search_index(self):
+        """Повністю перебудовує повнотекстовий індекс quotes_fts з таблиць"""
+        try:
+            rebuild_search_index(self.conn)
+            self.conn.commit()
+            print("Пошуковий індекс перебудовано")
+        except Exception as e:
+            print(f"Помилка перебудови пошукового індексу: {e}")
+            return False
+        return True
+    
+    def get_statistics(self):
+        """Показує статистику бази даних"""
+        try:
+            # Кількість рядків зі зведеної таблиці замість COUNT(*) по кожній таблиці
+            self.cursor.execute('SELECT table_name, row_count FROM table_counts')
+            counts = dict(self.cursor.fetchall())
+            authors_count = counts.get('authors', 0)
+            quotes_count = counts.get('quotes', 0)
+            tags_count = counts.get('tags', 0)
             
             print("\n=== СТАТИСТИКА БАЗИ ДАНИХ ===")
             print(f"Авторів: {authors_count}")
@@ -184,23 +521,52 @@ class DatabaseLoader:
         except Exception as e:
             print(f"Помилка отримання статистики: {e}")
     
+    def check_statistics(self):
+        """Звіряє зведені таблиці статистики з повним перерахунком; повертає True, якщо розбіжностей немає"""
+        try:
+            mismatches = check_statistics(self.conn)
+        except Exception as e:
+            print(f"Помилка перевірки статистики: {e}")
+            return False
+        
+        if not mismatches:
+            print("Зведена статистика узгоджена з даними")
+            return True
+        print(f"Знайдено розбіжностей у зведеній статистиці: {len(mismatches)}")
+        for description, key, stored, actual in mismatches[:20]:
+            print(f"  {description} [{key}]: збережено {stored}, фактично {actual}")
+        return False
+    
+    def rebuild_statistics(self):
+        """Перераховує зведені таблиці статистики з нуля"""
+        try:
+            rebuild_statistics(self.conn)
+            bump_data_generation(self.conn)
+            self.conn.commit()
+            print("Зведену статистику перераховано")
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Помилка перерахунку статистики: {e}")
+            return False
+        return True
+    
     def close(self):
         """Закриває з'єднання з базою даних"""
         if self.conn:
             self.conn.close()
             print("З'єднання з базою даних закрито")
     
-    def run(self):
+    def run(self, authors_file='authors.json', quotes_file='quotes.json', mode="upsert", batch_size=1000):
         """Запускає повний процес завантаження"""
         print("Початок завантаження даних у базу даних...")
         
         # Перевіряємо наявність файлів
-        if not os.path.exists('authors.json'):
-            print("Помилка: файл authors.json не знайдено")
+        if not os.path.exists(authors_file):
+            print(f"Помилка: файл {authors_file} не знайдено")
             return False
         
-        if not os.path.exists('quotes.json'):
-            print("Помилка: файл quotes.json не знайдено")
+        if not os.path.exists(quotes_file):
+            print(f"Помилка: файл {quotes_file} не знайдено")
             return False
         
         # Підключаємося до бази даних
@@ -212,12 +578,25 @@ class DatabaseLoader:
             return False
         
         # Завантажуємо дані
-        if not self.load_authors('authors.json'):
+        with span("db_load", phase="authors"):
+            loaded = self.load_authors(authors_file)
+        if not loaded:
             return False
         
-        if not self.load_quotes('quotes.json'):
+        with span("db_load", phase="quotes", mode=mode):
+            if mode == "upsert":
+                loaded = self.load_quotes_upsert(quotes_file, batch_size)
+            elif mode == "bulk":
+                loaded = self.load_quotes_bulk(quotes_file, batch_size)
+            else:
+                loaded = self.load_quotes(quotes_file)
+        if not loaded:
             return False
         
+        # Оновлюємо статистику планувальника після завантаження
+        with span("db_load", phase="analyze"):
+            analyze(self.conn)
+        
         # Показуємо статистику
         self.get_statistics()
         
@@ -228,5 +607,50 @@ class DatabaseLoader:
         return True
 
 if __name__ == "__main__":
-    loader = DatabaseLoader()
-    loader.run() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Завантаження цитат і авторів у SQLite")
+    parser.add_argument("--db", default="quotes.db", help="файл бази даних")
+    parser.add_argument("--authors", default="authors.json", help="JSON або NDJSON файл авторів")
+    parser.add_argument("--quotes", default="quotes.json", help="JSON або NDJSON файл цитат")
+    parser.add_argument("--batch-size", type=int, default=1000, help="розмір пачки для масової вставки")
+    parser.add_argument("--mode", choices=["upsert", "bulk", "row"], default="upsert",
+                        help="upsert - ідемпотентне перезавантаження, bulk - швидке дописування "
+                             "у порожню базу, row - старий режим по одній цитаті")
+    parser.add_argument("--check-stats", action="store_true",
+                        help="лише звірити зведену статистику з повним перерахунком")
+    parser.add_argument("--rebuild-stats", action="store_true",
+                        help="лише перерахувати зведену статистику з нуля")
+    parser.add_argument("--metrics", default=None,
+                        help="зібрати метрики (зокрема час кожного SQL-запиту) і зберегти у файл "
+                             "(.prom / .txt - формат Prometheus, інакше JSON)")
+    parser.add_argument("--snapshot", default=None,
+                        help="після завантаження записати бінарний знімок для читання через mmap (snapshot.py)")
+    parser.add_argument("--legacy", action="store_true",
+                        help="після завантаження записати quotes_converted.json і authors_converted.json "
+                             "(формат попереднього завдання) прямо з бази")
+    parser.add_argument("--legacy-format", choices=LEGACY_FORMATS, default=None,
+                        help="формат файлів --legacy (за замовчуванням json з відступами)")
+    args = parser.parse_args()
+    if args.metrics:
+        enable_metrics()
+    
+    loader = DatabaseLoader(args.db)
+    if args.check_stats or args.rebuild_stats:
+        if loader.connect() and loader.create_tables():
+            ok = loader.rebuild_statistics() if args.rebuild_stats else loader.check_statistics()
+            loader.close()
+            raise SystemExit(0 if ok else 1)
+        raise SystemExit(1)
+    loaded = loader.run(authors_file=args.authors, quotes_file=args.quotes,
+                        mode=args.mode, batch_size=args.batch_size)
+    if loaded and args.snapshot:
+        with span("db_load", phase="snapshot"):
+            create_snapshot(args.db, args.snapshot)
+        print(f"Знімок записано у {args.snapshot}")
+    if loaded and args.legacy:
+        manager = QuotesManager(args.db)
+        if manager.connect():
+            manager.export_legacy(output_format=args.legacy_format)
+            manager.close()
+    if args.metrics:
+        write_metrics(args.metrics)
+        print(f"Метрики збережено у {args.metrics}") 
\ No newline at end of file
@@ -0,0 +1,215 @@
+import sqlite3
+
+# PRAGMA, що застосовуються до кожного з'єднання
+PERFORMANCE_PROFILE = {
+    "journal_mode": "WAL",        # читачі не блокують запис і навпаки
+    "synchronous": "NORMAL",      # у режимі WAL безпечно і значно швидше за FULL
+    "cache_size": -64000,         # від'ємне значення - у КіБ, тобто ~64 МБ кешу сторінок
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+# Заповнює quotes_fts з основних таблиць (rowid запису = id цитати)
+FTS_REBUILD_SQL = '''
+    INSERT INTO quotes_fts (rowid, text, author, tags)
+    SELECT
+        q.id,
+        q.text,
+        COALESCE(a.name, ''),
+        COALESCE((
+            SELECT GROUP_CONCAT(t.name, ' ')
+            FROM quote_tags qt
+            JOIN tags t ON qt.tag_id = t.id
+            WHERE qt.quote_id = q.id
+        ), '')
+    FROM quotes q
+    LEFT JOIN authors a ON q.author_id = a.id
+'''
+
+TABLE_COUNTS_SQL = """
+    INSERT INTO table_counts (table_name, row_count)
+    SELECT 'authors', COUNT(*) FROM authors
+    UNION ALL SELECT 'quotes', COUNT(*) FROM quotes
+    UNION ALL SELECT 'tags', COUNT(*) FROM tags
+"""
+
+# Повний перерахунок зведених таблиць статистики
+STATS_REBUILD_SQL = [
+    "DELETE FROM author_stats",
+    """
+    INSERT INTO author_stats (author_id, quotes_count)
+    SELECT a.id, COUNT(q.id)
+    FROM authors a
+    LEFT JOIN quotes q ON a.id = q.author_id
+    GROUP BY a.id
+    """,
+    "DELETE FROM tag_stats",
+    """
+    INSERT INTO tag_stats (tag_id, usage_count)
+    SELECT t.id, COUNT(qt.quote_id)
+    FROM tags t
+    LEFT JOIN quote_tags qt ON t.id = qt.tag_id
+    GROUP BY t.id
+    """,
+    "DELETE FROM table_counts",
+    TABLE_COUNTS_SQL,
+]
+
+# Ті самі значення, пораховані з нуля, для перевірки узгодженості: (опис, запит зведення, запит перерахунку)
+STATS_CHECKS = [
+    ("цитат за автором",
+     "SELECT author_id, quotes_count FROM author_stats",
+     "SELECT a.id, COUNT(q.id) FROM authors a LEFT JOIN quotes q ON a.id = q.author_id GROUP BY a.id"),
+    ("використань тегів",
+     "SELECT tag_id, usage_count FROM tag_stats",
+     "SELECT t.id, COUNT(qt.quote_id) FROM tags t LEFT JOIN quote_tags qt ON t.id = qt.tag_id GROUP BY t.id"),
+    ("рядків у таблицях",
+     "SELECT table_name, row_count FROM table_counts",
+     "SELECT 'authors', COUNT(*) FROM authors UNION ALL SELECT 'quotes', COUNT(*) FROM quotes "
+     "UNION ALL SELECT 'tags', COUNT(*) FROM tags"),
+]
+
+# Версійовані міграції схеми: (версія, опис, SQL-інструкції).
+# Поточна версія бази зберігається у PRAGMA user_version.
+MIGRATIONS = [
+    (1, "Індекси для вибірок за автором і тегом", [
+        "CREATE INDEX IF NOT EXISTS idx_quotes_author_id ON quotes (author_id)",
+        "CREATE INDEX IF NOT EXISTS idx_quote_tags_tag_id ON quote_tags (tag_id, quote_id)",
+    ]),
+    (2, "Ключ і хеш вмісту цитат для ідемпотентного завантаження", [
+        "ALTER TABLE quotes ADD COLUMN quote_key TEXT",
+        "ALTER TABLE quotes ADD COLUMN content_hash TEXT",
+    ]),
+    # Індекс підтримує завантажувач (DatabaseLoader): тригери на кожен тег роблять масове завантаження в рази повільнішим.
+    # З тієї ж причини зведену статистику (версія 5) оновлює завантажувач, а не тригери
+    (3, "Повнотекстовий індекс FTS5 за текстом, автором і тегами", [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS quotes_fts USING fts5("
+        "text, author, tags, tokenize = 'unicode61 remove_diacritics 2')",
+        "DELETE FROM quotes_fts",
+        FTS_REBUILD_SQL,
+    ]),
+    # Лічильник поколінь даних: завантажувач збільшує його при кожній зміні, кеш запитів за ним скидається
+    (4, "Лічильник поколінь даних для інвалідації кешу запитів", [
+        "CREATE TABLE IF NOT EXISTS data_generation ("
+        "id INTEGER PRIMARY KEY CHECK (id = 1), generation INTEGER NOT NULL)",
+        "INSERT OR IGNORE INTO data_generation (id, generation) VALUES (1, 0)",
+    ]),
+    (5, "Зведені таблиці статистики за авторами, тегами і таблицями", [
+        "CREATE TABLE IF NOT EXISTS author_stats ("
+        "author_id INTEGER PRIMARY KEY, quotes_count INTEGER NOT NULL DEFAULT 0)",
+        "CREATE TABLE IF NOT EXISTS tag_stats ("
+        "tag_id INTEGER PRIMARY KEY, usage_count INTEGER NOT NULL DEFAULT 0)",
+        "CREATE TABLE IF NOT EXISTS table_counts ("
+        "table_name TEXT PRIMARY KEY, row_count INTEGER NOT NULL DEFAULT 0)",
+        # Топ авторів і тегів читається прямо з індексу, без сортування
+        "CREATE INDEX IF NOT EXISTS idx_author_stats_count ON author_stats (quotes_count DESC, author_id)",
+        "CREATE INDEX IF NOT EXISTS idx_tag_stats_count ON tag_stats (usage_count DESC, tag_id)",
+    ] + STATS_REBUILD_SQL),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+BASE_TABLES = ('authors', 'quotes', 'tags', 'quote_tags')
+
+
+def apply_performance_profile(conn, profile=PERFORMANCE_PROFILE):
+    """Застосовує PRAGMA профілю продуктивності до з'єднання"""
+    for name, value in (profile or {}).items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def get_schema_version(conn):
+    """Повертає версію схеми бази"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate_schema(conn):
+    """Застосовує невиконані міграції; повертає версію схеми після міграції"""
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if not all(table in existing for table in BASE_TABLES):
+        # Базових таблиць ще немає - мігрувати нічого
+        return get_schema_version(conn)
+
+    current = get_schema_version(conn)
+    for version, description, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            conn.execute("BEGIN")
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        print(f"Міграція схеми до версії {version}: {description}")
+        current = version
+    return current
+
+
+def rebuild_search_index(conn):
+    """Перебудовує повнотекстовий індекс quotes_fts з нуля"""
+    conn.execute("DELETE FROM quotes_fts")
+    conn.execute(FTS_REBUILD_SQL)
+
+
+def get_data_generation(conn):
+    """Повертає поточне покоління даних"""
+    return conn.execute("SELECT generation FROM data_generation WHERE id = 1").fetchone()[0]
+
+
+def bump_data_generation(conn):
+    """Збільшує покоління даних; викликається в транзакції, що змінює дані, до commit"""
+    conn.execute("UPDATE data_generation SET generation = generation + 1 WHERE id = 1")
+
+
+def rebuild_statistics(conn):
+    """Перераховує зведені таблиці статистики з нуля"""
+    for statement in STATS_REBUILD_SQL:
+        conn.execute(statement)
+
+
+def refresh_statistics(conn, author_ids=(), tag_ids=(), row_deltas=None):
+    """Оновлює зведену статистику після зміни даних: перераховує лише зачеплених авторів і теги.
+
+    Лічильник кожного ключа рахується заново за індексом, тож помилка в обліку змін не накопичується.
+    Кількості рядків у таблицях зсуваються на row_deltas (таблиця -> вставлено мінус видалено) без COUNT(*);
+    повністю їх перераховують лише rebuild_statistics і check_statistics.
+    """
+    conn.execute("""
+        INSERT INTO author_stats (author_id, quotes_count)
+        SELECT id, 0 FROM authors WHERE id NOT IN (SELECT author_id FROM author_stats)
+    """)
+    conn.execute("""
+        INSERT INTO tag_stats (tag_id, usage_count)
+        SELECT id, 0 FROM tags WHERE id NOT IN (SELECT tag_id FROM tag_stats)
+    """)
+    conn.executemany("""
+        UPDATE author_stats SET quotes_count = (SELECT COUNT(*) FROM quotes WHERE author_id = ?1)
+        WHERE author_id = ?1
+    """, [(author_id,) for author_id in author_ids if author_id is not None])
+    conn.executemany("""
+        UPDATE tag_stats SET usage_count = (SELECT COUNT(*) FROM quote_tags WHERE tag_id = ?1)
+        WHERE tag_id = ?1
+    """, [(tag_id,) for tag_id in tag_ids])
+    conn.executemany("UPDATE table_counts SET row_count = row_count + ? WHERE table_name = ?",
+                     [(delta, table) for table, delta in (row_deltas or {}).items() if delta])
+
+
+def check_statistics(conn):
+    """Звіряє зведені таблиці з повним перерахунком; повертає список розбіжностей (опис, ключ, зведення, факт)"""
+    mismatches = []
+    for description, stored_sql, actual_sql in STATS_CHECKS:
+        stored = dict(conn.execute(stored_sql).fetchall())
+        actual = dict(conn.execute(actual_sql).fetchall())
+        for key in sorted(stored.keys() | actual.keys(), key=str):
+            if stored.get(key) != actual.get(key):
+                mismatches.append((description, key, stored.get(key), actual.get(key)))
+    return mismatches
+
+
+def analyze(conn):
+    """Оновлює статистику планувальника після масового завантаження"""
+    conn.execute("ANALYZE")
+    conn.commit()
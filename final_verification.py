@@ -26,7 +26,8 @@ def check_requirements():
     
     # 1. Перевірка використання BeautifulSoup
     try:
-        with open('scraper.py', 'r', encoding='utf-8') as f:
+        # Парсинг HTML винесено зі scraper.py у page_parser.py
+        with open('page_parser.py', 'r', encoding='utf-8') as f:
             content = f.read()
             if 'BeautifulSoup' in content and 'bs4' in content:
                 requirements["BeautifulSoup використання"] = True
@@ -34,7 +35,7 @@ def check_requirements():
             else:
                 print("❌ BeautifulSoup не знайдено")
     except Exception as e:
-        print(f"❌ Помилка перевірки scraper.py: {e}")
+        print(f"❌ Помилка перевірки page_parser.py: {e}")
     
     # 2. Перевірка скрапінгу
     if os.path.exists('quotes.json') and os.path.exists('authors.json'):
@@ -0,0 +1,255 @@
+import json
+import os
+import tempfile
+import time
+
+from convert_structure import AUTHOR_FIELDS, QUOTE_FIELDS, convert_records
+from database_loader import DatabaseLoader
+from json_stream import iter_json_array
+from quotes_manager import QuotesManager
+from snapshot import SnapshotReader
+
+# Запити, на які знімок має відповідати так само, як QuotesManager
+SNAPSHOT_QUERIES = {
+    "get_all_quotes": lambda source: source.get_all_quotes(),
+    "get_all_quotes (сторінка)": lambda source: source.get_all_quotes(after_id=10, limit=7),
+    "iter_quotes": lambda source: list(source.iter_quotes(chunk_size=16)),
+    "search_quotes_by_author": lambda source: source.search_quotes_by_author("Einstein"),
+    "search_quotes_by_author (регістр)": lambda source: source.search_quotes_by_author("einstein"),
+    "search_quotes_by_author (% і _)": lambda source: source.search_quotes_by_author("a_"),
+    "search_quotes_by_tag": lambda source: source.search_quotes_by_tag("love"),
+    "search_quotes_by_tag (підрядок)": lambda source: source.search_quotes_by_tag("li", after_id=20, limit=5),
+    "search_quotes_by_tags (усі)": lambda source: source.search_quotes_by_tags(["love", "life"]),
+    "search_quotes_by_tags (будь-який)": lambda source: source.search_quotes_by_tags(["love", "life"], False),
+    "search_quotes_by_tags (невідомий тег)": lambda source: source.search_quotes_by_tags(["love", "no-such-tag"]),
+    "get_all_authors": lambda source: source.get_all_authors(),
+    "get_quotes_count_by_author": lambda source: source.get_quotes_count_by_author(),
+    "get_top_tags": lambda source: source.get_top_tags(10),
+}
+
+def load_test_database(directory):
+    """Завантажує quotes.json і authors.json у нову базу в directory"""
+    db_name = os.path.join(directory, "formats_test.db")
+    assert DatabaseLoader(db_name).run(authors_file='authors.json', quotes_file='quotes.json')
+    return db_name
+
+def test_snapshot_roundtrip():
+    """Тестує, що знімок, записаний з бази, дає ті самі результати, що й QuotesManager"""
+    print("=== ТЕСТ БІНАРНОГО ЗНІМКА ===\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_name = load_test_database(directory)
+        snapshot_path = os.path.join(directory, "quotes.snap")
+        manager = QuotesManager(db_name)
+        assert manager.connect()
+        try:
+            assert manager.export_snapshot(snapshot_path)
+
+            with SnapshotReader(snapshot_path) as reader:
+                assert len(reader) == len(manager.get_all_quotes())
+                for name, query in SNAPSHOT_QUERIES.items():
+                    assert query(reader) == query(manager), name
+                    print(f"✓ {name}")
+
+            # Записи Quote / Author серіалізуються у ті самі словники
+            with SnapshotReader(snapshot_path, records=True) as reader:
+                assert [quote.to_dict() for quote in reader.get_all_quotes()] == manager.get_all_quotes()
+                assert [author.to_dict() for author in reader.get_all_authors()] == manager.get_all_authors()
+                print("✓ records=True")
+        finally:
+            manager.close()
+
+def test_snapshot_errors():
+    """Тестує, що пошкоджений або чужий файл не відкривається як знімок"""
+    print("\n=== ТЕСТ ПОМИЛОК ЗНІМКА ===\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_name = load_test_database(directory)
+        snapshot_path = os.path.join(directory, "quotes.snap")
+        manager = QuotesManager(db_name)
+        assert manager.connect()
+        try:
+            assert manager.export_snapshot(snapshot_path)
+        finally:
+            manager.close()
+        with open(snapshot_path, 'rb') as f:
+            data = f.read()
+
+        cases = {
+            "відсутній файл": None,
+            "порожній файл": b"",
+            "обрізаний заголовок": data[:20],
+            "інший формат": b"SQLite format 3\0" + data[16:],
+            "інша версія": data[:8] + b"\x63\0\0\0" + data[12:],
+        }
+        for name, content in cases.items():
+            path = os.path.join(directory, "broken.snap")
+            if os.path.exists(path):
+                os.remove(path)
+            if content is not None:
+                with open(path, 'wb') as f:
+                    f.write(content)
+            reader = SnapshotReader(path)
+            assert not reader.connect(), name
+            print(f"✓ {name} не відкривається")
+
+        try:
+            with SnapshotReader(os.path.join(directory, "missing.snap")):
+                pass
+            raise AssertionError("SnapshotReader мав повідомити про помилку")
+        except OSError:
+            print("✓ with SnapshotReader(...) повідомляє про помилку")
+
+def assert_same_records(path, expected_path):
+    """Порівнює записи двох JSON-файлів по одному; повертає кількість записів"""
+    with open(path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    with open(expected_path, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+    assert len(records) == len(expected), (path, len(records), len(expected))
+    for number, (record, expected_record) in enumerate(zip(records, expected)):
+        assert record == expected_record, (path, number, record, expected_record)
+    return len(records)
+
+def test_legacy_export():
+    """Тестує, що export_legacy() дає ті самі файли старого формату, що й convert_structure.py"""
+    print("\n=== ТЕСТ ЕКСПОРТУ У СТАРИЙ ФОРМАТ ===\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_name = load_test_database(directory)
+        quotes_file = os.path.join(directory, "quotes_legacy.json")
+        authors_file = os.path.join(directory, "authors_legacy.json")
+        manager = QuotesManager(db_name)
+        assert manager.connect()
+        try:
+            assert manager.export_legacy(quotes_file, authors_file)
+        finally:
+            manager.close()
+
+        converted_quotes = os.path.join(directory, "quotes_converted.json")
+        converted_authors = os.path.join(directory, "authors_converted.json")
+        convert_records('quotes.json', converted_quotes, QUOTE_FIELDS)
+        convert_records('authors.json', converted_authors, AUTHOR_FIELDS)
+
+        count = assert_same_records(quotes_file, converted_quotes)
+        print(f"✓ {count} цитат збігаються з convert_structure.py, включно з порядком тегів")
+        count = assert_same_records(authors_file, converted_authors)
+        print(f"✓ {count} авторів збігаються з convert_structure.py")
+
+def test_convert_keeps_output_on_error():
+    """Тестує, що конвертація пошкодженого входу не змінює вже наявний файл результату"""
+    print("\n=== ТЕСТ КОНВЕРТАЦІЇ ПОШКОДЖЕНОГО ВХОДУ ===\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open('quotes.json', 'r', encoding='utf-8') as f:
+            quotes = f.read()
+        # Обрізаний файл: перші записи розбираються, помилка - посередині потоку
+        truncated = write_text(directory, quotes[:len(quotes) // 2])
+
+        for name in ("quotes_converted.json", "quotes_converted.ndjson"):
+            output_file = os.path.join(directory, name)
+            count = convert_records('quotes.json', output_file, QUOTE_FIELDS)
+            with open(output_file, 'rb') as f:
+                previous = f.read()
+
+            try:
+                convert_records(truncated, output_file, QUOTE_FIELDS)
+                raise AssertionError("обрізаний вхід мав дати помилку")
+            except ValueError:
+                pass
+            with open(output_file, 'rb') as f:
+                assert f.read() == previous, name
+            assert not os.path.exists(output_file + ".tmp"), name
+            print(f"✓ {name}: попередній результат ({count} цитат) не змінено, тимчасовий файл прибрано")
+
+# Масиви, які iter_json_array має розбирати так само, як json.load
+VALID_ARRAYS = [
+    '[]',
+    '  [ ]  ',
+    '[1, -2.5e3, 0, true, false, null]',
+    '[12345678901234567890, 1.0E-7, -0.0]',
+    '["", "рядок", "лапки \\" і \\\\ слеш", "\\u0456\\ud83d\\ude00", "]", ","]',
+    '[{"text": "a", "tags": ["x", "y"], "nested": {"k": [1, {"z": null}]}}, {}]',
+    '[\n  {"a": 1},\n  {"b": [2, 3]}\n]\n',
+    '[[[]], [[], []], "[{", "}]"]',
+]
+
+# Некоректні входи і частина очікуваного повідомлення про помилку
+INVALID_ARRAYS = [
+    ('', "Неочікуваний кінець"),
+    ('   ', "Неочікуваний кінець"),
+    ('{"a": 1}', "очікувався JSON-масив"),
+    ('[1', "Неочікуваний кінець"),
+    ('[1,', "Неочікуваний кінець"),
+    ('[1,]', "некоректний JSON"),
+    ('[1 2]', "очікувалася кома"),
+    ('[{"a" 1}]', "некоректний JSON"),
+    ('["незакритий', "Unterminated string"),
+    ('[1]x', "зайві дані"),
+    ('[1] []', "зайві дані"),
+]
+
+def write_text(directory, content):
+    """Записує content у тимчасовий файл і повертає шлях"""
+    path = os.path.join(directory, "array.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return path
+
+def test_json_array_parser():
+    """Тестує, що iter_json_array повертає ті самі записи, що й json.load, за будь-якого розміру блоку"""
+    print("\n=== ТЕСТ ПОТОКОВОГО РОЗБОРУ JSON ===\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open('quotes.json', 'r', encoding='utf-8') as f:
+            quotes = f.read()
+        for content in VALID_ARRAYS + [quotes]:
+            path = write_text(directory, content)
+            expected = json.loads(content)
+            for chunk_size in (1, 2, 3, 7, 64, 1 << 20):
+                assert list(iter_json_array(path, chunk_size)) == expected, (content[:40], chunk_size)
+        print(f"✓ {len(VALID_ARRAYS) + 1} масивів збігаються з json.load для блоків від 1 байта")
+
+def test_json_array_errors():
+    """Тестує, що некоректний вхід дає ValueError, а пошкоджений великий файл не читається до кінця"""
+    print("\n=== ТЕСТ ПОМИЛОК ПОТОКОВОГО РОЗБОРУ JSON ===\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for content, message in INVALID_ARRAYS:
+            path = write_text(directory, content)
+            for chunk_size in (1, 3, 64):
+                try:
+                    list(iter_json_array(path, chunk_size))
+                    raise AssertionError(f"{content!r} мав дати помилку")
+                except ValueError as e:
+                    assert message in str(e), (content, chunk_size, str(e))
+            print(f"✓ {content!r}: {message}")
+
+        # Помилка на початку файлу виявляється одразу, без читання решти
+        record = json.dumps({"text": "x" * 100, "author": "a", "tags": ["t"]})
+        path = write_text(directory, '[{"text" "x"},\n' + ",\n".join([record] * 100000) + "]")
+        start = time.perf_counter()
+        try:
+            next(iter_json_array(path, 4096))
+            raise AssertionError("пошкоджений запис мав дати помилку")
+        except ValueError as e:
+            assert "позиції 9" in str(e), str(e)
+        elapsed = time.perf_counter() - start
+        assert elapsed < 0.5, elapsed
+        print(f"✓ пошкоджений запис у файлі {os.path.getsize(path) // (1024 * 1024)} МБ виявлено за {elapsed:.4f} с")
+
+def main():
+    """Головна функція тестування форматів"""
+    print("ПОЧАТОК ТЕСТУВАННЯ ФОРМАТІВ\n")
+
+    test_snapshot_roundtrip()
+    test_snapshot_errors()
+    test_legacy_export()
+    test_json_array_parser()
+    test_json_array_errors()
+    test_convert_keeps_output_on_error()
+
+    print("\n=== ТЕСТУВАННЯ ЗАВЕРШЕНО ===")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from instrumentation import increment
+
+
+class HttpCache:
+    """Дисковий кеш HTTP-відповідей з ETag/Last-Modified, max-age і обмеженням розміру"""
+
+    def __init__(self, cache_dir=".http_cache", max_age=24 * 3600, max_bytes=100 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.index = None
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "evictions": 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode('utf-8')).hexdigest() + ".json")
+
+    def _load_index(self):
+        """Один раз сканує каталог кешу: шлях -> (розмір, час останнього доступу)"""
+        if self.index is None:
+            self.index = {}
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    path = os.path.join(self.cache_dir, name)
+                    stat = os.stat(path)
+                    self.index[path] = (stat.st_size, stat.st_mtime)
+        return self.index
+
+    def _write(self, path, entry):
+        """Атомарно записує запис кешу"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+    def lookup(self, url):
+        """Повертає запис кешу для url або None"""
+        path = self._path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        with self.lock:
+            index = self._load_index()
+            if path in index:
+                index[path] = (index[path][0], time.time())
+        return entry
+
+    def is_fresh(self, entry):
+        """Чи молодший запис за max_age (тоді запит можна не робити)"""
+        return time.time() - entry["stored_at"] < self.max_age
+
+    def conditional_headers(self, entry):
+        """Заголовки умовного запиту для запису кешу"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def hit(self, entry):
+        """Враховує відповідь, віддану з кешу без запиту"""
+        with self.lock:
+            self.stats["hits"] += 1
+        increment("http_cache", result="hit")
+        return entry["body"]
+
+    def revalidate(self, url, entry):
+        """Сервер відповів 304: оновлює час запису і повертає збережене тіло"""
+        entry["stored_at"] = time.time()
+        self._put(url, entry)
+        with self.lock:
+            self.stats["revalidated"] += 1
+        increment("http_cache", result="revalidated")
+        return entry["body"]
+
+    def store(self, url, body, headers):
+        """Зберігає нову відповідь сервера"""
+        entry = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored_at": time.time(),
+            "body": body,
+        }
+        self._put(url, entry)
+        with self.lock:
+            self.stats["misses"] += 1
+        increment("http_cache", result="miss")
+
+    def _put(self, url, entry):
+        path = self._path(url)
+        size = self._write(path, entry)
+        with self.lock:
+            self._load_index()[path] = (size, time.time())
+            self._evict()
+
+    def _evict(self):
+        """Видаляє найдавніше використані записи, поки кеш більший за max_bytes"""
+        index = self.index
+        total = sum(size for size, _ in index.values())
+        if total <= self.max_bytes:
+            return
+        for path, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            del index[path]
+            total -= size
+            self.stats["evictions"] += 1
+
+
+class CrawlCheckpoint:
+    """Файл контрольної точки обходу: наступна сторінка, зібрані цитати та черга авторів.
+
+    Перший рядок - повний стан, далі - по рядку змін на кожне збереження: "quotes" дописуються,
+    "authors" оновлюються, решта полів замінюється. Так кожне збереження пише лише нове,
+    а не весь зібраний стан.
+    """
+
+    def __init__(self, path="crawl_checkpoint.json"):
+        self.path = path
+
+    def load(self):
+        """Повертає збережений стан (повний запис разом із дописаними змінами) або None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = None
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Обірваний останній запис: стан до нього цілісний
+                        break
+                    if state is None:
+                        state = record
+                    else:
+                        self._merge(state, record)
+                return state
+        except OSError:
+            return None
+
+    @staticmethod
+    def _merge(state, changes):
+        for key, value in changes.items():
+            if key == "quotes":
+                state.setdefault(key, []).extend(value)
+            elif key == "authors":
+                state.setdefault(key, {}).update(value)
+            else:
+                state[key] = value
+
+    def save(self, state):
+        """Атомарно зберігає повний стан, замінюючи попередній файл разом з усіма змінами"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(state, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def append(self, changes):
+        """Дописує зміни з часу попереднього збереження одним рядком"""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(changes, ensure_ascii=False) + "\n")
+
+    def clear(self):
+        """Видаляє контрольну точку після успішного завершення обходу"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
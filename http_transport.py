@@ -0,0 +1,109 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from instrumentation import increment, span
+
+# Статуси, після яких запит має сенс повторити
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HttpTransport:
+    """Спільна пулована HTTP-сесія з keep-alive, таймаутами та повторами з backoff"""
+
+    def __init__(self, pool_size=10, connect_timeout=5.0, read_timeout=15.0,
+                 max_retries=3, backoff_factor=0.5, backoff_max=30.0,
+                 retry_statuses=RETRY_STATUSES):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+
+        # Повтори робимо самі, щоб рахувати їх і додавати jitter
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+        self.lock = threading.Lock()
+        self.counters = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "request_time": 0.0,
+        }
+
+    def _count(self, name, value=1):
+        with self.lock:
+            self.counters[name] += value
+
+    def backoff_delay(self, attempt, response=None):
+        """Затримка перед повтором: експоненційний backoff з повним jitter або Retry-After"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(self.backoff_max, float(retry_after))
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** attempt)))
+
+    def get(self, url, headers=None):
+        """Виконує GET з повторами; повертає останню відповідь або кидає останню помилку"""
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            response = None
+            try:
+                with span("http_fetch"):
+                    response = self.session.get(url, headers=headers, timeout=self.timeout)
+                error = None
+                increment("http_requests", status=response.status_code)
+                increment("http_bytes", len(response.content))
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                increment("http_requests", status="error")
+            finally:
+                self._count("requests")
+                self._count("request_time", time.perf_counter() - start)
+
+            retryable = error is not None or response.status_code in self.retry_statuses
+            if not retryable:
+                return response
+
+            if attempt >= self.max_retries:
+                self._count("failures")
+                if error is not None:
+                    raise error
+                return response
+
+            delay = self.backoff_delay(attempt, response)
+            if response is not None:
+                response.close()
+            attempt += 1
+            self._count("retries")
+            increment("http_retries")
+            time.sleep(delay)
+
+    def stats(self):
+        """Повертає лічильники запитів, повторів і перевикористання з'єднань"""
+        opened = 0
+        served = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                served += pool.num_requests
+
+        with self.lock:
+            stats = dict(self.counters)
+        stats["connections_opened"] = opened
+        stats["connections_reused"] = max(0, served - opened)
+        stats["avg_request_time"] = stats["request_time"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
+
+    def close(self):
+        """Закриває сесію та всі з'єднання пулу"""
+        self.session.close()
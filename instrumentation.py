@@ -0,0 +1,253 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+
+# Метрики вимкнені за замовчуванням: span() повертає спільний порожній контекст,
+# increment() одразу виходить, а з'єднання SQLite створюються без обгорток
+PROMETHEUS_PREFIX = "quotes_"
+
+
+class _NullSpan:
+    """Порожній span для вимкнених метрик"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Вимірює час блоку і додає його до таймера метрик"""
+
+    __slots__ = ("metrics", "key", "start")
+
+    def __init__(self, metrics, key):
+        self.metrics = metrics
+        self.key = key
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics._observe(self.key, time.perf_counter() - self.start, 1)
+        return False
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items()))) if labels else (name, ())
+
+
+class Metrics:
+    """Лічильники і таймери (кількість, сума і максимум тривалості) з мітками"""
+
+    def __init__(self):
+        self.enabled = False
+        # Чи обгортати нові з'єднання SQLite для вимірювання кожного запиту
+        self.sql_enabled = False
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.timers = {}
+
+    def enable(self, sql=True):
+        """Вмикає збір метрик; sql=True - ще й час кожного SQL-запиту в нових з'єднаннях"""
+        self.enabled = True
+        self.sql_enabled = sql
+
+    def disable(self):
+        """Вимикає збір метрик (зібрані значення лишаються)"""
+        self.enabled = False
+        self.sql_enabled = False
+
+    def reset(self):
+        """Очищує зібрані значення"""
+        with self.lock:
+            self.counters.clear()
+            self.timers.clear()
+
+    def span(self, name, **labels):
+        """Контекст, що вимірює тривалість блоку: with metrics.span("html_parse"): ..."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, _key(name, labels))
+
+    def increment(self, name, value=1, **labels):
+        """Збільшує лічильник"""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def _observe(self, key, seconds, calls):
+        with self.lock:
+            timer = self.timers.get(key)
+            if timer is None:
+                self.timers[key] = [calls, seconds, seconds]
+            else:
+                timer[0] += calls
+                timer[1] += seconds
+                if seconds > timer[2]:
+                    timer[2] = seconds
+
+    def snapshot(self):
+        """Зібрані значення як словник, придатний для JSON"""
+        with self.lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self.counters.items())]
+            timers = [{"name": name, "labels": dict(labels), "count": calls,
+                       "total_seconds": total, "max_seconds": maximum}
+                      for (name, labels), (calls, total, maximum) in sorted(self.timers.items())]
+        return {"counters": counters, "timers": timers}
+
+    def to_json(self, indent=2):
+        """Метрики у JSON"""
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=indent)
+
+    def to_prometheus(self, prefix=PROMETHEUS_PREFIX):
+        """Метрики у текстовому форматі Prometheus: лічильники як counter, таймери як summary"""
+        snapshot = self.snapshot()
+        lines = []
+        declared = set()
+
+        def declare(name, kind):
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for counter in snapshot["counters"]:
+            name = f"{prefix}{counter['name']}_total"
+            declare(name, "counter")
+            lines.append(f"{name}{_prometheus_labels(counter['labels'])} {counter['value']}")
+        for timer in snapshot["timers"]:
+            name = f"{prefix}{timer['name']}_seconds"
+            labels = _prometheus_labels(timer["labels"])
+            declare(name, "summary")
+            lines.append(f"{name}_sum{labels} {timer['total_seconds']:.9f}")
+            lines.append(f"{name}_count{labels} {timer['count']}")
+        for timer in snapshot["timers"]:
+            name = f"{prefix}{timer['name']}_seconds_max"
+            declare(name, "gauge")
+            lines.append(f"{name}{_prometheus_labels(timer['labels'])} {timer['max_seconds']:.9f}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write(self, path):
+        """Зберігає метрики у файл: .prom / .txt - формат Prometheus, інакше JSON"""
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json() + "\n"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+def _prometheus_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+METRICS = Metrics()
+
+# Скорочення для глобального екземпляра
+enable = METRICS.enable
+disable = METRICS.disable
+span = METRICS.span
+increment = METRICS.increment
+write_metrics = METRICS.write
+
+
+_WHITESPACE = re.compile(r"\s+")
+# Списки плейсхолдерів різної довжини (IN (?, ?, ...)) зводяться до одного запису
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_statement_labels = {}
+
+
+def statement_label(sql):
+    """Нормалізований текст запиту для мітки: один рядок, списки плейсхолдерів згорнуто"""
+    label = _statement_labels.get(sql)
+    if label is None:
+        label = _PLACEHOLDER_LIST.sub("?, ...", _WHITESPACE.sub(" ", sql).strip())
+        if len(_statement_labels) < 10000:
+            _statement_labels[sql] = label
+    return label
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Курсор, що записує час виконання і вибірки рядків для кожного запиту в таймер sql"""
+
+    def _observe(self, start, calls):
+        METRICS._observe(self._sql_key, time.perf_counter() - start, calls)
+
+    def execute(self, sql, parameters=()):
+        self._sql_key = ("sql", (("statement", statement_label(sql)),))
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._observe(start, 1)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._sql_key = ("sql", (("statement", statement_label(sql)),))
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._observe(start, 1)
+
+    # Рядки SELECT SQLite обчислює під час вибірки, тож її час додається до того ж запиту
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            self._observe(start, 0)
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            self._observe(start, 0)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._observe(start, 0)
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return super().__next__()
+        finally:
+            self._observe(start, 0)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """З'єднання, чиї курсори (і скорочення execute/executemany) вимірюють кожен запит"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def sqlite_connect(database, **kwargs):
+    """sqlite3.connect, що при увімкнених SQL-метриках повертає InstrumentedConnection"""
+    if METRICS.sql_enabled:
+        kwargs.setdefault("factory", InstrumentedConnection)
+    return sqlite3.connect(database, **kwargs)
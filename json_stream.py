@@ -0,0 +1,306 @@
+import bz2
+import gzip
+import json
+import lzma
+import os
+
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+# Потокове стиснення зі стандартної бібліотеки: тип -> (функція відкриття, параметри)
+# gzip за замовчуванням стискає з рівнем 9; рівень 6 (як у утиліти gzip) помітно швидший
+COMPRESSORS = {
+    "gzip": (gzip.open, {"compresslevel": 6}),
+    "bz2": (bz2.open, {}),
+    "xz": (lzma.open, {}),
+}
+COMPRESSION_BY_EXTENSION = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+
+def is_ndjson(path):
+    """Чи є файл NDJSON (один JSON-запис на рядок) за розширенням, без урахування стиснення"""
+    root, extension = os.path.splitext(path)
+    if extension in COMPRESSION_BY_EXTENSION:
+        path = root
+    return path.endswith(NDJSON_EXTENSIONS)
+
+
+def open_output(path, compression=None):
+    """Відкриває текстовий файл для запису; стиснення задається явно або за розширенням (.gz, .bz2, .xz)"""
+    compression = compression or COMPRESSION_BY_EXTENSION.get(os.path.splitext(path)[1])
+    if compression is None:
+        return open(path, 'w', encoding='utf-8')
+    if compression not in COMPRESSORS:
+        raise ValueError(f"Невідомий тип стиснення: {compression}. Доступні: {', '.join(COMPRESSORS)}")
+    opener, options = COMPRESSORS[compression]
+    return opener(path, 'wt', encoding='utf-8', **options)
+
+
+def iter_ndjson(path):
+    """Читає NDJSON по одному запису, не завантажуючи весь файл"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = frozenset(" \t\n\r")
+_AFTER_NUMBER = frozenset(" \t\n\r,]")
+# Елемент, обрізаний кінцем блоку, дає помилку розбору в останніх символах буфера (частковий
+# літерал, \uXXXX чи число) або незакритий рядок; помилка раніше - некоректний JSON
+_TRUNCATION_MARGIN = 16
+
+
+def iter_json_array(path, chunk_size=1 << 20):
+    """Інкрементно читає JSON-масив верхнього рівня: пам'ять - один блок і один елемент, а не весь файл"""
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size)
+        eof = not buffer
+        pos = 0
+        # Скільки символів файлу лежало перед початком буфера - для позицій у повідомленнях
+        base = 0
+        expect = "["
+        while True:
+            # Пропускаємо пробіли і роздільники між елементами
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                if eof:
+                    raise ValueError(f"Неочікуваний кінець JSON-масиву у {path}")
+                base += len(buffer)
+                buffer = f.read(chunk_size)
+                eof = not buffer
+                pos = 0
+                continue
+            char = buffer[pos]
+            if expect == "[":
+                if char != "[":
+                    raise ValueError(f"{path}: очікувався JSON-масив")
+                pos += 1
+                expect = "first"
+                continue
+            if char == "]" and expect in ("first", ","):
+                # Після масиву можуть бути лише пробіли
+                tail, tail_start = buffer[pos + 1:], base + pos + 1
+                while tail or not eof:
+                    extra = tail.lstrip(" \t\n\r")
+                    if extra:
+                        raise ValueError(f"{path}: зайві дані після JSON-масиву на позиції "
+                                         f"{tail_start + len(tail) - len(extra)}")
+                    tail_start += len(tail)
+                    tail = f.read(chunk_size)
+                    eof = not tail
+                return
+            if expect == ",":
+                if char != ",":
+                    raise ValueError(f"{path}: очікувалася кома на позиції {base + pos}")
+                pos += 1
+                expect = "value"
+                continue
+            try:
+                value, end = _DECODER.raw_decode(buffer, pos)
+                # Число на межі блоку могло бути обрізане ("-1." з "-1.5"): після нього має йти роздільник
+                complete = end < len(buffer) and (not isinstance(value, (int, float))
+                                                  or buffer[end] in _AFTER_NUMBER)
+                error = None
+            except json.JSONDecodeError as e:
+                complete = False
+                error = e
+                if e.pos < len(buffer) - _TRUNCATION_MARGIN and not e.msg.startswith("Unterminated string"):
+                    break
+            # Елемент обрізаний кінцем блоку - дочитуємо; великий елемент - блоками зростаючого розміру,
+            # щоб не розбирати його заново після кожного блоку
+            if not complete and not eof:
+                more = f.read(max(chunk_size, len(buffer) - pos))
+                eof = not more
+                base += pos
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+            if error is not None:
+                break
+            yield value
+            pos = end
+            expect = ","
+        raise ValueError(f"{path}: некоректний JSON на позиції {base + error.pos}: {error.msg}")
+
+
+def iter_records(path):
+    """Ітерує записи з NDJSON або з JSON-масиву, читаючи файл потоком"""
+    if is_ndjson(path):
+        yield from iter_ndjson(path)
+    else:
+        yield from iter_json_array(path)
+
+
+def to_serializable(value):
+    """Параметр default для json: записи з to_dict() (Quote, Author) стають словниками в момент запису"""
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return to_dict()
+
+
+# Кодувальник створюється один раз: json.dumps з параметрами будує новий на кожен виклик
+_COMPACT_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=to_serializable)
+# Рядки кодує C-реалізація; json з indent кодує все рекурсивно на Python і повільніший
+_encode_string = json.encoder.encode_basestring
+
+
+def _indented(value, indent, level):
+    """Те саме, що JSONEncoder(ensure_ascii=False, indent=indent), зі зсувом на level рівнів"""
+    if isinstance(value, str):
+        return _encode_string(value)
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        if not all(isinstance(key, str) for key in value):
+            # Нестрокові ключі json перетворює сам
+            value = {_COMPACT_ENCODER.encode(key) if not isinstance(key, str) else key: item
+                     for key, item in value.items()}
+        inner = "\n" + " " * (indent * (level + 1))
+        return ("{" + inner + ("," + inner).join(_encode_string(key) + ": " + _indented(item, indent, level + 1)
+                                                for key, item in value.items())
+                + "\n" + " " * (indent * level) + "}")
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return "[]"
+        inner = "\n" + " " * (indent * (level + 1))
+        return ("[" + inner + ("," + inner).join(_indented(item, indent, level + 1) for item in value)
+                + "\n" + " " * (indent * level) + "]")
+    if not isinstance(value, (int, float)) and value is not None:
+        return _indented(to_serializable(value), indent, level)
+    return _COMPACT_ENCODER.encode(value)
+
+
+def dumps(value, indent=2, level=0):
+    """json.dumps для значення на глибині level; indent=None - компактний запис без пробілів"""
+    if not indent:
+        return _COMPACT_ENCODER.encode(value)
+    return _indented(value, indent, level)
+
+
+def write_json_array(f, records, indent=2, level=0):
+    """Пише масив записів поступово; результат збігається з json.dump(list, indent=indent)"""
+    count = 0
+    inner = "\n" + " " * (indent * (level + 1)) if indent else ""
+    for record in records:
+        f.write(("[" if count == 0 else ",") + inner + dumps(record, indent, level + 1))
+        count += 1
+    if count == 0:
+        f.write("[]")
+    else:
+        f.write(("\n" + " " * (indent * level) if indent else "") + "]")
+    return count
+
+
+class JsonObjectWriter:
+    """Пише JSON-об'єкт верхнього рівня поле за полем; масиви - запис за записом"""
+
+    def __init__(self, f, indent=2):
+        self.f = f
+        self.indent = indent
+        self.fields = 0
+
+    def _key(self, key):
+        separator = "{" if self.fields == 0 else ","
+        if self.indent:
+            self.f.write(f"{separator}\n{' ' * self.indent}{json.dumps(key)}: ")
+        else:
+            self.f.write(f"{separator}{json.dumps(key)}:")
+        self.fields += 1
+
+    def field(self, key, value):
+        """Пише невелике поле цілком"""
+        self._key(key)
+        self.f.write(dumps(value, self.indent, 1))
+
+    def array_field(self, key, records):
+        """Пише поле-масив з ітератора записів; повертає кількість записів"""
+        self._key(key)
+        return write_json_array(self.f, records, self.indent, 1)
+
+    def close(self):
+        """Закриває об'єкт"""
+        if self.fields == 0:
+            self.f.write("{}")
+        else:
+            self.f.write("\n}" if self.indent else "}")
+
+
+def write_records(path, records, indent=2, ndjson=None, compression=None):
+    """Пише записи у NDJSON або JSON-масив (ndjson=None - за розширенням файлу); повертає кількість.
+
+    Записи пишуться у сусідній файл .tmp, який замінює path лише після успішного запису всіх записів:
+    помилка у джерелі записів (наприклад, пошкоджений вхідний файл) лишає попередній path без змін.
+    """
+    if ndjson is None:
+        ndjson = is_ndjson(path)
+    compression = compression or COMPRESSION_BY_EXTENSION.get(os.path.splitext(path)[1])
+    tmp_path = path + ".tmp"
+    try:
+        with open_output(tmp_path, compression) as f:
+            if ndjson:
+                count = 0
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    count += 1
+            else:
+                count = write_json_array(f, records, indent)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return count
+
+
+class NdjsonWriter:
+    """Дописує записи у файл.part по одному JSON-рядку з періодичним fsync і атомарною фіналізацією"""
+
+    def __init__(self, path, fsync_every=100, resume_offset=None):
+        self.path = path
+        self.part_path = path + ".part"
+        self.fsync_every = fsync_every
+        self.pending = 0
+        self.count = 0
+
+        if resume_offset is not None and os.path.exists(self.part_path):
+            # Відкидаємо хвіст, записаний після останньої контрольної точки
+            os.truncate(self.part_path, min(resume_offset, os.path.getsize(self.part_path)))
+            self.file = open(self.part_path, 'a', encoding='utf-8')
+        else:
+            self.file = open(self.part_path, 'w', encoding='utf-8')
+
+    def write(self, record):
+        """Дописує один запис"""
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+        self.pending += 1
+        if self.pending >= self.fsync_every:
+            self.sync()
+
+    def sync(self, flush=True):
+        """Скидає буфер на диск; flush=False - лише fsync уже скинутих даних (можна з іншого потоку)"""
+        if flush:
+            self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+
+    def offset(self):
+        """Поточний розмір записаних даних (для контрольної точки)"""
+        self.file.flush()
+        return self.file.tell()
+
+    def finalize(self):
+        """Синхронізує дані і атомарно перейменовує .part у кінцевий файл"""
+        self.sync()
+        self.file.close()
+        os.replace(self.part_path, self.path)
+
+    def close(self):
+        """Закриває файл без фіналізації (.part лишається для відновлення)"""
+        if not self.file.closed:
+            self.file.flush()
+            self.file.close()
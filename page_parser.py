@@ -0,0 +1,97 @@
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from instrumentation import span
+
+# Вузли, які потрібні для вибірки: цитати, деталі автора і посилання "Next"
+TARGET_NODES = SoupStrainer(class_=["quote", "author-details", "next"])
+
+# backend -> (парсер BeautifulSoup, чи обмежувати дерево через SoupStrainer)
+PARSER_BACKENDS = {
+    "lxml": ("lxml", False),
+    "html.parser": ("html.parser", False),
+    "lxml-strained": ("lxml", True),
+    "html.parser-strained": ("html.parser", True),
+}
+
+DEFAULT_BACKEND = "lxml"
+
+
+class PageParser:
+    """Один раз будує дерево сторінки обраним backend-ом"""
+
+    def __init__(self, backend=DEFAULT_BACKEND):
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(f"Невідомий backend парсера: {backend}. Доступні: {', '.join(PARSER_BACKENDS)}")
+        self.backend = backend
+        self.features, strained = PARSER_BACKENDS[backend]
+        self.parse_only = TARGET_NODES if strained else None
+
+    def parse(self, html_content):
+        """Парсить HTML у дерево BeautifulSoup"""
+        with span("html_parse", backend=self.backend):
+            return BeautifulSoup(html_content, self.features, parse_only=self.parse_only)
+
+
+def extract_quotes(soup):
+    """Витягує цитати з дерева сторінки"""
+    quotes = []
+    for quote_element in soup.find_all('div', class_='quote'):
+        # Отримуємо текст цитати
+        text_element = quote_element.find('span', class_='text')
+        text = text_element.get_text(strip=True) if text_element else ""
+
+        # Отримуємо автора
+        author_element = quote_element.find('small', class_='author')
+        author_name = author_element.get_text(strip=True) if author_element else ""
+
+        # Отримуємо теги
+        tags_elements = quote_element.find_all('a', class_='tag')
+        tags = [tag.get_text(strip=True) for tag in tags_elements]
+
+        quotes.append({
+            "text": text,
+            "author": author_name,
+            "tags": tags
+        })
+    return quotes
+
+
+def extract_next_url(soup, page_url):
+    """Повертає абсолютне посилання "Next" або None"""
+    next_item = soup.find('li', class_='next')
+    next_link = next_item.find('a') if next_item else None
+    if next_link and next_link.get('href'):
+        return urljoin(page_url, next_link['href'])
+    return None
+
+
+def extract_author(soup, author_name):
+    """Витягує інформацію про автора з дерева його сторінки"""
+    author_info = {
+        "name": author_name,
+        "born_date": "",
+        "born_location": "",
+        "description": ""
+    }
+
+    # Знаходимо блок з інформацією про автора
+    author_details = soup.find('div', class_='author-details')
+    if author_details:
+        # Дата народження
+        born_element = author_details.find('span', class_='author-born-date')
+        if born_element:
+            author_info["born_date"] = born_element.get_text(strip=True)
+
+        # Місце народження
+        location_element = author_details.find('span', class_='author-born-location')
+        if location_element:
+            author_info["born_location"] = location_element.get_text(strip=True)
+
+        # Опис
+        description_element = author_details.find('div', class_='author-description')
+        if description_element:
+            author_info["description"] = description_element.get_text(strip=True)
+
+    return author_info
@@ -0,0 +1,233 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from json_stream import NdjsonWriter, is_ndjson, iter_ndjson, write_records
+from page_parser import PageParser, extract_author, extract_quotes
+
+
+class ThreadTokenBucket:
+    """Потокобезпечний токен-бакет: не більше rate запитів за секунду з піками до capacity"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Чекає, поки з'явиться вільний токен, і забирає його"""
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                time.sleep((1 - self.tokens) / self.rate)
+
+
+def parser_process(backend, html_queue, record_queue, control_queue):
+    """Процес-парсер: HTML з черги -> записи для записувача і звіт координатору"""
+    parser = PageParser(backend)
+    while True:
+        task = html_queue.get()
+        if task is None:
+            record_queue.put(None)
+            return
+        kind, key, html_content = task
+        try:
+            soup = parser.parse(html_content)
+            if kind == "page":
+                quotes = extract_quotes(soup)
+                record_queue.put(("page", key, quotes or None))
+                authors = list(dict.fromkeys(quote["author"] for quote in quotes if quote["author"]))
+                control_queue.put(("page", key, bool(quotes), authors))
+            else:
+                record_queue.put(("author", key, extract_author(soup, key)))
+                control_queue.put(("author", key, True, []))
+        except Exception as e:
+            print(f"Помилка парсингу {kind} {key}: {e}")
+            control_queue.put((kind, key, False, []))
+
+
+def writer_process(record_queue, parsers, quotes_path, authors_path, fsync_every, result_queue):
+    """Єдиний процес-записувач: зводить записи парсерів, прибирає дублікати і пише у файли.
+    
+    Цитати пишуться в порядку сторінок до першої порожньої або відсутньої сторінки, як у послідовному
+    режимі; автори - лише ті, чиї цитати записано, у порядку їх першої появи.
+    """
+    quotes_sink = NdjsonSink(quotes_path, fsync_every)
+    authors_sink = NdjsonSink(authors_path, fsync_every)
+    pending_pages = {}
+    next_page = 1
+    finished = False
+    seen_quotes = set()
+    author_order = {}
+    authors = {}
+    duplicates = 0
+
+    def write_page(quotes):
+        nonlocal duplicates
+        for quote in quotes:
+            key = (quote["author"], quote["text"])
+            if key in seen_quotes:
+                duplicates += 1
+                continue
+            seen_quotes.add(key)
+            author_order.setdefault(quote["author"], len(author_order))
+            quotes_sink.write(quote)
+
+    done = 0
+    while done < parsers:
+        record = record_queue.get()
+        if record is None:
+            done += 1
+            continue
+        kind, key, value = record
+        if kind == "author":
+            authors.setdefault(key, value)
+            continue
+        pending_pages[key] = value
+        while not finished and next_page in pending_pages:
+            quotes = pending_pages.pop(next_page)
+            if quotes is None:
+                finished = True
+            else:
+                write_page(quotes)
+                next_page += 1
+
+    for name in sorted((name for name in authors if name in author_order), key=author_order.get):
+        authors_sink.write(authors[name])
+    quotes_sink.finalize()
+    authors_sink.finalize()
+    result_queue.put({"quotes": quotes_sink.count, "authors": authors_sink.count, "duplicates": duplicates})
+
+
+class NdjsonSink:
+    """Вихідний файл записувача: NDJSON пишеться напряму, JSON-масив - через проміжний NDJSON"""
+
+    def __init__(self, path, fsync_every):
+        self.path = path
+        self.ndjson = is_ndjson(path)
+        self.writer = NdjsonWriter(path if self.ndjson else path + ".ndjson", fsync_every)
+
+    @property
+    def count(self):
+        return self.writer.count
+
+    def write(self, record):
+        self.writer.write(record)
+
+    def finalize(self):
+        self.writer.finalize()
+        if not self.ndjson:
+            write_records(self.path, iter_ndjson(self.writer.path))
+            os.remove(self.writer.path)
+
+
+class ParallelCrawler:
+    """Багатопроцесний обхід: потоки завантажують HTML, процеси парсять, окремий процес пише результат.
+    
+    Сторінки /page/N/ завантажуються наперед у вікні розміром з кількість завантажувачів,
+    доки не трапиться сторінка без цитат.
+    """
+
+    def __init__(self, scraper, processes=None, fetchers=8, rate=5.0, burst=None):
+        self.scraper = scraper
+        self.processes = processes or os.cpu_count() or 1
+        self.fetchers = fetchers
+        self.bucket = ThreadTokenBucket(rate, burst)
+        self.fetch_queue = queue.Queue()
+
+    def fetch_worker(self, html_queue, control_queue):
+        """Потік-завантажувач: URL з черги -> HTML у чергу парсерів"""
+        while True:
+            task = self.fetch_queue.get()
+            if task is None:
+                return
+            kind, key, url = task
+            self.bucket.acquire()
+            try:
+                html_content = self.scraper.get_page_content(url)
+            except Exception as e:
+                print(f"Помилка завантаження {url}: {e}")
+                html_content = None
+            if html_content:
+                html_queue.put((kind, key, html_content))
+            else:
+                control_queue.put((kind, key, False, []))
+
+    def crawl(self, quotes_path, authors_path):
+        """Обходить сайт і повертає підсумок записувача (кількість цитат, авторів, дублікатів)"""
+        context = multiprocessing.get_context("spawn")
+        html_queue = context.Queue(maxsize=self.processes * 4)
+        record_queue = context.Queue()
+        control_queue = context.Queue()
+        result_queue = context.Queue()
+
+        writer = context.Process(target=writer_process, args=(
+            record_queue, self.processes, quotes_path, authors_path, self.scraper.fsync_every, result_queue))
+        parsers = [context.Process(target=parser_process, args=(
+            self.scraper.parser.backend, html_queue, record_queue, control_queue))
+            for _ in range(self.processes)]
+        threads = [threading.Thread(target=self.fetch_worker, args=(html_queue, control_queue), daemon=True)
+                   for _ in range(self.fetchers)]
+        for process in [writer] + parsers:
+            process.start()
+        for thread in threads:
+            thread.start()
+
+        outstanding = 0
+        last_scheduled = 0
+        pages_done = False
+        seen_authors = set()
+        # Автори сторінки ставляться в чергу, лише коли оброблено всі попередні сторінки:
+        # після відсутньої сторінки записувач цитат не пише, тож і їх авторів завантажувати не треба
+        page_authors = {}
+        contiguous_pages = 0
+
+        def schedule(kind, key, url):
+            nonlocal outstanding
+            outstanding += 1
+            self.fetch_queue.put((kind, key, url))
+
+        def schedule_page():
+            nonlocal last_scheduled
+            last_scheduled += 1
+            schedule("page", last_scheduled, f"{self.scraper.base_url}/page/{last_scheduled}/")
+
+        try:
+            for _ in range(self.fetchers):
+                schedule_page()
+            while outstanding:
+                kind, key, ok, authors = control_queue.get()
+                outstanding -= 1
+                if kind == "page":
+                    print(f"Сторінку {key} оброблено")
+                    if not ok:
+                        pages_done = True
+                        continue
+                    if not pages_done:
+                        schedule_page()
+                    page_authors[key] = authors
+                    while contiguous_pages + 1 in page_authors:
+                        contiguous_pages += 1
+                        for author_name in page_authors.pop(contiguous_pages):
+                            if author_name not in seen_authors:
+                                seen_authors.add(author_name)
+                                schedule("author", author_name, self.scraper.get_author_url(author_name))
+        finally:
+            for _ in threads:
+                self.fetch_queue.put(None)
+            for _ in parsers:
+                html_queue.put(None)
+            for process in parsers:
+                process.join()
+            summary = result_queue.get()
+            writer.join()
+        return summary
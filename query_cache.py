@@ -0,0 +1,64 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class QueryCache:
+    """LRU-кеш результатів запитів з TTL, обмеженням кількості записів і скиданням за поколінням даних"""
+
+    def __init__(self, max_entries=256, ttl=300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        # Покоління даних, для якого зібрано записи (див. db_tuning.get_data_generation)
+        self.generation = None
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidations": 0}
+
+    def check_generation(self, generation):
+        """Скидає кеш, якщо дані в базі змінилися з моменту заповнення"""
+        with self.lock:
+            if generation == self.generation:
+                return
+            if self.entries:
+                self.entries.clear()
+                self.stats["invalidations"] += 1
+            self.generation = generation
+
+    def get(self, key):
+        """Повертає (знайдено, значення); прострочені записи видаляє"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return False, None
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at >= self.ttl:
+                del self.entries[key]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return False, None
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return True, value
+
+    def put(self, key, value):
+        """Зберігає значення, витісняючи найдавніше використані записи понад max_entries"""
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        """Очищує кеш"""
+        with self.lock:
+            self.entries.clear()
+
+    def info(self):
+        """Статистика кешу разом з поточним розміром і часткою влучань"""
+        with self.lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return dict(self.stats, size=len(self.entries), max_entries=self.max_entries,
+                        hit_rate=self.stats["hits"] / lookups if lookups else 0.0)
@@ -0,0 +1,234 @@
+import array
+import string
+import sys
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from itertools import groupby, islice
+
+from db_tuning import get_data_generation
+from json_stream import iter_records
+from records import NO_AUTHOR, Author, Quote
+
+# LIKE у SQLite не враховує регістр лише для ASCII - так само порівнює і знімок
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Скільки шаблонів пошуку за підрядком пам'ятає знімок
+MATCH_CACHE_SIZE = 1024
+
+
+def _contains(positions, position):
+    """Чи є позиція у відсортованому масиві"""
+    i = bisect_left(positions, position)
+    return i < len(positions) and positions[i] == position
+
+
+class QuoteIndex:
+    """Незмінний знімок цитат у пам'яті для швидких запитів без SQLite.
+
+    Цитати лежать колонками у порядку id: масиви id і позицій авторів, тексти і теги у форматі
+    CSR (tag_offsets / tag_values). Назви авторів і тегів інтерновані й зберігаються один раз,
+    а інвертовані списки (автор / тег -> відсортовані позиції цитат) дають вибірку та AND/OR
+    перетин тегів без сканування. Знімок не змінюється: після завантаження будується новий.
+    """
+
+    def __init__(self, generation=None):
+        # Покоління даних (data_generation), з якого побудовано знімок
+        self.generation = generation
+        self.quote_ids = array.array('q')
+        self.texts = []
+        # Позиція автора цитати; -1 - автора немає в таблиці authors
+        self.quote_authors = array.array('l')
+        # Теги цитати i: tag_values[tag_offsets[i]:tag_offsets[i + 1]]
+        self.tag_offsets = array.array('L', [0])
+        self.tag_values = array.array('L')
+
+        self.author_ids = array.array('q')
+        self.author_names = []
+        self.author_details = []
+        # Спільні записи Author для результатів у вигляді записів (records=True)
+        self.authors = []
+        self.author_positions = {}
+        self.author_keys = []
+        self.author_postings = []
+
+        self.tag_names = []
+        self.tag_positions = {}
+        self.tag_keys = []
+        self.tag_postings = []
+        # (тип, шаблон) -> інвертовані списки назв, що його містять
+        self.match_cache = {}
+
+    @classmethod
+    def from_database(cls, conn):
+        """Будує знімок з бази в одній транзакції читання, разом з поколінням даних"""
+        conn.execute('BEGIN')
+        try:
+            index = cls(get_data_generation(conn))
+            author_positions = {}
+            for author_id, name, born_date, born_location, description in conn.execute(
+                    'SELECT id, name, born_date, born_location, description FROM authors ORDER BY id'):
+                author_positions[author_id] = index._add_author(author_id, name, born_date, born_location,
+                                                                description)
+            # Теги в порядку id: тоді теги цитати впорядковані так само, як у QuotesManager
+            tag_positions = {tag_id: index._add_tag(name)
+                             for tag_id, name in conn.execute('SELECT id, name FROM tags ORDER BY id')}
+
+            # Цитати і їх теги читаються двома курсорами в порядку quote_id і зливаються
+            quote_tags = conn.execute('SELECT quote_id, tag_id FROM quote_tags ORDER BY quote_id, tag_id')
+            pending = next(quote_tags, None)
+            for quote_id, text, author_id in conn.execute('SELECT id, text, author_id FROM quotes ORDER BY id'):
+                while pending is not None and pending[0] < quote_id:
+                    pending = next(quote_tags, None)
+                tags = []
+                while pending is not None and pending[0] == quote_id:
+                    tags.append(tag_positions[pending[1]])
+                    pending = next(quote_tags, None)
+                index._add_quote(quote_id, text, author_positions.get(author_id, -1), tags)
+        finally:
+            conn.execute('ROLLBACK')
+        return index
+
+    @classmethod
+    def from_json(cls, quotes_file, authors_file):
+        """Будує знімок з JSON або NDJSON файлів; id цитат і авторів - їх порядкові номери у файлах"""
+        index = cls()
+        for author_id, author in enumerate(iter_records(authors_file), 1):
+            if author.get('name', '') not in index.author_positions:
+                index._add_author(author_id, author.get('name', ''), author.get('born_date', ''),
+                                  author.get('born_location', ''), author.get('description', ''))
+        tag_positions = index.tag_positions
+        for quote_id, quote in enumerate(iter_records(quotes_file), 1):
+            # Як і в quote_tags, тег у цитаті враховується один раз; нові теги отримують id за появою
+            tags = sorted({tag_positions[tag] if tag in tag_positions else index._add_tag(tag)
+                           for tag in quote.get('tags', [])})
+            index._add_quote(quote_id, quote.get('text', ''),
+                             index.author_positions.get(quote.get('author', ''), -1), tags)
+        return index
+
+    def _add_author(self, author_id, name, born_date, born_location, description):
+        position = len(self.author_names)
+        name = sys.intern(name)
+        self.author_ids.append(author_id)
+        self.author_names.append(name)
+        self.author_details.append((born_date, born_location, description))
+        self.authors.append(Author(author_id, name, born_date, born_location, description))
+        self.author_positions[name] = position
+        self.author_keys.append(name.translate(ASCII_LOWER))
+        self.author_postings.append(array.array('L'))
+        return position
+
+    def _add_tag(self, name):
+        position = len(self.tag_names)
+        name = sys.intern(name)
+        self.tag_names.append(name)
+        self.tag_positions[name] = position
+        self.tag_keys.append(name.translate(ASCII_LOWER))
+        self.tag_postings.append(array.array('L'))
+        return position
+
+    def _add_quote(self, quote_id, text, author_position, tags):
+        """Дописує цитату; id мають зростати, тоді інвертовані списки відсортовані без сортування"""
+        position = len(self.texts)
+        self.quote_ids.append(quote_id)
+        self.texts.append(text)
+        self.quote_authors.append(author_position)
+        if author_position >= 0:
+            self.author_postings[author_position].append(position)
+        for tag in tags:
+            self.tag_values.append(tag)
+            self.tag_postings[tag].append(position)
+        self.tag_offsets.append(len(self.tag_values))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def _quote(self, position):
+        """Цитата у форматі QuotesManager"""
+        author_position = self.quote_authors[position]
+        if author_position >= 0:
+            born_date, born_location, description = self.author_details[author_position]
+            author = {"name": self.author_names[author_position], "born_date": born_date,
+                      "born_location": born_location, "description": description}
+        else:
+            author = {"name": None, "born_date": None, "born_location": None, "description": None}
+        tag_names = self.tag_names
+        return {
+            "id": self.quote_ids[position],
+            "text": self.texts[position],
+            "author": author,
+            "tags": [tag_names[tag] for tag in
+                     self.tag_values[self.tag_offsets[position]:self.tag_offsets[position + 1]]]
+        }
+
+    def _start(self, after_id):
+        """Позиція першої цитати з id > after_id"""
+        return 0 if after_id is None else bisect_right(self.quote_ids, after_id)
+
+    def _record(self, position):
+        """Цитата як запис Quote зі спільним Author"""
+        author_position = self.quote_authors[position]
+        tag_names = self.tag_names
+        return Quote(self.quote_ids[position], self.texts[position],
+                     self.authors[author_position] if author_position >= 0 else NO_AUTHOR,
+                     tuple(tag_names[tag] for tag in
+                           self.tag_values[self.tag_offsets[position]:self.tag_offsets[position + 1]]))
+
+    def _page(self, positions, limit, records=False):
+        """Цитати для перших limit позицій з ітератора (усіх, якщо limit - None)"""
+        build = self._record if records else self._quote
+        return [build(position) for position in islice(positions, limit)]
+
+    @staticmethod
+    def _from(positions, start):
+        """Ітератор відсортованого списку позицій, починаючи з start"""
+        return (positions[i] for i in range(bisect_left(positions, start), len(positions)))
+
+    def _union(self, postings, start):
+        """Позиції з будь-якого зі списків; злиття ліниве, тож сторінка з limit не читає решту"""
+        if len(postings) == 1:
+            return self._from(postings[0], start)
+        return (position for position, _ in groupby(merge(*(self._from(p, start) for p in postings))))
+
+    def _intersection(self, postings, start):
+        """Позиції, що є в усіх списках: найкоротший перевіряється бінарним пошуком в інших"""
+        postings = sorted(postings, key=len)
+        shortest, others = postings[0], postings[1:]
+        return (position for position in self._from(shortest, start)
+                if all(_contains(other, position) for other in others))
+
+    def _matching(self, kind, keys, postings, pattern):
+        """Інвертовані списки всіх назв, що містять pattern (як LIKE '%pattern%')"""
+        key = (kind, pattern)
+        matched = self.match_cache.get(key)
+        if matched is None:
+            pattern = pattern.translate(ASCII_LOWER)
+            matched = [postings[i] for i, name in enumerate(keys) if pattern in name]
+            # Знімок незмінний, тож збіги можна пам'ятати до його заміни; розмір обмежено
+            if len(self.match_cache) >= MATCH_CACHE_SIZE:
+                self.match_cache.clear()
+            self.match_cache[key] = matched
+        return matched
+
+    def get_all_quotes(self, after_id=None, limit=None, records=False):
+        """Усі цитати (сторінка після after_id, якщо задано limit); records=True - записи Quote"""
+        return self._page(range(self._start(after_id), len(self.texts)), limit, records)
+
+    def search_quotes_by_author(self, author_name, after_id=None, limit=None, records=False):
+        """Цитати авторів, чиє ім'я містить author_name"""
+        postings = self._matching("author", self.author_keys, self.author_postings, author_name)
+        return self._page(self._union(postings, self._start(after_id)), limit, records)
+
+    def search_quotes_by_tag(self, tag_name, after_id=None, limit=None, records=False):
+        """Цитати з тегом, назва якого містить tag_name"""
+        postings = self._matching("tag", self.tag_keys, self.tag_postings, tag_name)
+        return self._page(self._union(postings, self._start(after_id)), limit, records)
+
+    def search_quotes_by_tags(self, tags, match_all=True, after_id=None, limit=None, records=False):
+        """Цитати з усіма (match_all=True) або хоча б одним із тегів; назви тегів точні"""
+        tags = set(tags)
+        postings = [self.tag_postings[self.tag_positions[tag]] for tag in tags if tag in self.tag_positions]
+        if not postings or (match_all and len(postings) < len(tags)):
+            return []
+        start = self._start(after_id)
+        positions = self._intersection(postings, start) if match_all else self._union(postings, start)
+        return self._page(positions, limit, records)
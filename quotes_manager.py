@@ -1,18 +1,160 @@
-import sqlite3
+import contextlib
 import json
+import re
+import threading
 from datetime import datetime
 
+from connection_pool import ConnectionPool
+from convert_structure import AUTHOR_FIELDS, QUOTE_FIELDS, map_records
+from db_tuning import PERFORMANCE_PROFILE, apply_performance_profile, get_data_generation, migrate_schema
+from instrumentation import increment, span, sqlite_connect
+from json_stream import JsonObjectWriter, open_output, write_records
+from quote_index import QuoteIndex
+from records import NO_AUTHOR, Author, Quote
+from snapshot import write_snapshot
+
+# Цитати з автором; {where} і {limit} підставляє _quotes_query.
+# Теги довантажуються окремим запитом (TAGS_QUERY) замість GROUP_CONCAT по всьому з'єднанню
+QUOTES_QUERY = '''
+    SELECT 
+        q.id,
+        q.text,
+        a.name as author_name,
+        a.born_date,
+        a.born_location,
+        a.description,
+        a.id as author_id
+    FROM quotes q
+    LEFT JOIN authors a ON q.author_id = a.id
+    {where}
+    ORDER BY q.id
+    {limit}
+'''
+
+# Теги порції цитат; порядок (quote_id, tag_id) дає первинний ключ quote_tags без сортування.
+# Назви тегів беруться зі словника в пам'яті, тож з'єднання з tags не потрібне
+TAGS_QUERY = '''
+    SELECT quote_id, tag_id
+    FROM quote_tags
+    WHERE quote_id IN ({placeholders})
+    ORDER BY quote_id, tag_id
+'''
+
+# Скільки id цитат передається в одному запиті тегів
+TAG_BATCH_SIZE = 500
+
+# Фільтр цитат за назвою тегу: тег перевіряється підзапитом, тож у результаті лишаються всі теги цитати
+TAG_FILTER = '''WHERE q.id IN (
+        SELECT qt.quote_id
+        FROM quote_tags qt
+        JOIN tags t ON qt.tag_id = t.id
+        WHERE t.name LIKE ? ESCAPE '\\'
+    )'''
+
+# Фільтр цитат за точними назвами тегів; {having} - умова "усі теги" (HAVING COUNT(*) = ?) або порожньо
+TAGS_FILTER = '''WHERE q.id IN (
+        SELECT qt.quote_id
+        FROM quote_tags qt
+        JOIN tags t ON qt.tag_id = t.id
+        WHERE t.name IN ({placeholders})
+        GROUP BY qt.quote_id
+        {having}
+    )'''
+
+AUTHORS_QUERY = '''
+    SELECT 
+        id,
+        name,
+        born_date,
+        born_location,
+        description
+    FROM authors
+    ORDER BY name
+'''
+
+# Цитати і автори для файлів старого формату (quotes_converted.json / authors_converted.json):
+# лише потрібні колонки, порядок - як у файлах скрапера, з яких їх раніше конвертували
+LEGACY_QUOTES_QUERY = '''
+    SELECT q.id, q.text, a.name
+    FROM quotes q
+    LEFT JOIN authors a ON q.author_id = a.id
+    ORDER BY q.id
+'''
+
+# Теги цитат для файлів старого формату. quote_tags не зберігає позицію тегу, а у файлах скрапера
+# теги йдуть за абеткою (як на сторінках сайту), тож ORDER BY t.name відтворює їх порядок
+LEGACY_TAGS_QUERY = '''
+    SELECT qt.quote_id, t.name
+    FROM quote_tags qt
+    JOIN tags t ON qt.tag_id = t.id
+    WHERE qt.quote_id IN ({placeholders})
+    ORDER BY qt.quote_id, t.name
+'''
+
+LEGACY_AUTHORS_QUERY = '''
+    SELECT name, born_date, born_location, description
+    FROM authors
+    ORDER BY id
+'''
+
+# Формати файлів старого формату: json - з відступами, як convert_structure.py
+LEGACY_FORMATS = ("json", "compact", "ndjson")
+
+def like_contains(text):
+    """Шаблон LIKE ... ESCAPE '\\' для пошуку підрядка: \\, % і _ у тексті - звичайні символи"""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+def build_match_query(query, phrase=False, prefix=False):
+    """Будує вираз FTS5 MATCH зі слів запиту, екрануючи їх у лапки"""
+    words = re.findall(r"\w+", query)
+    if not words:
+        return ""
+    if phrase:
+        return '"' + " ".join(words) + '"' + (" *" if prefix else "")
+    terms = [f'"{word}"' for word in words]
+    if prefix:
+        terms[-1] += " *"
+    return " ".join(terms)
+
 class QuotesManager:
-    def __init__(self, db_name="quotes.db"):
+    def __init__(self, db_name="quotes.db", profile=PERFORMANCE_PROFILE, cache=None, pool_size=None,
+                 use_index=False, records=False):
         self.db_name = db_name
+        self.profile = profile
         self.conn = None
         self.cursor = None
+        # pool_size - запити йдуть через пул з'єднань лише на читання, і менеджер можна
+        # використовувати з кількох потоків; None - одне з'єднання, як раніше
+        self.pool_size = pool_size
+        self.pool = None
+        # Кеш результатів (наприклад, QueryCache); None - кожен виклик виконує запит
+        self.cache = cache
+        # id тегу -> назва; теги не перейменовуються, а id не використовуються повторно,
+        # тож словник лише довантажується, коли трапляється невідомий id
+        self.tag_names = {}
+        # use_index=True - вибірки цитат обслуговує знімок QuoteIndex у пам'яті замість SQL;
+        # знімок перебудовується, коли змінюється покоління даних, і підміняється одним присвоєнням
+        self.use_index = use_index
+        self.index = None
+        self.index_lock = threading.Lock()
+        # records=True - результати як записи Quote / Author зі __slots__ і спільним автором
+        # для всіх його цитат замість вкладених словників; словник - лише при серіалізації (to_dict)
+        self.records = records
     
     def connect(self):
         """Підключається до бази даних"""
         try:
-            self.conn = sqlite3.connect(self.db_name)
-            self.cursor = self.conn.cursor()
+            self.conn = sqlite_connect(self.db_name)
+            apply_performance_profile(self.conn, self.profile)
+            migrate_schema(self.conn)
+            if self.pool_size:
+                # Основне з'єднання потрібне лише для міграції: усі запити йдуть через пул
+                self.conn.close()
+                self.conn = None
+                self.pool = ConnectionPool(self.db_name, self.pool_size)
+            else:
+                self.cursor = self.conn.cursor()
             return True
         except Exception as e:
             print(f"Помилка підключення до бази даних: {e}")
@@ -20,136 +162,280 @@ class QuotesManager:
     
     def close(self):
         """Закриває з'єднання з базою даних"""
+        if self.pool:
+            self.pool.close()
         if self.conn:
             self.conn.close()
     
-    def get_all_quotes(self):
-        """Отримує всі цитати з авторами та тегами"""
+    @contextlib.contextmanager
+    def _connection(self):
+        """З'єднання для одного запиту: з пулу або єдине з'єднання менеджера.
+        
+        Усередині не можна брати ще одне з'єднання - при вичерпаному пулі це взаємне блокування.
+        """
+        if self.pool is None:
+            yield self.conn
+        else:
+            with self.pool.connection() as conn:
+                yield conn
+    
+    def get_all_quotes(self, after_id=None, limit=None):
+        """Отримує всі цитати з авторами та тегами (сторінку після after_id, якщо задано limit)"""
         try:
-            query = '''
-                SELECT 
-                    q.id,
-                    q.text,
-                    a.name as author_name,
-                    a.born_date,
-                    a.born_location,
-                    a.description,
-                    GROUP_CONCAT(t.name) as tags
-                FROM quotes q
-                LEFT JOIN authors a ON q.author_id = a.id
-                LEFT JOIN quote_tags qt ON q.id = qt.quote_id
-                LEFT JOIN tags t ON qt.tag_id = t.id
-                GROUP BY q.id
-                ORDER BY q.id
-            '''
-            
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
-            
-            quotes = []
-            for row in results:
-                quote = {
-                    "id": row[0],
-                    "text": row[1],
-                    "author": {
-                        "name": row[2],
-                        "born_date": row[3],
-                        "born_location": row[4],
-                        "description": row[5]
-                    },
-                    "tags": row[6].split(',') if row[6] else []
-                }
-                quotes.append(quote)
-            
-            return quotes
-            
+            return self.get_quotes_page(after_id, limit)
         except Exception as e:
             print(f"Помилка отримання цитат: {e}")
             return []
     
+    def get_quotes_page(self, after_id=None, limit=None):
+        """Те саме, що get_all_quotes, але помилка бази передається викликачу, а не ховається за [].
+        
+        Для посторінкового обходу, де порожній результат означав би кінець даних.
+        """
+        if self.use_index:
+            return self._index().get_all_quotes(after_id, limit, self.records)
+        return self._fetch_quotes('', (), after_id, limit)
+    
+    def iter_quotes(self, chunk_size=500, after_id=None):
+        """Генератор цитат: читає курсор порціями fetchmany, пам'ять не залежить від розміру бази.
+        
+        З пулом генератор утримує одне з'єднання, поки його не вичерпано або не закрито (close()):
+        інші виклики менеджера під час обходу займають решту пулу, а при пулі з одного з'єднання
+        чекають до таймауту пулу.
+        """
+        query, params = self._quotes_query('', (), after_id, None)
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query, params)
+                authors = {}
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield from self._rows_to_quotes(conn, rows, authors)
+            finally:
+                cursor.close()
+    
     def get_all_authors(self):
         """Отримує всіх авторів"""
         try:
-            query = '''
-                SELECT 
-                    id,
-                    name,
-                    born_date,
-                    born_location,
-                    description
-                FROM authors
-                ORDER BY name
-            '''
-            
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
-            
-            authors = []
-            for row in results:
-                author = {
-                    "id": row[0],
-                    "name": row[1],
-                    "born_date": row[2],
-                    "born_location": row[3],
-                    "description": row[4]
-                }
-                authors.append(author)
-            
-            return authors
+            with self._connection() as conn:
+                rows = conn.execute(AUTHORS_QUERY).fetchall()
+            return [self._author(row) for row in rows]
             
         except Exception as e:
             print(f"Помилка отримання авторів: {e}")
             return []
     
-    def search_quotes_by_author(self, author_name):
-        """Пошук цитат за автором"""
+    def iter_authors(self, chunk_size=500):
+        """Генератор авторів, що читає курсор порціями fetchmany.
+        
+        Як і iter_quotes, утримує з'єднання пулу, поки його не вичерпано або не закрито.
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(AUTHORS_QUERY)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield self._author(row)
+            finally:
+                cursor.close()
+    
+    def search_quotes_by_author(self, author_name, after_id=None, limit=None):
+        """Пошук цитат за автором; after_id і limit - посторінковий перегляд за ключем"""
         try:
-            query = '''
-                SELECT 
-                    q.id,
-                    q.text,
-                    a.name as author_name,
-                    a.born_date,
-                    a.born_location,
-                    a.description,
-                    GROUP_CONCAT(t.name) as tags
-                FROM quotes q
-                LEFT JOIN authors a ON q.author_id = a.id
-                LEFT JOIN quote_tags qt ON q.id = qt.quote_id
-                LEFT JOIN tags t ON qt.tag_id = t.id
-                WHERE a.name LIKE ?
-                GROUP BY q.id
-                ORDER BY q.id
-            '''
-            
-            self.cursor.execute(query, (f'%{author_name}%',))
-            results = self.cursor.fetchall()
-            
-            quotes = []
-            for row in results:
-                quote = {
-                    "id": row[0],
-                    "text": row[1],
-                    "author": {
-                        "name": row[2],
-                        "born_date": row[3],
-                        "born_location": row[4],
-                        "description": row[5]
-                    },
-                    "tags": row[6].split(',') if row[6] else []
-                }
-                quotes.append(quote)
-            
-            return quotes
-            
+            if self.use_index:
+                return self._index().search_quotes_by_author(author_name, after_id, limit, self.records)
+            return self._cached(("quotes_by_author", author_name, after_id, limit), lambda: self._fetch_quotes(
+                "WHERE a.name LIKE ? ESCAPE '\\'", (like_contains(author_name),), after_id, limit))
         except Exception as e:
             print(f"Помилка пошуку цитат за автором: {e}")
             return []
     
-    def search_quotes_by_tag(self, tag_name):
-        """Пошук цитат за тегом"""
+    def search_quotes_by_tag(self, tag_name, after_id=None, limit=None):
+        """Пошук цитат за тегом; after_id і limit - посторінковий перегляд за ключем"""
+        try:
+            if self.use_index:
+                return self._index().search_quotes_by_tag(tag_name, after_id, limit, self.records)
+            return self._cached(("quotes_by_tag", tag_name, after_id, limit), lambda: self._fetch_quotes(
+                TAG_FILTER, (like_contains(tag_name),), after_id, limit))
+        except Exception as e:
+            print(f"Помилка пошуку цитат за тегом: {e}")
+            return []
+    
+    def search_quotes_by_tags(self, tags, match_all=True, after_id=None, limit=None):
+        """Цитати з усіма (match_all=True) або хоча б одним із тегів; назви тегів точні"""
+        try:
+            tags = sorted(set(tags))
+            if not tags:
+                return []
+            if self.use_index:
+                return self._index().search_quotes_by_tags(tags, match_all, after_id, limit,
+                                                           self.records)
+            where = TAGS_FILTER.format(placeholders=','.join('?' * len(tags)),
+                                       having='HAVING COUNT(*) = ?' if match_all else '')
+            params = tags + [len(tags)] if match_all else tags
+            return self._cached(("quotes_by_tags", tuple(tags), match_all, after_id, limit),
+                                lambda: self._fetch_quotes(where, params, after_id, limit))
+        except Exception as e:
+            print(f"Помилка пошуку цитат за тегами: {e}")
+            return []
+    
+    def _index(self):
+        """Знімок QuoteIndex поточного покоління даних.
+        
+        Після завантаження (нове покоління) знімок будується заново одним потоком, а потім
+        атомарно підміняється; запити, що вже отримали старий знімок, дочитують його.
+        """
+        with self._connection() as conn:
+            generation = get_data_generation(conn)
+            index = self.index
+            if index is not None and index.generation == generation:
+                return index
+            with self.index_lock:
+                if self.index is None or self.index.generation != generation:
+                    with span("index_build"):
+                        self.index = QuoteIndex.from_database(conn)
+                return self.index
+    
+    def refresh_index(self):
+        """Примусово перебудовує знімок (наприклад, одразу після завантаження, а не на першому запиті)"""
+        with self._connection() as conn:
+            index = QuoteIndex.from_database(conn)
+        with self.index_lock:
+            self.index = index
+        return index
+    
+    def _cached(self, key, compute):
+        """Читання через кеш: результат береться з кешу, доки не змінилося покоління даних і не минув TTL.
+        
+        Закешовані списки спільні для всіх викликів, змінювати їх не можна.
+        """
+        if self.cache is None:
+            return compute()
+        with self._connection() as conn:
+            generation = get_data_generation(conn)
+        self.cache.check_generation(generation)
+        found, value = self.cache.get(key)
+        increment("query_cache", result="hit" if found else "miss", query=key[0])
+        if not found:
+            value = compute()
+            self.cache.put(key, value)
+        return value
+    
+    def cache_stats(self):
+        """Статистика кешу запитів (влучання, промахи, витіснення) або None, якщо кеш вимкнено"""
+        return self.cache.info() if self.cache is not None else None
+    
+    def _quotes_query(self, where, params, after_id, limit):
+        """Будує запит цитат з keyset-пагінацією: id > after_id замість OFFSET"""
+        conditions = [where[len('WHERE '):]] if where else []
+        params = list(params)
+        if after_id is not None:
+            conditions.append('q.id > ?')
+            params.append(after_id)
+        where_sql = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+        limit_sql = ''
+        if limit is not None:
+            limit_sql = 'LIMIT ?'
+            params.append(limit)
+        return QUOTES_QUERY.format(where=where_sql, limit=limit_sql), params
+    
+    def _fetch_quotes(self, where, params, after_id, limit):
+        query, params = self._quotes_query(where, params, after_id, limit)
+        with self._connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+            return self._rows_to_quotes(conn, rows)
+    
+    def _rows_to_quotes(self, conn, rows, authors=None):
+        """Перетворює рядки цитат на словники або записи, довантажуючи теги одним запитом на порцію.
+        
+        authors - словник id автора -> Author, спільний для кількох порцій одного результату.
+        """
+        if authors is None:
+            authors = {}
+        quotes = []
+        for start in range(0, len(rows), TAG_BATCH_SIZE):
+            chunk = rows[start:start + TAG_BATCH_SIZE]
+            tags = self._load_tags(conn, [row[0] for row in chunk])
+            if self.records:
+                quotes.extend(self._row_to_record(row, tuple(tags.get(row[0], ())), authors) for row in chunk)
+            else:
+                quotes.extend(self._row_to_quote(row, tags.get(row[0], [])) for row in chunk)
+        return quotes
+    
+    def _load_tags(self, conn, quote_ids):
+        """Повертає словник id цитати -> список тегів"""
+        tags = {}
+        if not quote_ids:
+            return tags
+        query = TAGS_QUERY.format(placeholders=','.join('?' * len(quote_ids)))
+        tag_names = self.tag_names
+        for quote_id, tag_id in conn.execute(query, quote_ids):
+            tag_name = tag_names.get(tag_id)
+            if tag_name is None:
+                tag_names = self._load_tag_names(conn)
+                tag_name = tag_names[tag_id]
+            tags.setdefault(quote_id, []).append(tag_name)
+        return tags
+    
+    def _load_tag_names(self, conn):
+        """Перечитує словник id тегу -> назва"""
+        self.tag_names = dict(conn.execute('SELECT id, name FROM tags'))
+        return self.tag_names
+    
+    @staticmethod
+    def _row_to_quote(row, tags):
+        return {
+            "id": row[0],
+            "text": row[1],
+            "author": {
+                "name": row[2],
+                "born_date": row[3],
+                "born_location": row[4],
+                "description": row[5]
+            },
+            "tags": tags
+        }
+    
+    @staticmethod
+    def _row_to_record(row, tags, authors):
+        author = authors.get(row[6])
+        if author is None:
+            author = NO_AUTHOR if row[6] is None else Author(row[6], row[2], row[3], row[4], row[5])
+            authors[row[6]] = author
+        return Quote(row[0], row[1], author, tags)
+    
+    def _author(self, row):
+        return Author(*row) if self.records else self._row_to_author(row)
+    
+    @staticmethod
+    def _row_to_author(row):
+        return {
+            "id": row[0],
+            "name": row[1],
+            "born_date": row[2],
+            "born_location": row[3],
+            "description": row[4]
+        }
+    
+    def search(self, query, limit=20, phrase=False, prefix=False, raw=False, highlight=("[", "]")):
+        """Повнотекстовий пошук за текстом, автором і тегами з ранжуванням bm25.
+        
+        За замовчуванням шукає цитати з усіма словами запиту; phrase=True - слова поспіль,
+        prefix=True - останнє слово як префікс, raw=True - запит у синтаксисі FTS5 як є.
+        """
         try:
-            query = '''
+            match = query if raw else build_match_query(query, phrase, prefix)
+            if not match:
+                return []
+            
+            sql = '''
                 SELECT 
                     q.id,
                     q.text,
@@ -157,116 +443,128 @@ class QuotesManager:
                     a.born_date,
                     a.born_location,
                     a.description,
-                    GROUP_CONCAT(t.name) as tags
-                FROM quotes q
+                    a.id as author_id,
+                    bm25(quotes_fts, 10.0, 5.0, 2.0) as rank,
+                    snippet(quotes_fts, 0, ?, ?, '…', 16) as snippet
+                FROM quotes_fts
+                JOIN quotes q ON q.id = quotes_fts.rowid
                 LEFT JOIN authors a ON q.author_id = a.id
-                LEFT JOIN quote_tags qt ON q.id = qt.quote_id
-                LEFT JOIN tags t ON qt.tag_id = t.id
-                WHERE t.name LIKE ?
-                GROUP BY q.id
-                ORDER BY q.id
+                WHERE quotes_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
             '''
             
-            self.cursor.execute(query, (f'%{tag_name}%',))
-            results = self.cursor.fetchall()
-            
-            quotes = []
-            for row in results:
-                quote = {
-                    "id": row[0],
-                    "text": row[1],
-                    "author": {
-                        "name": row[2],
-                        "born_date": row[3],
-                        "born_location": row[4],
-                        "description": row[5]
-                    },
-                    "tags": row[6].split(',') if row[6] else []
-                }
-                quotes.append(quote)
+            with self._connection() as conn:
+                rows = conn.execute(sql, (highlight[0], highlight[1], match, limit)).fetchall()
+                quotes = self._rows_to_quotes(conn, rows)
+            for quote, row in zip(quotes, rows):
+                if self.records:
+                    quote.rank = row[7]
+                    quote.snippet = row[8]
+                else:
+                    quote["rank"] = row[7]
+                    quote["snippet"] = row[8]
             
             return quotes
             
         except Exception as e:
-            print(f"Помилка пошуку цитат за тегом: {e}")
+            print(f"Помилка повнотекстового пошуку: {e}")
             return []
     
     def get_quotes_count_by_author(self):
         """Отримує кількість цитат для кожного автора"""
         try:
-            query = '''
-                SELECT 
-                    a.name,
-                    COUNT(q.id) as quotes_count
-                FROM authors a
-                LEFT JOIN quotes q ON a.id = q.author_id
-                GROUP BY a.id, a.name
-                ORDER BY quotes_count DESC
-            '''
-            
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
-            
-            stats = []
-            for row in results:
-                stat = {
-                    "author": row[0],
-                    "quotes_count": row[1]
-                }
-                stats.append(stat)
-            
-            return stats
-            
+            return self._cached(("quotes_count_by_author",), self._query_quotes_count_by_author)
         except Exception as e:
             print(f"Помилка отримання статистики: {e}")
             return []
     
+    def _query_quotes_count_by_author(self):
+        # Лічильники зі зведеної таблиці, яку оновлює завантажувач; CROSS JOIN фіксує порядок обходу,
+        # тож рядки йдуть прямо з індексу за кількістю, без сортування
+        query = '''
+            SELECT 
+                a.name,
+                s.quotes_count
+            FROM author_stats s
+            CROSS JOIN authors a ON a.id = s.author_id
+            ORDER BY s.quotes_count DESC, s.author_id
+        '''
+        
+        with self._connection() as conn:
+            results = conn.execute(query).fetchall()
+        
+        stats = []
+        for row in results:
+            stat = {
+                "author": row[0],
+                "quotes_count": row[1]
+            }
+            stats.append(stat)
+        
+        return stats
+    
     def get_top_tags(self, limit=10):
         """Отримує топ тегів за кількістю цитат"""
         try:
-            query = '''
-                SELECT 
-                    t.name,
-                    COUNT(qt.quote_id) as usage_count
-                FROM tags t
-                LEFT JOIN quote_tags qt ON t.id = qt.tag_id
-                GROUP BY t.id, t.name
-                ORDER BY usage_count DESC
-                LIMIT ?
-            '''
-            
-            self.cursor.execute(query, (limit,))
-            results = self.cursor.fetchall()
-            
-            tags = []
-            for row in results:
-                tag = {
-                    "name": row[0],
-                    "usage_count": row[1]
-                }
-                tags.append(tag)
-            
-            return tags
-            
+            return self._cached(("top_tags", limit), lambda: self._query_top_tags(limit))
         except Exception as e:
             print(f"Помилка отримання топ тегів: {e}")
             return []
     
-    def export_to_json(self, filename="exported_data.json"):
-        """Експортує всі дані у JSON файл"""
-        try:
-            data = {
-                "quotes": self.get_all_quotes(),
-                "authors": self.get_all_authors(),
-                "statistics": {
-                    "quotes_by_author": self.get_quotes_count_by_author(),
-                    "top_tags": self.get_top_tags()
-                },
-                "export_date": datetime.now().isoformat()
+    def _query_top_tags(self, limit):
+        query = '''
+            SELECT 
+                t.name,
+                s.usage_count
+            FROM tag_stats s
+            CROSS JOIN tags t ON t.id = s.tag_id
+            ORDER BY s.usage_count DESC, s.tag_id
+            LIMIT ?
+        '''
+        
+        with self._connection() as conn:
+            results = conn.execute(query, (limit,)).fetchall()
+        
+        tags = []
+        for row in results:
+            tag = {
+                "name": row[0],
+                "usage_count": row[1]
             }
+            tags.append(tag)
+        
+        return tags
+    
+    def export_to_json(self, filename="exported_data.json", compact=False, compression=None,
+                       ndjson=False, chunk_size=500):
+        """Потоково експортує всі дані у JSON файл, рядок за рядком прямо з курсора.
+        
+        compact=True - без відступів; compression - "gzip", "bz2" або "xz" (або за розширенням файлу);
+        ndjson=True - по одному запису з полем "type" на рядок.
+        """
+        try:
+            export_date = datetime.now().isoformat()
+            indent = None if compact else 2
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open_output(filename, compression) as f:
+                if ndjson:
+                    self._export_ndjson(f, export_date, chunk_size)
+                else:
+                    writer = JsonObjectWriter(f, indent)
+                    with span("export", phase="quotes"):
+                        rows = writer.array_field("quotes", self.iter_quotes(chunk_size))
+                    increment("export_rows", rows, section="quotes")
+                    with span("export", phase="authors"):
+                        rows = writer.array_field("authors", self.iter_authors(chunk_size))
+                    increment("export_rows", rows, section="authors")
+                    with span("export", phase="statistics"):
+                        writer.field("statistics", {
+                            "quotes_by_author": self.get_quotes_count_by_author(),
+                            "top_tags": self.get_top_tags()
+                        })
+                    writer.field("export_date", export_date)
+                    writer.close()
             
             print(f"Дані експортовано у файл: {filename}")
             return True
@@ -275,6 +573,115 @@ class QuotesManager:
             print(f"Помилка експорту: {e}")
             return False
 
+    def export_snapshot(self, filename="quotes.snap"):
+        """Записує бінарний знімок даних для читання через mmap (SnapshotReader)"""
+        try:
+            with self._connection() as conn:
+                index = QuoteIndex.from_database(conn)
+            with span("export", phase="snapshot"):
+                size = write_snapshot(index, filename)
+            print(f"Знімок записано у файл: {filename} ({size / 1024 / 1024:.1f} МБ)")
+            return True
+        except Exception as e:
+            print(f"Помилка запису знімка: {e}")
+            return False
+    
+    def export_legacy(self, quotes_file="quotes_converted.json", authors_file="authors_converted.json",
+                      output_format=None, compression=None, quote_fields=QUOTE_FIELDS,
+                      author_fields=AUTHOR_FIELDS, chunk_size=500):
+        """Пише цитати й авторів у форматі попереднього завдання (quote / fullname) прямо з бази.
+        
+        Кожен файл - один прохід курсора без проміжних quotes.json / authors.json і convert_structure.py.
+        output_format - "json", "compact" або "ndjson" (None - ndjson для .ndjson / .jsonl, інакше json);
+        compression - "gzip", "bz2" або "xz" (або за розширенням файлу); quote_fields / author_fields -
+        відображення полів, як у convert_structure.py.
+        """
+        try:
+            if output_format is not None and output_format not in LEGACY_FORMATS:
+                raise ValueError(f"Невідомий формат: {output_format}. Доступні: {', '.join(LEGACY_FORMATS)}")
+            indent = None if output_format == "compact" else 2
+            ndjson = None if output_format is None else output_format == "ndjson"
+            
+            with span("export", phase="legacy_quotes"):
+                rows = write_records(quotes_file, map_records(self._scraped_quotes(chunk_size), quote_fields),
+                                     indent, ndjson, compression)
+            increment("export_rows", rows, section="legacy_quotes")
+            print(f"Цитати ({rows}) експортовано у файл: {quotes_file}")
+            
+            with span("export", phase="legacy_authors"):
+                rows = write_records(authors_file, map_records(self._scraped_authors(chunk_size), author_fields),
+                                     indent, ndjson, compression)
+            increment("export_rows", rows, section="legacy_authors")
+            print(f"Автори ({rows}) експортовано у файл: {authors_file}")
+            return True
+            
+        except Exception as e:
+            print(f"Помилка експорту у старий формат: {e}")
+            return False
+    
+    def _scraped_quotes(self, chunk_size):
+        """Цитати у вигляді записів quotes.json скрапера (text, author - ім'я, tags) прямо з курсора"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(LEGACY_QUOTES_QUERY)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    # Теги - порціями TAG_BATCH_SIZE, щоб список IN (?, ...) не перевищив ліміт параметрів SQLite
+                    for start in range(0, len(rows), TAG_BATCH_SIZE):
+                        chunk = rows[start:start + TAG_BATCH_SIZE]
+                        query = LEGACY_TAGS_QUERY.format(placeholders=','.join('?' * len(chunk)))
+                        tags = {}
+                        for quote_id, tag_name in conn.execute(query, [row[0] for row in chunk]):
+                            tags.setdefault(quote_id, []).append(tag_name)
+                        for quote_id, text, author_name in chunk:
+                            yield {"text": text, "author": author_name, "tags": tags.get(quote_id, [])}
+            finally:
+                cursor.close()
+    
+    def _scraped_authors(self, chunk_size):
+        """Автори у вигляді записів authors.json скрапера прямо з курсора"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(LEGACY_AUTHORS_QUERY)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    for name, born_date, born_location, description in rows:
+                        yield {"name": name, "born_date": born_date, "born_location": born_location,
+                               "description": description}
+            finally:
+                cursor.close()
+    
+    def _export_ndjson(self, f, export_date, chunk_size):
+        """Пише експорт як NDJSON: заголовок, цитати, автори і статистика"""
+        def write(record):
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        
+        write({"type": "export", "export_date": export_date})
+        rows = 0
+        with span("export", phase="quotes"):
+            for quote in self.iter_quotes(chunk_size):
+                write({"type": "quote", **(quote.to_dict() if self.records else quote)})
+                rows += 1
+        increment("export_rows", rows, section="quotes")
+        rows = 0
+        with span("export", phase="authors"):
+            for author in self.iter_authors(chunk_size):
+                write({"type": "author", **(author.to_dict() if self.records else author)})
+                rows += 1
+        increment("export_rows", rows, section="authors")
+        with span("export", phase="statistics"):
+            write({
+                "type": "statistics",
+                "quotes_by_author": self.get_quotes_count_by_author(),
+                "top_tags": self.get_top_tags()
+            })
+
 def main():
     """Головна функція для демонстрації роботи з базою даних"""
     manager = QuotesManager()
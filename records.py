@@ -0,0 +1,58 @@
+class Author:
+    """Автор; один екземпляр спільний для всіх його цитат у результаті"""
+
+    __slots__ = ("id", "name", "born_date", "born_location", "description")
+
+    def __init__(self, id, name, born_date, born_location, description):
+        self.id = id
+        self.name = name
+        self.born_date = born_date
+        self.born_location = born_location
+        self.description = description
+
+    def to_dict(self, include_id=True):
+        """Словник у форматі QuotesManager; include_id=False - як автор усередині цитати"""
+        author = {"id": self.id} if include_id else {}
+        author["name"] = self.name
+        author["born_date"] = self.born_date
+        author["born_location"] = self.born_location
+        author["description"] = self.description
+        return author
+
+    def __repr__(self):
+        return f"Author(id={self.id!r}, name={self.name!r})"
+
+
+class Quote:
+    """Цитата з посиланням на спільний запис автора; rank і snippet заповнює лише повнотекстовий пошук"""
+
+    __slots__ = ("id", "text", "author", "tags", "rank", "snippet")
+
+    def __init__(self, id, text, author, tags, rank=None, snippet=None):
+        self.id = id
+        self.text = text
+        self.author = author
+        self.tags = tags
+        self.rank = rank
+        self.snippet = snippet
+
+    def to_dict(self):
+        """Словник у форматі QuotesManager; будується лише під час серіалізації"""
+        quote = {
+            "id": self.id,
+            "text": self.text,
+            "author": self.author.to_dict(include_id=False),
+            "tags": list(self.tags)
+        }
+        if self.rank is not None:
+            quote["rank"] = self.rank
+            quote["snippet"] = self.snippet
+        return quote
+
+    def __repr__(self):
+        return f"Quote(id={self.id!r}, author={self.author.name!r})"
+
+
+# Автор цитати, якої немає в таблиці authors (LEFT JOIN повертає NULL)
+NO_AUTHOR = Author(None, None, None, None, None)
+
@@ -1,132 +1,241 @@
 import requests
-from bs4 import BeautifulSoup
+import argparse
+import asyncio
 import json
 import time
-from urllib.parse import urljoin
+
+from async_crawler import AsyncCrawler
+from http_cache import CrawlCheckpoint, HttpCache
+from http_transport import HttpTransport
+from instrumentation import enable as enable_metrics, write_metrics
+from json_stream import NdjsonWriter
+from parallel_crawler import ParallelCrawler
+from page_parser import DEFAULT_BACKEND, PARSER_BACKENDS, PageParser, extract_author, extract_next_url, extract_quotes
 
 class QuotesScraper:
-    def __init__(self):
-        self.base_url = "http://quotes.toscrape.com"
+    def __init__(self, transport=None, parser_backend=DEFAULT_BACKEND, cache=None, checkpoint=None,
+                 base_url="http://quotes.toscrape.com", stream=False, fsync_every=100):
+        self.base_url = base_url.rstrip('/')
         self.quotes = []
         self.authors = {}
+        self.transport = transport or HttpTransport()
+        self.parser = PageParser(parser_backend)
+        self.cache = cache
+        self.checkpoint = checkpoint
+        # (номер, url) наступної сторінки з цитатами; None - сторінки вже оброблено
+        self.next_page = (1, f"{self.base_url}/page/1/")
+        # Потоковий режим: записи одразу йдуть у quotes.ndjson / authors.ndjson
+        self.stream = stream
+        self.fsync_every = fsync_every
+        self.quotes_writer = None
+        self.authors_writer = None
+        self.quotes_count = 0
+        self.stream_offsets = None
+        # Що вже є в контрольній точці: перше збереження пише повний стан, наступні - лише зміни
+        self.checkpoint_written = False
+        self.checkpoint_quotes = 0
+        self.changed_authors = {}
         
     def get_page_content(self, url):
-        """Отримує HTML контент сторінки"""
+        """Отримує HTML контент сторінки (через кеш з умовними запитами, якщо він увімкнений)"""
         try:
-            response = requests.get(url)
+            entry = self.cache.lookup(url) if self.cache else None
+            if entry and self.cache.is_fresh(entry):
+                return self.cache.hit(entry)
+            
+            headers = self.cache.conditional_headers(entry) if entry else None
+            response = self.transport.get(url, headers=headers)
+            if entry and response.status_code == 304:
+                return self.cache.revalidate(url, entry)
+            
             response.raise_for_status()
+            if self.cache:
+                self.cache.store(url, response.text, response.headers)
             return response.text
         except requests.RequestException as e:
             print(f"Помилка при отриманні {url}: {e}")
             return None
     
-    def parse_quotes_page(self, html_content):
-        """Парсить сторінку з цитатами"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        quote_elements = soup.find_all('div', class_='quote')
+    def parse_quotes_page(self, soup):
+        """Обробляє дерево сторінки з цитатами і повертає нових авторів (None, якщо цитат немає)"""
+        quotes = extract_quotes(soup)
+        if not quotes:
+            return None
         
-        for quote_element in quote_elements:
-            # Отримуємо текст цитати
-            text_element = quote_element.find('span', class_='text')
-            text = text_element.get_text(strip=True) if text_element else ""
-            
-            # Отримуємо автора
-            author_element = quote_element.find('small', class_='author')
-            author_name = author_element.get_text(strip=True) if author_element else ""
-            
-            # Отримуємо теги
-            tags_elements = quote_element.find_all('a', class_='tag')
-            tags = [tag.get_text(strip=True) for tag in tags_elements]
-            
-            # Створюємо об'єкт цитати
-            quote = {
-                "text": text,
-                "author": author_name,
-                "tags": tags
-            }
-            
-            self.quotes.append(quote)
+        new_authors = []
+        for quote in quotes:
+            self.record_quote(quote)
             
             # Зберігаємо інформацію про автора для подальшого отримання
+            author_name = quote["author"]
             if author_name and author_name not in self.authors:
                 self.authors[author_name] = None
+                self.changed_authors[author_name] = True
+                new_authors.append(author_name)
+        
+        return new_authors
+    
+    def get_next_page_url(self, soup, page_url):
+        """Повертає абсолютне посилання "Next" зі сторінки або None"""
+        return extract_next_url(soup, page_url)
+    
+    def get_author_url(self, author_name):
+        """Формує посилання на сторінку автора"""
+        return f"{self.base_url}/author/{author_name.replace(' ', '-')}/"
     
     def get_author_info(self, author_name):
         """Отримує інформацію про автора з його сторінки"""
-        # Знаходимо посилання на автора
-        author_url = f"{self.base_url}/author/{author_name.replace(' ', '-')}/"
+        author_url = self.get_author_url(author_name)
         
         html_content = self.get_page_content(author_url)
         if not html_content:
             return None
-            
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Отримуємо інформацію про автора
-        author_info = {
-            "name": author_name,
-            "born_date": "",
-            "born_location": "",
-            "description": ""
-        }
-        
-        # Знаходимо блок з інформацією про автора
-        author_details = soup.find('div', class_='author-details')
-        if author_details:
-            # Дата народження
-            born_element = author_details.find('span', class_='author-born-date')
-            if born_element:
-                author_info["born_date"] = born_element.get_text(strip=True)
-            
-            # Місце народження
-            location_element = author_details.find('span', class_='author-born-location')
-            if location_element:
-                author_info["born_location"] = location_element.get_text(strip=True)
-            
-            # Опис
-            description_element = author_details.find('div', class_='author-description')
-            if description_element:
-                author_info["description"] = description_element.get_text(strip=True)
         
-        return author_info
+        return extract_author(self.parser.parse(html_content), author_name)
     
     def scrape_all_pages(self):
         """Скрапить всі сторінки з цитатами"""
-        page_num = 1
-        
-        while True:
-            page_url = f"{self.base_url}/page/{page_num}/"
+        while self.next_page:
+            page_num, page_url = self.next_page
             print(f"Скрапінг сторінки {page_num}...")
             
             html_content = self.get_page_content(page_url)
             if not html_content:
                 break
-                
-            soup = BeautifulSoup(html_content, 'html.parser')
             
-            # Перевіряємо чи є цитати на сторінці
-            quotes_on_page = soup.find_all('div', class_='quote')
-            if not quotes_on_page:
+            # Парсимо сторінку один раз і перевіряємо чи є на ній цитати
+            soup = self.parser.parse(html_content)
+            if self.parse_quotes_page(soup) is None:
                 print(f"На сторінці {page_num} немає цитат. Зупиняємо скрапінг.")
-                break
-            
-            self.parse_quotes_page(html_content)
+                self.next_page = None
+            else:
+                self.next_page = (page_num + 1, f"{self.base_url}/page/{page_num + 1}/")
+            self.save_checkpoint()
             
-            # Невелика затримка між запитами
-            time.sleep(1)
-            page_num += 1
+            if self.next_page:
+                # Невелика затримка між запитами
+                time.sleep(1)
     
     def get_all_authors_info(self):
         """Отримує інформацію про всіх авторів"""
         print("Отримання інформації про авторів...")
         
-        for author_name in self.authors.keys():
+        for author_name in self.pending_authors():
             print(f"Отримання інформації про автора: {author_name}")
             author_info = self.get_author_info(author_name)
             if author_info:
-                self.authors[author_name] = author_info
+                self.record_author(author_name, author_info)
+                self.save_checkpoint()
             time.sleep(1)  # Затримка між запитами
     
+    def record_quote(self, quote):
+        """Зберігає цитату: у потік NDJSON або в пам'ять"""
+        self.quotes_count += 1
+        if self.quotes_writer:
+            self.quotes_writer.write(quote)
+        else:
+            self.quotes.append(quote)
+    
+    def record_author(self, author_name, author_info):
+        """Зберігає інформацію про автора; у потоковому режимі в пам'яті лишається лише позначка"""
+        if self.authors_writer:
+            self.authors_writer.write(author_info)
+            author_info = True
+        self.authors[author_name] = author_info
+        self.changed_authors[author_name] = True
+    
+    def open_streams(self):
+        """Відкриває NDJSON-потоки, продовжуючи з позицій контрольної точки"""
+        offsets = self.stream_offsets or {}
+        self.quotes_writer = NdjsonWriter('quotes.ndjson', self.fsync_every, offsets.get("quotes"))
+        self.authors_writer = NdjsonWriter('authors.ndjson', self.fsync_every, offsets.get("authors"))
+    
+    def finalize_streams(self):
+        """Атомарно фіналізує NDJSON-потоки"""
+        self.quotes_writer.finalize()
+        self.authors_writer.finalize()
+        authors_count = sum(1 for author in self.authors.values() if author is not None)
+        print(f"Збережено {self.quotes_count} цитат у quotes.ndjson")
+        print(f"Збережено {authors_count} авторів у authors.ndjson")
+    
+    def close_streams(self):
+        """Закриває NDJSON-потоки без фіналізації: файли .part продовжить наступний запуск"""
+        self.quotes_writer.close()
+        self.authors_writer.close()
+        print("Незавершені потоки лишаються у quotes.ndjson.part / authors.ndjson.part")
+    
+    def pending_authors(self):
+        """Автори, інформацію про яких ще не отримано"""
+        return [name for name, info in self.authors.items() if info is None]
+    
+    def is_complete(self):
+        """Чи оброблено всі сторінки з цитатами і всіх авторів"""
+        return self.next_page is None and not self.pending_authors()
+    
+    def save_checkpoint(self):
+        """Зберігає прогрес обходу, якщо контрольна точка увімкнена"""
+        if not self.checkpoint:
+            return
+        self.write_checkpoint(*self.checkpoint_changes())
+    
+    def checkpoint_changes(self):
+        """Повертає (стан, чи повний він): при першому збереженні - весь стан, далі - зміни з попереднього.
+        
+        Викликається там, де змінюється стан (у циклі подій в асинхронному режимі), а запис
+        write_checkpoint можна виконати в іншому потоці.
+        """
+        full = not self.checkpoint_written
+        if full:
+            quotes = list(self.quotes)
+            authors = dict(self.authors)
+        else:
+            quotes = self.quotes[self.checkpoint_quotes:]
+            authors = {name: self.authors[name] for name in self.changed_authors}
+        state = {
+            "next_page": self.next_page,
+            "quotes": quotes,
+            "quotes_count": self.quotes_count,
+            "authors": authors
+        }
+        if self.quotes_writer:
+            # Позиції беруться зараз, щоб вказувати рівно на записані до цього моменту дані
+            state["stream_offsets"] = {
+                "quotes": self.quotes_writer.offset(),
+                "authors": self.authors_writer.offset()
+            }
+        self.checkpoint_written = True
+        self.checkpoint_quotes = len(self.quotes)
+        self.changed_authors = {}
+        return state, full
+    
+    def write_checkpoint(self, state, full):
+        """Записує стан з checkpoint_changes у файл контрольної точки"""
+        if "stream_offsets" in state:
+            # Спершу скидаємо потоки на диск, щоб позиції вказували на збережені дані
+            self.quotes_writer.sync(flush=False)
+            self.authors_writer.sync(flush=False)
+        if full:
+            self.checkpoint.save(state)
+        else:
+            self.checkpoint.append(state)
+    
+    def resume(self):
+        """Відновлює прогрес з контрольної точки, якщо вона є"""
+        state = self.checkpoint.load() if self.checkpoint else None
+        if not state:
+            return False
+        
+        self.next_page = tuple(state["next_page"]) if state["next_page"] else None
+        self.quotes = state["quotes"]
+        self.quotes_count = state.get("quotes_count", len(self.quotes))
+        self.authors = state["authors"]
+        self.stream_offsets = state.get("stream_offsets")
+        self.checkpoint_quotes = len(self.quotes)
+        self.changed_authors = {}
+        print(f"Відновлення з контрольної точки: {self.quotes_count} цитат, "
+              f"{len(self.pending_authors())} авторів у черзі")
+        return True
+    
     def save_to_json(self):
         """Зберігає дані у JSON файли"""
         # Зберігаємо цитати
@@ -141,21 +250,134 @@ class QuotesScraper:
         print(f"Збережено {len(self.quotes)} цитат у quotes.json")
         print(f"Збережено {len(authors_list)} авторів у authors.json")
     
-    def run(self):
+    def crawl_async(self, workers=8, rate=5.0, burst=None):
+        """Скрапить сторінки та авторів конкурентно з обмеженням частоти запитів на хост"""
+        crawler = AsyncCrawler(self, workers=workers, rate=rate, burst=burst)
+        asyncio.run(crawler.crawl())
+    
+    def crawl_parallel(self, processes=None, fetchers=8, rate=5.0, burst=None):
+        """Скрапить у кількох процесах: парсинг у пулі процесів, запис у файли - окремим процесом"""
+        extension = "ndjson" if self.stream else "json"
+        crawler = ParallelCrawler(self, processes=processes, fetchers=fetchers, rate=rate, burst=burst)
+        summary = crawler.crawl(f"quotes.{extension}", f"authors.{extension}")
+        print(f"Збережено {summary['quotes']} цитат у quotes.{extension} (дублікатів: {summary['duplicates']})")
+        print(f"Збережено {summary['authors']} авторів у authors.{extension}")
+    
+    def run(self, workers=None, rate=5.0, processes=None):
         """Запускає повний процес скрапінгу"""
-        print("Початок скрапінгу сайту quotes.toscrape.com...")
+        print(f"Початок скрапінгу сайту {self.base_url}...")
+        if processes:
+            # Контрольна точка тут не потрібна: записувач одразу пише результат у файли
+            self.crawl_parallel(processes=processes, fetchers=workers or 8, rate=rate)
+            self.print_transport_stats()
+            print("Скрапінг завершено!")
+            return
         
-        # Скрапимо всі сторінки з цитатами
-        self.scrape_all_pages()
+        self.resume()
+        if self.stream:
+            self.open_streams()
         
-        # Отримуємо інформацію про авторів
-        self.get_all_authors_info()
+        if workers:
+            # Конкурентний обхід сторінок і авторів
+            self.crawl_async(workers=workers, rate=rate)
+        else:
+            # Скрапимо всі сторінки з цитатами
+            self.scrape_all_pages()
+            
+            # Отримуємо інформацію про авторів
+            self.get_all_authors_info()
         
-        # Зберігаємо результати
-        self.save_to_json()
+        complete = self.is_complete()
+        if self.checkpoint and not complete:
+            # Контрольна точка лишається для продовження обходу
+            self.save_checkpoint()
         
+        # Зберігаємо результати; незавершені потоки з контрольною точкою лишаються у файлах .part
+        if self.stream:
+            if complete or not self.checkpoint:
+                self.finalize_streams()
+            else:
+                self.close_streams()
+        else:
+            self.save_to_json()
+        
+        if complete:
+            if self.checkpoint:
+                self.checkpoint.clear()
+        else:
+            pages = "лишилися необроблені сторінки з цитатами, " if self.next_page else ""
+            print(f"Обхід не завершено: {pages}авторів без інформації: {len(self.pending_authors())}")
+            if self.checkpoint:
+                print(f"Контрольну точку збережено у {self.checkpoint.path}: "
+                      f"повторний запуск з тим самим --checkpoint продовжить обхід")
+        
+        self.print_transport_stats()
         print("Скрапінг завершено!")
+    
+    def print_transport_stats(self):
+        """Показує статистику HTTP-транспорту"""
+        stats = self.transport.stats()
+        print("\n=== СТАТИСТИКА HTTP ===")
+        print(f"Запитів: {stats['requests']} (повторів: {stats['retries']}, невдалих: {stats['failures']})")
+        print(f"З'єднань відкрито: {stats['connections_opened']}, перевикористано: {stats['connections_reused']}")
+        print(f"Середній час запиту: {stats['avg_request_time'] * 1000:.1f} мс")
+        if self.cache:
+            cache_stats = self.cache.stats
+            print(f"Кеш: з кешу {cache_stats['hits']}, підтверджено 304 {cache_stats['revalidated']}, "
+                  f"завантажено {cache_stats['misses']}, витіснено {cache_stats['evictions']}")
 
 if __name__ == "__main__":
-    scraper = QuotesScraper()
-    scraper.run() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Скрапер quotes.toscrape.com")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="кількість конкурентних воркерів (без параметра - послідовний режим)")
+    parser.add_argument("--rate", type=float, default=5.0,
+                        help="максимум запитів за секунду до одного хоста в конкурентному режимі")
+    parser.add_argument("--base-url", default="http://quotes.toscrape.com",
+                        help="адреса сайту, наприклад локального дзеркала (python -m benchmarks.mirror_server)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="кількість процесів-парсерів (багатопроцесний режим; --workers - потоки завантаження)")
+    parser.add_argument("--parser", choices=list(PARSER_BACKENDS), default=DEFAULT_BACKEND,
+                        help="backend HTML-парсера")
+    parser.add_argument("--pool-size", type=int, default=10,
+                        help="розмір пулу HTTP-з'єднань")
+    parser.add_argument("--timeout", type=float, default=15.0,
+                        help="таймаут читання відповіді, секунд")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="кількість повторів для тимчасових помилок")
+    parser.add_argument("--cache-dir", default=None,
+                        help="каталог дискового HTTP-кешу (без параметра кеш вимкнено)")
+    parser.add_argument("--cache-max-age", type=float, default=24 * 3600,
+                        help="скільки секунд відповідь з кешу вважається свіжою без запиту")
+    parser.add_argument("--cache-max-mb", type=float, default=100,
+                        help="максимальний розмір кешу, МБ")
+    parser.add_argument("--checkpoint", default=None,
+                        help="файл контрольної точки для відновлення перерваного обходу")
+    parser.add_argument("--stream", action="store_true",
+                        help="одразу дописувати записи у quotes.ndjson / authors.ndjson замість буферизації")
+    parser.add_argument("--fsync-every", type=int, default=100,
+                        help="як часто (у записах) скидати NDJSON-потоки на диск")
+    parser.add_argument("--metrics", default=None,
+                        help="зібрати метрики і зберегти у файл (.prom / .txt - формат Prometheus, інакше JSON); "
+                             "процеси-парсери багатопроцесного режиму свої метрики не передають")
+    args = parser.parse_args()
+    if args.metrics:
+        enable_metrics()
+    
+    transport = HttpTransport(
+        pool_size=max(args.pool_size, args.workers or 0),
+        read_timeout=args.timeout,
+        max_retries=args.retries
+    )
+    cache = None
+    if args.cache_dir:
+        cache = HttpCache(args.cache_dir, max_age=args.cache_max_age,
+                          max_bytes=int(args.cache_max_mb * 1024 * 1024))
+    checkpoint = CrawlCheckpoint(args.checkpoint) if args.checkpoint else None
+    
+    scraper = QuotesScraper(transport=transport, parser_backend=args.parser,
+                            cache=cache, checkpoint=checkpoint, base_url=args.base_url,
+                            stream=args.stream, fsync_every=args.fsync_every)
+    scraper.run(workers=args.workers, rate=args.rate, processes=args.processes)
+    if args.metrics:
+        write_metrics(args.metrics)
+        print(f"Метрики збережено у {args.metrics}") 
\ No newline at end of file
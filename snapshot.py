@@ -0,0 +1,396 @@
+import argparse
+import array
+import mmap
+import os
+import struct
+import sys
+
+from instrumentation import sqlite_connect
+from quote_index import ASCII_LOWER, QuoteIndex
+from records import Author
+
+# Бінарний знімок: заголовок, таблиця секцій і секції-масиви little-endian, вирівняні на 8 байтів.
+# Рядки лежать в одній таблиці (UTF-8 підряд + масив зміщень) і посилаються за номером
+MAGIC = b"QSNAP\x00\r\n"
+VERSION = 1
+NULL_STRING = 0xFFFFFFFF
+
+# Секції у порядку запису: назва -> код типу array / memoryview
+SECTIONS = (
+    ("strings", "B"),
+    ("string_offsets", "Q"),
+    ("quote_ids", "q"),
+    ("quote_texts", "I"),
+    ("quote_authors", "i"),
+    ("quote_tag_offsets", "I"),
+    ("quote_tags", "I"),
+    ("author_ids", "q"),
+    ("author_names", "I"),
+    ("author_born_dates", "I"),
+    ("author_born_locations", "I"),
+    ("author_descriptions", "I"),
+    ("author_name_order", "I"),
+    ("author_stats_order", "I"),
+    ("author_posting_offsets", "I"),
+    ("author_postings", "I"),
+    ("tag_names", "I"),
+    ("tag_name_order", "I"),
+    ("tag_stats_order", "I"),
+    ("tag_posting_offsets", "I"),
+    ("tag_postings", "I"),
+)
+
+# magic, версія, покоління даних (-1 - невідоме), далі для кожної секції зміщення і кількість елементів
+HEADER = struct.Struct("<8sIxxxxq" + "QQ" * len(SECTIONS))
+
+
+class _StringTable:
+    """Таблиця рядків для запису: однакові рядки зберігаються один раз"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array.array('Q', [0])
+        self.numbers = {}
+
+    def add(self, value):
+        if value is None:
+            return NULL_STRING
+        number = self.numbers.get(value)
+        if number is None:
+            number = self.numbers[value] = len(self.offsets) - 1
+            self.data += value.encode('utf-8')
+            self.offsets.append(len(self.data))
+        return number
+
+
+def _postings(lists):
+    """Інвертовані списки у форматі CSR: (зміщення, позиції)"""
+    offsets = array.array('I', [0])
+    values = array.array('I')
+    for positions in lists:
+        values.extend(array.array('I', positions))
+        offsets.append(len(values))
+    return offsets, values
+
+
+def write_snapshot(index, path):
+    """Записує знімок QuoteIndex у бінарний файл; файл замінюється атомарно"""
+    strings = _StringTable()
+    authors = range(len(index.author_names))
+    tags = range(len(index.tag_names))
+    details = index.author_details
+    author_offsets, author_postings = _postings(index.author_postings)
+    tag_offsets, tag_postings = _postings(index.tag_postings)
+    sections = {
+        "quote_ids": index.quote_ids,
+        "quote_texts": array.array('I', (strings.add(text) for text in index.texts)),
+        "quote_authors": array.array('i', index.quote_authors),
+        "quote_tag_offsets": array.array('I', index.tag_offsets),
+        "quote_tags": array.array('I', index.tag_values),
+        "author_ids": index.author_ids,
+        "author_names": array.array('I', (strings.add(name) for name in index.author_names)),
+        "author_born_dates": array.array('I', (strings.add(detail[0]) for detail in details)),
+        "author_born_locations": array.array('I', (strings.add(detail[1]) for detail in details)),
+        "author_descriptions": array.array('I', (strings.add(detail[2]) for detail in details)),
+        # Порядки для get_all_authors (за ім'ям) і статистики (кількість за спаданням, далі id)
+        "author_name_order": array.array('I', sorted(authors, key=index.author_names.__getitem__)),
+        "author_stats_order": array.array('I', sorted(
+            authors, key=lambda i: (-len(index.author_postings[i]), index.author_ids[i]))),
+        "author_posting_offsets": author_offsets,
+        "author_postings": author_postings,
+        "tag_names": array.array('I', (strings.add(name) for name in index.tag_names)),
+        "tag_name_order": array.array('I', sorted(tags, key=index.tag_names.__getitem__)),
+        "tag_stats_order": array.array('I', sorted(tags, key=lambda i: -len(index.tag_postings[i]))),
+        "tag_posting_offsets": tag_offsets,
+        "tag_postings": tag_postings,
+    }
+    sections["strings"] = strings.data
+    sections["string_offsets"] = strings.offsets
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(b"\0" * HEADER.size)
+        table = []
+        for name, typecode in SECTIONS:
+            data = sections[name]
+            f.write(b"\0" * (-f.tell() % 8))
+            table.extend((f.tell(), len(data)))
+            if isinstance(data, array.array):
+                if data.typecode != typecode:
+                    data = array.array(typecode, data)
+                if sys.byteorder == "big":
+                    data = array.array(typecode, data)
+                    data.byteswap()
+            f.write(data)
+        f.seek(0)
+        generation = -1 if index.generation is None else index.generation
+        f.write(HEADER.pack(MAGIC, VERSION, generation, *table))
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def create_snapshot(db_name, path):
+    """Будує знімок з бази даних і записує його у файл"""
+    conn = sqlite_connect(db_name)
+    try:
+        index = QuoteIndex.from_database(conn)
+    finally:
+        conn.close()
+    write_snapshot(index, path)
+    return index
+
+
+class _Strings:
+    """Рядки таблиці за масивом номерів; декодуються під час доступу"""
+
+    def __init__(self, reader, numbers):
+        self.string = reader._string
+        self.numbers = numbers
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __getitem__(self, i):
+        return self.string(self.numbers[i])
+
+
+class _Postings:
+    """Інвертовані списки CSR як послідовність зрізів memoryview без копіювання"""
+
+    def __init__(self, offsets, values):
+        self.offsets = offsets
+        self.values = values
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+
+class _AuthorDetails:
+    def __init__(self, reader):
+        self.born_dates = _Strings(reader, reader.sections["author_born_dates"])
+        self.born_locations = _Strings(reader, reader.sections["author_born_locations"])
+        self.descriptions = _Strings(reader, reader.sections["author_descriptions"])
+
+    def __getitem__(self, i):
+        return self.born_dates[i], self.born_locations[i], self.descriptions[i]
+
+
+class _AuthorRecords:
+    """Записи Author, що створюються при першому зверненні і далі спільні"""
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.created = {}
+
+    def __getitem__(self, i):
+        author = self.created.get(i)
+        if author is None:
+            reader = self.reader
+            author = self.created[i] = Author(reader.author_ids[i], reader.author_names[i],
+                                              *reader.author_details[i])
+        return author
+
+
+class _NameLookup:
+    """Точний пошук позиції за назвою бінарним пошуком у відсортованому порядку"""
+
+    def __init__(self, names, order):
+        self.names = names
+        self.order = order
+
+    def _find(self, name):
+        order = self.order
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if self.names[order[middle]] < name:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(order) and self.names[order[low]] == name:
+            return order[low]
+        return None
+
+    def __contains__(self, name):
+        return self._find(name) is not None
+
+    def __getitem__(self, name):
+        position = self._find(name)
+        if position is None:
+            raise KeyError(name)
+        return position
+
+
+class SnapshotReader(QuoteIndex):
+    """Читання бінарного знімка через mmap з тими ж запитами, що й QuotesManager.
+
+    Відкриття читає лише заголовок, тож час старту не залежить від розміру даних; масиви
+    секцій - це memoryview над mmap, а рядки декодуються лише для записів, що потрапили
+    в результат. Запити за автором, тегом і AND / OR тегів - ті самі, що в QuoteIndex.
+    """
+
+    def __init__(self, path="quotes.snap", records=False):
+        self.path = path
+        self.records = records
+        self.file = None
+        self.map = None
+        self.sections = {}
+        self.generation = None
+        self.match_cache = {}
+        self._author_keys = None
+        self._tag_keys = None
+
+    def connect(self):
+        """Відкриває файл знімка і відображає його в пам'ять"""
+        try:
+            if sys.byteorder != "little":
+                raise ValueError("Знімок читається без копіювання лише на little-endian платформах")
+            self.file = open(self.path, 'rb')
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            header = HEADER.unpack_from(self.map)
+            if header[0] != MAGIC or header[1] != VERSION:
+                raise ValueError(f"{self.path} не є знімком версії {VERSION}")
+            self.generation = None if header[2] < 0 else header[2]
+            view = memoryview(self.map)
+            for number, (name, typecode) in enumerate(SECTIONS):
+                offset, count = header[3 + 2 * number], header[4 + 2 * number]
+                size = struct.calcsize(typecode)
+                self.sections[name] = view[offset:offset + count * size].cast(typecode)
+            self._bind()
+            return True
+        except Exception as e:
+            print(f"Помилка відкриття знімка: {e}")
+            self.close()
+            return False
+
+    def _bind(self):
+        """Атрибути у форматі QuoteIndex поверх секцій"""
+        sections = self.sections
+        self.quote_ids = sections["quote_ids"]
+        self.texts = _Strings(self, sections["quote_texts"])
+        self.quote_authors = sections["quote_authors"]
+        self.tag_offsets = sections["quote_tag_offsets"]
+        self.tag_values = sections["quote_tags"]
+        self.author_ids = sections["author_ids"]
+        self.author_names = _Strings(self, sections["author_names"])
+        self.author_details = _AuthorDetails(self)
+        self.authors = _AuthorRecords(self)
+        self.author_positions = _NameLookup(self.author_names, sections["author_name_order"])
+        self.author_postings = _Postings(sections["author_posting_offsets"], sections["author_postings"])
+        self.tag_names = _Strings(self, sections["tag_names"])
+        self.tag_positions = _NameLookup(self.tag_names, sections["tag_name_order"])
+        self.tag_postings = _Postings(sections["tag_posting_offsets"], sections["tag_postings"])
+
+    def close(self):
+        """Звільняє відображення і закриває файл"""
+        # Збіги в кеші тримають зрізи memoryview, а mmap не закривається, доки вони існують
+        self.match_cache = {}
+        for view in self.sections.values():
+            view.release()
+        self.sections = {}
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        if not self.connect():
+            raise OSError(f"Не вдалося відкрити знімок {self.path}")
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def _string(self, number):
+        if number == NULL_STRING:
+            return None
+        offsets = self.sections["string_offsets"]
+        return str(self.sections["strings"][offsets[number]:offsets[number + 1]], 'utf-8')
+
+    # Назви в нижньому регістрі для пошуку за підрядком декодуються при першому такому запиті
+    @property
+    def author_keys(self):
+        if self._author_keys is None:
+            self._author_keys = [name.translate(ASCII_LOWER) for name in self.author_names]
+        return self._author_keys
+
+    @property
+    def tag_keys(self):
+        if self._tag_keys is None:
+            self._tag_keys = [name.translate(ASCII_LOWER) for name in self.tag_names]
+        return self._tag_keys
+
+    def get_all_quotes(self, after_id=None, limit=None):
+        """Отримує всі цитати з авторами та тегами (сторінку після after_id, якщо задано limit)"""
+        return super().get_all_quotes(after_id, limit, self.records)
+
+    def iter_quotes(self, chunk_size=500, after_id=None):
+        """Генератор цитат у порядку id"""
+        build = self._record if self.records else self._quote
+        for position in range(self._start(after_id), len(self.quote_ids)):
+            yield build(position)
+
+    def search_quotes_by_author(self, author_name, after_id=None, limit=None):
+        """Пошук цитат за автором"""
+        return super().search_quotes_by_author(author_name, after_id, limit, self.records)
+
+    def search_quotes_by_tag(self, tag_name, after_id=None, limit=None):
+        """Пошук цитат за тегом"""
+        return super().search_quotes_by_tag(tag_name, after_id, limit, self.records)
+
+    def search_quotes_by_tags(self, tags, match_all=True, after_id=None, limit=None):
+        """Цитати з усіма (match_all=True) або хоча б одним із тегів"""
+        return super().search_quotes_by_tags(tags, match_all, after_id, limit, self.records)
+
+    def _author(self, position):
+        if self.records:
+            return self.authors[position]
+        born_date, born_location, description = self.author_details[position]
+        return {"id": self.author_ids[position], "name": self.author_names[position],
+                "born_date": born_date, "born_location": born_location, "description": description}
+
+    def get_all_authors(self):
+        """Отримує всіх авторів (за ім'ям)"""
+        return list(self.iter_authors())
+
+    def iter_authors(self, chunk_size=500):
+        """Генератор авторів за ім'ям"""
+        for position in self.sections["author_name_order"]:
+            yield self._author(position)
+
+    def get_quotes_count_by_author(self):
+        """Отримує кількість цитат для кожного автора"""
+        postings = self.author_postings
+        return [{"author": self.author_names[position], "quotes_count": len(postings[position])}
+                for position in self.sections["author_stats_order"]]
+
+    def get_top_tags(self, limit=10):
+        """Отримує топ тегів за кількістю цитат"""
+        postings = self.tag_postings
+        return [{"name": self.tag_names[position], "usage_count": len(postings[position])}
+                for position in self.sections["tag_stats_order"][:limit]]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Створення бінарного знімка цитат для читання через mmap")
+    parser.add_argument("--db", default="quotes.db", help="база даних-джерело")
+    parser.add_argument("--quotes", default=None, help="JSON або NDJSON файл цитат (замість бази)")
+    parser.add_argument("--authors", default="authors.json", help="JSON або NDJSON файл авторів (разом з --quotes)")
+    parser.add_argument("--output", default="quotes.snap", help="файл знімка")
+    args = parser.parse_args()
+
+    if args.quotes:
+        snapshot_index = QuoteIndex.from_json(args.quotes, args.authors)
+        size = write_snapshot(snapshot_index, args.output)
+    else:
+        snapshot_index = create_snapshot(args.db, args.output)
+        size = os.path.getsize(args.output)
+    print(f"Знімок записано у {args.output}: цитат {len(snapshot_index)}, "
+          f"авторів {len(snapshot_index.author_names)}, тегів {len(snapshot_index.tag_names)}, "
+          f"{size / 1024 / 1024:.1f} МБ")